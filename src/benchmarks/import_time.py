@@ -0,0 +1,73 @@
+"""
+Kontrola czasu importu pakietu steganalysis i jego podsystemów.
+
+Każdy cel jest importowany w świeżym interpreterze (--repeat razy, mediana czasu ściennego). Kontrola
+kończy się kodem 1, gdy import któregokolwiek celu ładuje ciężką zależność (matplotlib, pandas, scipy,
+pywt, cv2 - mają być importowane dopiero przez funkcję, która ich używa) albo przekracza budżet czasu.
+Budżet jest luźny (domyślnie 500 ms), bo ma łapać regresje typu "skrypt znowu importuje pyplot na
+starcie", a nie wahania maszyny.
+
+    python src/benchmarks/import_time.py --repeat 5 --budget-ms 300
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from steganalysis.common.script_loader import src_dir
+from steganalysis import SCRIPTS
+
+HEAVY_MODULES = ("matplotlib", "pandas", "scipy", "pywt", "cv2")
+
+MEASURE = """
+import sys, json, time
+start = time.perf_counter()
+import steganalysis
+{access}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(target):
+    access = f"steganalysis.{target}" if target != "steganalysis" else ""
+    code = MEASURE.format(access=access, heavy=HEAVY_MODULES)
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src_dir, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def check(targets, repeat, budget):
+    failures = []
+    print(f"{'cel':<20}{'mediana [ms]':<16}ciężkie moduły")
+    for target in targets:
+        runs = [measure(target) for _ in range(repeat)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        heavy = sorted(set().union(*(run["heavy"] for run in runs)))
+        print(f"{target:<20}{seconds * 1000:<16.1f}{', '.join(heavy) or '-'}")
+        if heavy:
+            failures.append(f"{target}: import ładuje {', '.join(heavy)}")
+        if seconds > budget:
+            failures.append(f"{target}: {seconds * 1000:.0f} ms > budżet {budget * 1000:.0f} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kontrola czasu importu pakietu steganalysis")
+    parser.add_argument("--targets", nargs="+", choices=["steganalysis", *SCRIPTS], default=["steganalysis", *SCRIPTS],
+                        help="pakiet i/lub podsystemy do sprawdzenia")
+    parser.add_argument("--repeat", type=int, default=3, help="liczba świeżych interpreterów na cel")
+    parser.add_argument("--budget-ms", type=float, default=500, help="największy dopuszczalny czas importu celu")
+    args = parser.parse_args(argv)
+
+    failures = check(args.targets, args.repeat, args.budget_ms / 1000)
+    for failure in failures:
+        print(f"BŁĄD {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
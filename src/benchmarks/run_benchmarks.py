@@ -0,0 +1,344 @@
+"""
+Benchmarki analizatorów, metod ukrywania i wykresów na syntetycznych obrazach.
+
+Obrazy testowe są generowane deterministycznie (stałe ziarno dla każdej rozdzielczości i trybu):
+gradient + kilka fal + szum, czyli treść o naturalnym rozkładzie histogramu i współczynników DCT.
+Rozdzielczości 0.3, 3, 12 i 50 MP (proporcje 4:3, boki podzielne przez 8), tryby L, RGB i RGBA;
+pliki PNG trafiają do katalogu roboczego i są używane ponownie w kolejnych przebiegach.
+
+Każdy przypadek jest wywoływany --warmup razy bez pomiaru, mierzony --repeat razy (czas ścienny,
+perf_counter), a potem raz pod tracemalloc (szczytowa pamięć alokowana przez Pythona i numpy; bufory
+PIL/OpenCV nie są w niej widoczne, dlatego zapisywany jest też szczytowy RSS procesu). Przed każdym pomiarem czyszczony jest cache obrazów, więc
+czasy obejmują dekodowanie. Wykresy nie zależą od rozdzielczości - mierzone są raz na tryb.
+
+Wyniki trafiają do JSON (domyślnie <repo>/benchmark_results/<commit>-<czas>.json) razem z opisem
+maszyny; --compare poprzedni.json wypisuje stosunek median czasów dla wspólnych przypadków.
+
+    python src/benchmarks/run_benchmarks.py --sizes 0.3 3 --modes RGB --cases "hide_*"
+"""
+import os
+import sys
+import json
+import time
+import fnmatch
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+from functools import partial
+
+try:
+    import resource
+except ImportError:  # Windows - bez getrusage, kolumna szczytowego RSS jest pomijana
+    resource = None
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from steganalysis.common.image_cache import load_image, default_cache
+from steganalysis.common.histogram_kernel import channel_histograms
+from steganalysis.common.fast_plots import PNG_OPTIONS
+from steganalysis.common.script_loader import load_script, src_dir
+
+repo_dir = os.path.dirname(src_dir)
+results_dir = os.path.join(repo_dir, "benchmark_results")
+
+SIZES_MP = (0.3, 3, 12, 50)
+MODES = ("L", "RGB", "RGBA")
+MESSAGE_LENGTH = 1024
+SEED = 2024
+
+def image_shape(megapixels):
+    # 4:3, oba boki wielokrotnością 8 (pełne bloki DCT/DWT)
+    width = int(round((megapixels * 1e6 * 4 / 3) ** 0.5 / 8)) * 8
+    height = int(round(width * 3 / 4 / 8)) * 8
+    return height, width
+
+def synthetic_image(megapixels, mode, seed=SEED):
+    height, width = image_shape(megapixels)
+    channels = {"L": 1, "RGB": 3, "RGBA": 4}[mode]
+    rng = np.random.default_rng([seed, int(megapixels * 10), channels])
+
+    y = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+    x = np.linspace(0.0, 1.0, width, dtype=np.float32)[None, :]
+    planes = []
+    for c in range(channels):
+        if c == 3:
+            # Alfa prawie nieprzezroczysta, z drobnym szumem - jak zdjęcie zapisane z kanałem alfa
+            planes.append(255 - rng.integers(0, 3, size=(height, width), dtype=np.uint8))
+            continue
+        fx, fy, phase = rng.uniform(2, 12), rng.uniform(2, 12), rng.uniform(0, np.pi)
+        plane = 60 + 90 * (x * (0.5 + 0.2 * c) + y * (0.8 - 0.2 * c))
+        plane = plane + 35 * np.sin(2 * np.pi * fx * x + phase) * np.cos(2 * np.pi * fy * y)
+        plane += rng.normal(0, 6, size=(height, width)).astype(np.float32)
+        planes.append(np.clip(np.rint(plane), 0, 255).astype(np.uint8))
+
+    return planes[0] if channels == 1 else np.dstack(planes)
+
+def synthetic_image_path(work_dir, megapixels, mode):
+    path = os.path.join(work_dir, f"synthetic_{megapixels:g}mp_{mode}.png")
+    if not os.path.exists(path):
+        temp_path = path + ".tmp.png"
+        Image.fromarray(synthetic_image(megapixels, mode), mode).save(temp_path, **PNG_OPTIONS)
+        os.replace(temp_path, path)
+    return path
+
+def synthetic_jpeg_path(work_dir, megapixels, mode, quality=90):
+    # JPEG baseline z tego samego obrazu syntetycznego - wejście ścieżki współczynników z pliku
+    path = os.path.join(work_dir, f"synthetic_{megapixels:g}mp_{mode}_q{quality}.jpg")
+    if not os.path.exists(path):
+        temp_path = path + ".tmp.jpg"
+        image = Image.open(synthetic_image_path(work_dir, megapixels, mode))
+        image.convert("L" if mode == "L" else "RGB").save(temp_path, quality=quality)
+        os.replace(temp_path, path)
+    return path
+
+def synthetic_message(length=MESSAGE_LENGTH, seed=SEED):
+    # Losowe bajty jako tekst Latin-1 - bity wiadomości o równomiernym rozkładzie
+    return np.random.default_rng(seed).integers(0, 256, size=length, dtype=np.uint8).tobytes().decode("latin-1")
+
+def flipped_lsb(image_array, seed=SEED):
+    # Kopia obrazu z LSB zmienionymi w połowie pikseli - "obraz stego" dla testu chi-kwadrat
+    flips = np.random.default_rng(seed).integers(0, 2, size=image_array.shape, dtype=np.uint8)
+    return image_array ^ flips
+
+def analysis_mode(mode):
+    return "L" if mode == "L" else "RGB"
+
+class Context:
+    # Dane jednego obrazu testowego, wspólne dla przypadków
+    def __init__(self, work_dir, megapixels, mode, modules):
+        self.work_dir = work_dir
+        self.megapixels = megapixels
+        self.mode = mode
+        self.modules = modules
+        self.path = synthetic_image_path(work_dir, megapixels, mode)
+        self.output_path = os.path.join(work_dir, "out", f"stego_{megapixels:g}mp_{mode}.png")
+        self.plot_path = os.path.join(work_dir, "out", f"plot_{megapixels:g}mp_{mode}.png")
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+
+    def gray(self):
+        return load_image(self.path, "L")
+
+    def gray_histograms(self):
+        histogram = self.modules["1_channel"].calculate_histogram(self.gray())
+        stego = self.modules["1_channel"].calculate_histogram(flipped_lsb(self.gray()))
+        return [histogram] * 3, [stego] * 3, [np.abs(histogram - stego)] * 3
+
+    def bgr_histograms(self):
+        bgr = load_image(self.path, "BGR")
+        histograms = list(channel_histograms(bgr))
+        stego = list(channel_histograms(flipped_lsb(bgr)))
+        return histograms, stego, [np.abs(h - s) for h, s in zip(histograms, stego)]
+
+    def dct_stats(self):
+        dct_module = self.modules["dct_analyze"]
+        gray = dct_module.analyze_dct_distribution(dct_module.compute_dct_coefficients(self.path, "L"))
+        rgb = dct_module.analyze_dct_distribution(dct_module.compute_dct_coefficients(self.path, "RGB"))
+        return gray, [gray] * 3, rgb, [rgb] * 3, ["DCT", "RGBA", "LSB"]
+
+# Przypadek: nazwa, tryby, czy zależy od rozdzielczości, funkcja(context) -> wywołanie bez argumentów.
+# Przygotowanie danych (histogramy do wykresów, obraz stego) odbywa się poza pomiarem.
+
+def prepare_dct(context):
+    return partial(context.modules["dct_analyze"].compute_dct_coefficients, context.path, analysis_mode(context.mode))
+
+def prepare_dct_jpeg(context):
+    path = synthetic_jpeg_path(context.work_dir, context.megapixels, context.mode)
+    return partial(context.modules["dct_analyze"].compute_dct_coefficients, path, analysis_mode(context.mode))
+
+def prepare_dwt(context):
+    return partial(context.modules["dwt_analyze"].compute_dwt_coefficients, context.path, analysis_mode(context.mode))
+
+def prepare_dwt_levels(context):
+    return partial(context.modules["dwt_analyze"].stream_dwt_level_statistics, context.path, analysis_mode(context.mode), "haar", 3)
+
+def prepare_chi_square(context):
+    stego = flipped_lsb(context.gray())
+    return partial(context.modules["chi_square_test"].perform_chi_square_test, context.gray(), stego)
+
+def prepare_histogram(context):
+    return partial(context.modules["1_channel"].calculate_histogram, context.gray())
+
+def prepare_hide(function_name, context):
+    function = getattr(context.modules["krys_analiza_i_Steganografia"], function_name)
+    return partial(function, context.path, context.output_path, synthetic_message())
+
+def prepare_plot_9(function_name, context):
+    return partial(getattr(context.modules["1_channel"], function_name), *context.gray_histograms(), "synthetic", context.plot_path)
+
+def prepare_plot_rgb_9(function_name, context):
+    return partial(getattr(context.modules["3_channel"], function_name), *context.bgr_histograms(), "synthetic", "lsb", context.plot_path)
+
+def prepare_comparison_plot(function_name, context):
+    return partial(getattr(context.modules["dct_analyze"], function_name), "synthetic.png", *context.dct_stats(), os.path.join(context.work_dir, "out"))
+
+CASES = [
+    ("compute_dct_coefficients", MODES, True, prepare_dct),
+    ("compute_dct_jpeg", ("L", "RGB"), True, prepare_dct_jpeg),
+    ("compute_dwt_coefficients", MODES, True, prepare_dwt),
+    ("dwt_level_statistics", MODES, True, prepare_dwt_levels),
+    ("perform_chi_square_test", MODES, True, prepare_chi_square),
+    ("calculate_histogram", MODES, True, prepare_histogram),
+    ("hide_data_dct", MODES, True, partial(prepare_hide, "hide_data_dct")),
+    ("hide_data_alpha", MODES, True, partial(prepare_hide, "hide_data_alpha")),
+    ("hide_data_lsb", ("RGB", "RGBA"), True, partial(prepare_hide, "hide_data_lsb")),
+    ("plot_histograms_9", MODES, False, partial(prepare_plot_9, "plot_histograms_9")),
+    ("render_histograms_9", MODES, False, partial(prepare_plot_9, "render_histograms_9")),
+    ("plot_histograms_rgb_9", ("RGB", "RGBA"), False, partial(prepare_plot_rgb_9, "plot_histograms_rgb_9")),
+    ("render_histograms_rgb_9", ("RGB", "RGBA"), False, partial(prepare_plot_rgb_9, "render_histograms_rgb_9")),
+    ("create_comparison_plot", ("RGB",), False, partial(prepare_comparison_plot, "create_comparison_plot")),
+    ("render_comparison_plot", ("RGB",), False, partial(prepare_comparison_plot, "render_comparison_plot")),
+]
+
+def load_modules():
+    return {
+        "1_channel": load_script(os.path.join("histogram_method", "1_channel.py")),
+        "3_channel": load_script(os.path.join("histogram_method", "3_channel.py")),
+        "chi_square_test": load_script(os.path.join("chi_square_method", "chi_square_test.py")),
+        "dct_analyze": load_script(os.path.join("dct", "dct_analyze.py")),
+        "dwt_analyze": load_script(os.path.join("dwt", "dwt_analyze.py")),
+        "krys_analiza_i_Steganografia": load_script(os.path.join("stego", "krys_analiza_i_Steganografia.py")),
+    }
+
+def max_rss_bytes():
+    # ru_maxrss: kilobajty na Linuksie, bajty na macOS; None, gdy moduł resource jest niedostępny
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def measure(call, repeat, warmup=1):
+    # Rozgrzewka poza pomiarem: importy leniwe, pamięć podręczna czcionek, układy figur z fast_plots
+    for _ in range(warmup):
+        call()
+
+    times = []
+    for _ in range(repeat):
+        default_cache.clear()
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+
+    default_cache.clear()
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        "times_s": times,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "peak_traced_bytes": peak,
+    }
+    rss = max_rss_bytes()
+    if rss is not None:
+        result["max_rss_bytes"] = rss
+    return result
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=repo_dir, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def machine_info():
+    import matplotlib
+    import scipy
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+def case_key(result):
+    return (result["case"], result["megapixels"], result["mode"])
+
+def compare_results(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {case_key(result): result for result in json.load(file)["results"]}
+
+    print(f"\nPorównanie z {baseline_path} (mediana: poprzednia -> obecna)")
+    for result in results:
+        previous = baseline.get(case_key(result))
+        if previous is None:
+            continue
+        ratio = result["median_s"] / previous["median_s"] if previous["median_s"] else float("nan")
+        print(f"{result['case']:<26}{result['megapixels']:<6g}{result['mode']:<6}"
+              f"{previous['median_s']:<12.4f}{result['median_s']:<12.4f}x{ratio:.2f}")
+
+def run_benchmarks(sizes, modes, patterns, repeat, work_dir, warmup=1):
+    modules = load_modules()
+    results = []
+    print(f"{'Case':<26}{'MP':<6}{'Mode':<6}{'Median [s]':<12}{'Min [s]':<12}{'Peak [MB]':<12}")
+
+    for index, megapixels in enumerate(sizes):
+        for mode in modes:
+            cases = [case for case in CASES if mode in case[1] and (case[2] or index == 0)
+                     and any(fnmatch.fnmatch(case[0], pattern) for pattern in patterns)]
+            if not cases:
+                continue
+
+            context = Context(work_dir, megapixels, mode, modules)
+            height, width = image_shape(megapixels)
+            for name, _, size_dependent, prepare in cases:
+                result = {"case": name, "megapixels": megapixels if size_dependent else None, "mode": mode,
+                          "width": width, "height": height, "repeat": repeat}
+                result.update(measure(prepare(context), repeat, warmup))
+                results.append(result)
+                print(f"{name:<26}{megapixels if size_dependent else '-':<6}{mode:<6}{result['median_s']:<12.4f}"
+                      f"{result['min_s']:<12.4f}{result['peak_traced_bytes'] / 2**20:<12.1f}")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarki na syntetycznych obrazach")
+    parser.add_argument("--sizes", type=float, nargs="+", default=list(SIZES_MP), help="rozdzielczości w megapikselach")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="tryby kanałów obrazów testowych")
+    parser.add_argument("--cases", nargs="+", default=["*"], help="wzorce nazw przypadków (fnmatch)")
+    parser.add_argument("--repeat", type=int, default=3, help="liczba pomiarów czasu na przypadek")
+    parser.add_argument("--warmup", type=int, default=1, help="liczba wywołań bez pomiaru przed pomiarami")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "stego_benchmarks"),
+                        help="katalog na obrazy syntetyczne i pliki wyjściowe")
+    parser.add_argument("--output", default=None, help="plik JSON z wynikami")
+    parser.add_argument("--compare", default=None, help="poprzedni plik JSON do porównania")
+    parser.add_argument("--list", action="store_true", help="wypisz przypadki i zakończ")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, modes, size_dependent, _ in CASES:
+            print(f"{name:<26}{','.join(modes):<14}{'' if size_dependent else '(raz na tryb)'}")
+        return
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    results = run_benchmarks(args.sizes, args.modes, args.cases, args.repeat, args.work_dir, args.warmup)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "settings": {"sizes": args.sizes, "modes": args.modes, "cases": args.cases, "repeat": args.repeat,
+                     "warmup": args.warmup, "message_length": MESSAGE_LENGTH, "seed": SEED},
+        "results": results,
+    }
+    output = args.output or os.path.join(results_dir, f"{commit or 'unknown'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nWyniki zapisane w {output}")
+
+    if args.compare:
+        compare_results(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Analizy steganograficzne jako biblioteka: histogramy, testy chi-kwadrat, statystyki DCT i DWT,
+detektory RS/SPA, lokalizacja osadzenia i metody ukrywania wiadomości.
+
+    import steganalysis
+    steganalysis.dct.compute_dct_coefficients("obraz.png", "L")
+    from steganalysis import stego
+    stego.hide_data_lsb("okladka.png", "stego.png", "wiadomość")
+
+Podsystemy to skrypty metod (steganalysis/<metoda>/...), ładowane przez steganalysis.common.script_loader
+dopiero przy pierwszym dostępie do atrybutu - `import steganalysis` nie importuje numpy, matplotlib,
+scipy, pywt, pandas ani cv2 i niczego nie uruchamia, a ciężkie zależności wewnątrz skryptów są leniwe
+(steganalysis.common.lazy_imports). Wspólny kod i skrypty metod leżą wewnątrz pakietu, więc instalacja
+nie dodaje innych pakietów najwyższego poziomu. Wiersz poleceń: `steganalysis <polecenie> ...`
+(steganalysis.cli); tests/test_imports.py pilnuje, żeby import pakietu i podsystemów pozostał lekki.
+"""
+import os
+
+SCRIPTS = {
+    "histogram": os.path.join("histogram_method", "3_channel.py"),
+    "histogram_gray": os.path.join("histogram_method", "1_channel.py"),
+    "chi_square": os.path.join("chi_square_method", "chi_square_test.py"),
+    "pov": os.path.join("chi_square_method", "pov_chi_square.py"),
+    "dct": os.path.join("dct", "dct_analyze.py"),
+    "dwt": os.path.join("dwt", "dwt_analyze.py"),
+    "rs": os.path.join("rs_method", "rs_analysis.py"),
+    "spa": os.path.join("spa_method", "sample_pairs_analysis.py"),
+    "stego": os.path.join("stego", "krys_analiza_i_Steganografia.py"),
+    "pipeline": os.path.join("pipeline", "run_pipeline.py"),
+    "triage": os.path.join("pipeline", "triage_cascade.py"),
+    "evaluation": os.path.join("evaluation", "evaluate_detectors.py"),
+    "service": os.path.join("service", "stego_service.py"),
+    "localization": os.path.join("localization", "localize_lsb.py"),
+}
+
+__all__ = list(SCRIPTS)
+
+
+def __getattr__(name):
+    if name not in SCRIPTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from steganalysis.common.script_loader import load_script
+
+    module = globals()[name] = load_script(SCRIPTS[name])
+    return module
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,5 @@
+import sys
+
+from steganalysis.cli import main
+
+sys.exit(main())
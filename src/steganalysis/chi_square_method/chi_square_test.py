@@ -0,0 +1,165 @@
+import os
+import sys
+import argparse
+from functools import partial
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.histogram_kernel import channel_histograms
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.strip_reader import iter_strips, add_tiled_argument
+from steganalysis.common.feature_store import cached_features, add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.fast_plots import render_grid, plot_mode, add_plots_arguments, configure_plots
+from steganalysis.common.lazy_imports import lazy_module
+
+stats = lazy_module("scipy.stats")
+plt = lazy_module("matplotlib.pyplot")
+
+DIFF_BINS = 512
+DIFF_RANGE = [-5, 5]
+STORE_PARAMS = {"bins": 256, "diff_bins": DIFF_BINS, "diff_range": DIFF_RANGE}  # klucz cech w magazynie
+
+DIFF_VALUES = np.arange(-255, 256)
+
+def calculate_histogram(image):
+    return channel_histograms(image).sum(axis=0)  # wszystkie kanały razem, jak np.histogram(image.flatten())
+
+def chi_square_from_histograms(original_hist, stego_hist):
+    original_hist_corrected = original_hist + 0.5
+    stego_hist_corrected = stego_hist + 0.5
+    
+    with span("stats"):
+        chi2, p, _, _ = stats.chi2_contingency([original_hist_corrected, stego_hist_corrected], correction=False)
+    return chi2, p
+
+def perform_chi_square_test(original_image, stego_image, num_bins=256):
+    original_hist = calculate_histogram(original_image)
+    stego_hist = calculate_histogram(stego_image)
+    return chi_square_from_histograms(original_hist, stego_hist)
+
+def difference_histogram(original_image, stego_image):
+    # Różnice uint8 są całkowite z [-255, 255]: zliczamy je bincountem, a do przedziałów DIFF_BINS
+    # przypisujemy 511 wartości zamiast wszystkich pikseli - wynik jak np.histogram na całym obrazie
+    with span("stats"):
+        diff_image = np.subtract(original_image, stego_image, dtype=np.int16)
+        value_counts = np.bincount((diff_image + 255).reshape(-1), minlength=len(DIFF_VALUES))
+        counts, _ = np.histogram(DIFF_VALUES, bins=DIFF_BINS, range=DIFF_RANGE, weights=value_counts)
+    return counts.astype(np.int64)
+
+def render_difference_counts(diff_counts, methods, save_path):
+    # Ten sam układ co wykres klasyczny, ale figura budowana raz i histogramy jako schodki
+    edges = np.linspace(DIFF_RANGE[0], DIFF_RANGE[1], DIFF_BINS + 1)
+    cells = [{"row": 0, "col": i, "counts": counts, "edges": edges, "title": f'Difference Histogram ({method})',
+              "xlabel": 'Pixel Intensity Difference', "ylabel": 'Frequency', "color": 'r', "alpha": 0.7}
+             for i, (method, counts) in enumerate(zip(methods, diff_counts))]
+    render_grid("difference_counts", (1, len(methods)), (12, 4), cells, save_path)
+
+def draw_difference_counts(diff_counts, methods, hist_filename):
+    fig, axes = plt.subplots(1, len(methods), figsize=(12, 4))
+    if len(methods) == 1:
+        axes = [axes]
+    
+    edges = np.linspace(DIFF_RANGE[0], DIFF_RANGE[1], DIFF_BINS + 1)
+    for ax, method, counts in zip(axes, methods, diff_counts):
+        ax.hist(edges[:-1], bins=edges, weights=counts, color='r', alpha=0.7)
+        ax.set_title(f'Difference Histogram ({method})')
+        ax.set_xlabel('Pixel Intensity Difference')
+        ax.set_ylabel('Frequency')
+    
+    plt.tight_layout()
+    with span("save"):
+        plt.savefig(hist_filename)
+    plt.close()
+
+def plot_difference_counts(diff_counts, methods, img_name):
+    mode = plot_mode()
+    if mode == "none":
+        return
+
+    save_dir = os.path.join(images_dir, "chi_square_histograms", img_name)
+    os.makedirs(save_dir, exist_ok=True)
+    hist_filename = os.path.join(save_dir, f"{img_name}_combined_difference_histograms.png")
+    with span("plot"):
+        if mode == "fast":
+            render_difference_counts(diff_counts, methods, hist_filename)
+        else:
+            draw_difference_counts(diff_counts, methods, hist_filename)
+
+def plot_difference_histograms(original_image, stego_images, methods, img_name):
+    diff_counts = [difference_histogram(original_image, stego_image) for stego_image in stego_images]
+    plot_difference_counts(diff_counts, methods, img_name)
+
+def report_chi_square(original_hist, stego_hists, diff_counts, methods, img_name):
+    for method, stego_hist in zip(methods, stego_hists):
+        chi2_gray, p_gray = chi_square_from_histograms(original_hist, stego_hist)
+        stego_detected = "Yes" if p_gray < 0.05 else "No"
+        print(f"{img_name:<20}{method:<10}{chi2_gray:<15.5f}{p_gray:<15.5e}{stego_detected}")
+    plot_difference_counts(diff_counts, methods, img_name)
+
+def detect_stego_changes_9(original_image, stego_images, methods, img_name):
+    original_hist = calculate_histogram(original_image)
+    stego_hists = [calculate_histogram(stego_image) for stego_image in stego_images]
+    diff_counts = [difference_histogram(original_image, stego_image) for stego_image in stego_images]
+    report_chi_square(original_hist, stego_hists, diff_counts, methods, img_name)
+
+def histograms_from_files(original_path, stego_path, tiled=False):
+    # Histogramy obu obrazów i histogram różnic liczone pasami (te same wiersze z obu plików naraz)
+    original_hist = np.zeros(256, dtype=np.int64)
+    stego_hist = np.zeros(256, dtype=np.int64)
+    diff_counts = np.zeros(DIFF_BINS, dtype=np.int64)
+
+    strips = zip(iter_strips(original_path, "L", tiled=tiled), iter_strips(stego_path, "L", tiled=tiled))
+    for original_strip, stego_strip in strips:
+        original_hist += calculate_histogram(original_strip)
+        stego_hist += calculate_histogram(stego_strip)
+        diff_counts += difference_histogram(original_strip, stego_strip)
+
+    return original_hist, stego_hist, diff_counts
+
+def pair_histograms(original_path, stego_path, tiled=False):
+    # Histogramy pary (oryginał, stego) z magazynu cech - liczone tylko dla nowych albo zmienionych plików
+    def compute():
+        original_hist, stego_hist, diff_counts = histograms_from_files(original_path, stego_path, tiled)
+        return {"original": original_hist, "stego": stego_hist, "difference": diff_counts}
+
+    features = cached_features([original_path, stego_path], "chi_square_pair", STORE_PARAMS, compute)
+    return features["original"], features["stego"], features["difference"]
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['lsb', 'rgba', 'dct']
+
+def process_image(img, tiled=False):
+    original_filename = os.path.join(original_images_dir, img)
+    original_hist = None
+    stego_hists = []
+    diff_counts = []
+
+    for method in methods:
+        stego_image_dir = os.path.join(images_dir, f"{method}_images")
+        stego_filename = os.path.join(stego_image_dir, img)
+        try:
+            original_hist, stego_hist, counts = pair_histograms(original_filename, stego_filename, tiled)
+        except (OSError, ValueError):
+            print(f"Warning: Could not load stego image for {img} with method {method}.")
+            break
+        stego_hists.append(stego_hist)
+        diff_counts.append(counts)
+
+    if original_hist is not None and len(stego_hists) == len(methods):
+        report_chi_square(original_hist, stego_hists, diff_counts, methods, img.split('.')[0])
+    else:
+        print(f"Warning: Could not load all image pairs for {img}.")
+
+if __name__ == "__main__":
+    parser = add_store_arguments(add_tiled_argument(add_trace_argument(add_jobs_argument(argparse.ArgumentParser()))))
+    args = add_plots_arguments(parser).parse_args()
+    configure_store(args)
+    configure_trace(args)
+    configure_plots(args)
+    images = [img for img in os.listdir(original_images_dir) if img.endswith(('.png', '.jpg', '.jpeg'))]
+    run_batch(partial(process_image, tiled=args.tiled), images, jobs=args.jobs)
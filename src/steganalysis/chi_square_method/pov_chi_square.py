@@ -0,0 +1,160 @@
+import os
+import sys
+import argparse
+from functools import partial
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import load_image_or_none, has_alpha
+from steganalysis.common.histogram_kernel import channel_histograms
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.feature_store import cached_features, add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.fast_plots import render_grid, plot_mode, add_plots_arguments, configure_plots
+from steganalysis.common.lazy_imports import lazy_module
+
+stats = lazy_module("scipy.stats")
+plt = lazy_module("matplotlib.pyplot")
+
+# Ślepy atak chi-kwadrat par wartości (Westfeld, Pfitzmann): osadzanie w LSB wyrównuje liczności
+# par (2i, 2i+1). Prawdopodobieństwo osadzenia liczone jest dla coraz dłuższych prefiksów obrazu
+# (w kolejności wierszowej, jak zapisują hide_data_lsb i hide_data_alpha). Histogramy prefiksów to
+# skumulowane histogramy kolejnych odcinków pikseli, więc cała krzywa kosztuje jeden przebieg po obrazie.
+
+SAMPLE_POINTS = 100
+MIN_EXPECTED = 5
+EMBEDDED_PROBABILITY = 0.5
+CHANNELS = ("R", "G", "B")
+
+def prefix_histograms(image, sample_points=SAMPLE_POINTS):
+    # (h, w, c) -> ułamki przeskanowanego obrazu (k,) i histogramy prefiksów (k, c, 256); granice
+    # prefiksów leżą na pikselach w kolejności wierszowej, każdy piksel jest liczony raz
+    pixels = image.reshape(-1, 1, image.shape[-1])
+    count = len(pixels)
+    boundaries = np.unique(np.linspace(0, count, min(sample_points, count) + 1).round().astype(int))
+    segments = np.stack([channel_histograms(pixels[p0:p1]) for p0, p1 in zip(boundaries[:-1], boundaries[1:])])
+    return boundaries[1:] / count, np.cumsum(segments, axis=0)
+
+def pov_probability(histograms):
+    # histograms: (..., 256) -> prawdopodobieństwo osadzenia dla każdego histogramu
+    observed = histograms[..., 0::2].astype(np.float64)
+    expected = (histograms[..., 0::2] + histograms[..., 1::2]) / 2.0
+    used = expected >= MIN_EXPECTED
+
+    statistic = np.sum(np.where(used, (observed - expected) ** 2 / np.where(used, expected, 1.0), 0.0), axis=-1)
+    # Płaszczyzna stała (np. alfa = 255) daje tylko jedną parę - wtedy liczymy z jednym stopniem swobody
+    categories = used.sum(axis=-1)
+    probability = stats.chi2.sf(statistic, np.maximum(categories - 1, 1))
+    return np.where(categories > 0, probability, 0.0)
+
+def embedded_fraction(fractions, probability, threshold=EMBEDDED_PROBABILITY):
+    # Najdłuższy prefiks, dla którego prawdopodobieństwo osadzenia przekracza próg; krótkie prefiksy
+    # mają mało próbek i szum, ale za końcem wiadomości prawdopodobieństwo szybko spada do zera
+    above = np.flatnonzero(probability >= threshold)
+    return float(fractions[above[-1]]) if above.size else 0.0
+
+def compute_pov_curves(image_path, sample_points=SAMPLE_POINTS):
+    # Krzywe dla kanałów R, G, B, dla wszystkich trzech razem (kolejność hide_data_lsb) i dla alfy
+    alpha = has_alpha(image_path)
+    image = load_image_or_none(image_path, "RGBA" if alpha else "RGB")
+    if image is None:
+        raise OSError(f"Nie można wczytać obrazu {image_path}")
+
+    with span("stats"):
+        return curves_from_image(image, sample_points)
+
+def curves_from_image(image, sample_points=SAMPLE_POINTS):
+    # image: (h, w, 3) albo (h, w, 4) - czwarty kanał to alfa
+    fractions, histograms = prefix_histograms(image, sample_points)
+    curves = {channel: pov_probability(histograms[:, i]) for i, channel in enumerate(CHANNELS)}
+    curves["RGB"] = pov_probability(histograms[:, :3].sum(axis=1))
+    if image.shape[2] == 4:
+        curves["alpha"] = pov_probability(histograms[:, 3])
+    return {"fractions": fractions, **curves}
+
+def store_params(sample_points=SAMPLE_POINTS):
+    # Klucz cech w magazynie (wspólny z analizatorem pov w run_pipeline)
+    return {"sample_points": sample_points, "min_expected": MIN_EXPECTED}
+
+def pov_curves(image_path, sample_points=SAMPLE_POINTS):
+    # (ułamki, krzywe) z magazynu cech; None, gdy obrazu nie da się wczytać
+    try:
+        features = cached_features([image_path], "pov_curves", store_params(sample_points), partial(compute_pov_curves, image_path, sample_points))
+    except (OSError, ValueError):
+        return None
+    fractions = features.pop("fractions")
+    return fractions, features
+
+CURVE_COLORS = {"R": "red", "G": "green", "B": "blue", "RGB": "black", "alpha": "gray"}
+
+def pov_plot_path(img_name, method):
+    save_dir = os.path.join(images_dir, "pov_chi_square", img_name)
+    os.makedirs(save_dir, exist_ok=True)
+    return os.path.join(save_dir, f"{img_name}_pov_{method}.png")
+
+def plot_pov_curves(fractions, curves, img_name, method):
+    fig, ax = plt.subplots(figsize=(8, 4))
+    for channel, probability in curves.items():
+        ax.plot(fractions * 100, probability, color=CURVE_COLORS[channel], label=channel)
+    ax.set_title(f'Atak chi-kwadrat par wartości - {img_name} ({method})')
+    ax.set_xlabel('Przeskanowana część obrazu [%]')
+    ax.set_ylabel('Prawdopodobieństwo osadzenia')
+    ax.set_ylim(-0.05, 1.05)
+    ax.legend()
+
+    plt.tight_layout()
+    with span("save"):
+        plt.savefig(pov_plot_path(img_name, method))
+    plt.close()
+
+def render_pov_curves(fractions, curves, img_name, method):
+    # Szybka ścieżka, układ jak plot_pov_curves; krzywa alfy jest tylko dla plików z alfą, więc zestaw
+    # kanałów wyznacza osobny układ figury
+    lines = [(channel, fractions * 100, probability, CURVE_COLORS[channel]) for channel, probability in curves.items()]
+    cell = {"row": 0, "col": 0, "lines": lines, "ylim": (-0.05, 1.05),
+            "title": f'Atak chi-kwadrat par wartości - {img_name} ({method})',
+            "xlabel": 'Przeskanowana część obrazu [%]', "ylabel": 'Prawdopodobieństwo osadzenia'}
+    render_grid("pov_" + "_".join(curves), (1, 1), (8, 4), [cell], pov_plot_path(img_name, method))
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['original', 'lsb', 'rgba', 'dct']
+
+def image_folder(method):
+    return original_images_dir if method == 'original' else os.path.join(images_dir, f"{method}_images")
+
+def process_image(img, sample_points=SAMPLE_POINTS):
+    img_name = img.split('.')[0]
+    for method in methods:
+        result = pov_curves(os.path.join(image_folder(method), img), sample_points)
+        if result is None:
+            print(f"Warning: Could not load image {img} for method {method}.")
+            continue
+
+        fractions, curves = result
+        for channel, probability in curves.items():
+            fraction = embedded_fraction(fractions, probability)
+            print(f"{img_name:<20}{method:<10}{channel:<8}{probability[-1]:<15.5f}{fraction * 100:<10.1f}")
+        mode = plot_mode()
+        if mode != "none":
+            with span("plot"):
+                if mode == "fast":
+                    render_pov_curves(fractions, curves, img_name, method)
+                else:
+                    plot_pov_curves(fractions, curves, img_name, method)
+
+if __name__ == "__main__":
+    parser = add_store_arguments(add_trace_argument(add_jobs_argument(argparse.ArgumentParser())))
+    parser.add_argument("--points", type=int, default=SAMPLE_POINTS,
+                        help="liczba punktów krzywej (prefiksów obrazu)")
+    args = add_plots_arguments(parser).parse_args()
+    configure_store(args)
+    configure_trace(args)
+    configure_plots(args)
+
+    images = [img for img in os.listdir(original_images_dir) if img.endswith(('.png', '.jpg', '.jpeg'))]
+    print(f"{'Image':<20}{'Method':<10}{'Channel':<8}{'p (100%)':<15}{'Embedded [%]':<10}")
+    run_batch(partial(process_image, sample_points=args.points), images, jobs=args.jobs)
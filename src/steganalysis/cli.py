@@ -0,0 +1,66 @@
+"""
+Wspólny punkt wejścia wiersza poleceń: `steganalysis <polecenie> [argumenty skryptu]`.
+
+Polecenie uruchamia jeden skrypt metody tak, jak `python src/steganalysis/<metoda>/<skrypt>.py` - z tymi samymi
+argumentami (--jobs, --no-store, --plots...) - więc start płaci tylko za importy tego skryptu.
+`steganalysis <polecenie> --help` pokazuje argumenty skryptu.
+"""
+import os
+import sys
+import runpy
+
+from steganalysis import SCRIPTS
+
+DESCRIPTIONS = {
+    "histogram": "histogramy kanałów R, G, B oryginałów i obrazów stego",
+    "histogram_gray": "histogramy w skali szarości",
+    "chi_square": "test chi-kwadrat histogramów par oryginał/stego",
+    "pov": "ślepy atak chi-kwadrat par wartości (POV)",
+    "dct": "statystyki współczynników DCT",
+    "dwt": "statystyki współczynników DWT (bloki albo pełny rozkład wielopoziomowy)",
+    "rs": "detektor RS",
+    "spa": "detektor SPA (sample pairs)",
+    "stego": "ukrywanie wiadomości, raporty porównawcze, generowanie korpusu (--corpus) i inwentaryzacja (--inventory)",
+    "pipeline": "wszystkie analizy w jednym przebiegu",
+    "triage": "kaskada selekcji: tanie testy, analizy DCT/DWT tylko dla podejrzanych",
+    "evaluation": "ocena detektorów: ROC, AUC, EER",
+    "service": "usługa steganalizy (HTTP na localhost albo gniazdo Unix)",
+    "localization": "mapy cieplne lokalizacji osadzenia (POV, pary LSB, parzystość DCT)",
+}
+
+
+def command_name(name):
+    return name.replace("_", "-")
+
+
+def usage():
+    lines = ["użycie: steganalysis <polecenie> [argumenty]", "", "polecenia:"]
+    lines += [f"  {command_name(name):<16}{DESCRIPTIONS[name]}" for name in SCRIPTS]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+
+    commands = {command_name(name): name for name in SCRIPTS}
+    if argv[0] not in commands:
+        print(f"Nieznane polecenie: {argv[0]}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    from steganalysis.common.script_loader import package_dir
+
+    script_path = os.path.join(package_dir, SCRIPTS[commands[argv[0]]])
+    saved_argv = sys.argv
+    sys.argv = [f"steganalysis {argv[0]}"] + argv[1:]
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Wspólny mechanizm przetwarzania wsadowego: praca "na obraz" rozkładana na pulę procesów.
+
+run_batch(function, items, jobs) zwraca wyniki w kolejności items niezależnie od kolejności, w jakiej
+kończą się procesy, a tekst wypisany przez function w procesie roboczym jest przechwytywany i
+wypisywany w procesie głównym w tej samej kolejności - wyjście (konsola, CSV, LaTeX) jest takie samo
+jak przy przebiegu sekwencyjnym. Przy jobs <= 1 wszystko działa w bieżącym procesie.
+"""
+import io
+import os
+import sys
+import argparse
+import contextlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from steganalysis.common.instrumentation import traced_call
+from steganalysis.common.fast_plots import plot_mode
+
+JOBS_ENV_VAR = "STEGO_JOBS"
+
+
+def default_jobs():
+    return int(os.environ.get(JOBS_ENV_VAR, "1"))
+
+
+def add_jobs_argument(parser):
+    parser.add_argument("--jobs", "-j", type=int, default=default_jobs(),
+                        help="liczba procesów roboczych (0 = liczba rdzeni, domyślnie 1)")
+    return parser
+
+
+def parse_jobs(argv=None):
+    parser = add_jobs_argument(argparse.ArgumentParser())
+    return parser.parse_args(argv).jobs
+
+
+def resolve_jobs(jobs):
+    if jobs is None:
+        jobs = default_jobs()
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return jobs
+
+
+def warm_worker(initializer=None, initargs=()):
+    # Stan "na proces": backend bez okien i ciężkie importy robione raz, a nie dla każdego obrazu.
+    # pyplot jest potrzebny tylko klasycznym wykresom - pozostałe przebiegi importują to, czego używają
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    if plot_mode() == "classic":
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def call_captured(function, item):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = function(item)
+    return result, buffer.getvalue()
+
+
+def run_batch(function, items, jobs=None, chunksize=None, initializer=None, initargs=()):
+    items = list(items)
+    jobs = min(resolve_jobs(jobs), max(len(items), 1))
+    function = partial(traced_call, function)  # element jako bieżący obraz dla pomiaru etapów
+
+    if jobs <= 1:
+        return [function(item) for item in items]
+
+    if chunksize is None:
+        chunksize = max(1, len(items) // (jobs * 4))
+
+    results = []
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=warm_worker, initargs=(initializer, initargs))
+    try:
+        captured = executor.map(call_captured, [function] * len(items), items, chunksize=chunksize)
+        for result, output in captured:
+            sys.stdout.write(output)
+            results.append(result)
+    except BaseException:
+        # Błąd w jednym obrazie (albo Ctrl+C) - nie czekamy na resztę kolejki
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+    return results
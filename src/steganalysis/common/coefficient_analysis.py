@@ -0,0 +1,29 @@
+"""
+Części wspólne porównań współczynników DCT i DWT (dct_analyze, dwt_analyze): podział kanału na bloki,
+podsumowanie statystyk w konsoli i argumenty katalogów wejścia/wyjścia.
+"""
+import os
+
+
+def split_into_blocks(channel, block_size=8):
+    # Widok (nblocks, block_size, block_size) w kolejności wierszowej; niepełne bloki na krawędziach są pomijane
+    height, width = channel.shape
+    rows = height // block_size
+    cols = width // block_size
+    cropped = channel[:rows * block_size, :cols * block_size]
+    blocks = cropped.reshape(rows, block_size, cols, block_size).swapaxes(1, 2)
+    return blocks.reshape(rows * cols, block_size, block_size)
+
+
+def print_summary(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders, color_label="RGB"):
+    names = ["Oryginał"] + [os.path.basename(folder) for folder in stego_folders]
+    for name, gray, rgb in zip(names, [base_stats_gray] + stego_stats_gray, [base_stats_rgb] + stego_stats_rgb):
+        print(f"{image_name:<20}{name:<15}gray: {gray['mean']:<12.4f}{gray['std_dev']:<12.4f}{color_label.lower()}: {rgb['mean']:<12.4f}{rgb['std_dev']:<12.4f}")
+
+
+def add_folder_arguments(parser, base_folder, stego_folders, output_folder):
+    # Domyślne katalogi podaje skrypt - każdy zapisuje wykresy gdzie indziej
+    parser.add_argument("--base-folder", default=base_folder, help="katalog oryginałów")
+    parser.add_argument("--stego-folders", nargs="+", default=stego_folders, help="katalogi obrazów stego")
+    parser.add_argument("--output-folder", default=output_folder, help="katalog wykresów")
+    return parser
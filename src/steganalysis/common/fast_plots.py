@@ -0,0 +1,180 @@
+"""
+Szybkie renderowanie wykresów histogramów bez okien (backend Agg).
+
+Układ figury (siatka osi, opisy, tight_layout) jest budowany raz na proces i używany dla kolejnych
+obrazów - zmieniają się tylko dane artystów i tytuły. Gotowe liczności są rysowane jako jeden
+StepPatch (ax.stairs) na oś zamiast 256 prostokątów bar() albo ponownego binowania w hist().
+Figury nie przechodzą przez pyplot, a PNG jest zapisywany z niską kompresją. matplotlib jest importowany
+dopiero przy pierwszej figurze - przebiegi z --no-plots go nie ładują.
+
+Tryb rysowania (--plots albo zmienna STEGO_PLOTS):
+    "fast"    - ten moduł (domyślnie)
+    "classic" - dotychczasowe funkcje plot_* z pyplot i bar()/hist()
+    "none"    - bez wykresów, tylko wyniki liczbowe (także --no-plots)
+"""
+import os
+
+import numpy as np
+from steganalysis.common.instrumentation import span
+
+PLOTS_ENV_VAR = "STEGO_PLOTS"
+PLOT_MODES = ("fast", "classic", "none")
+PNG_OPTIONS = {"compress_level": 1}
+BYTE_EDGES = np.arange(257) - 0.5  # przedziały histogramu uint8 wyśrodkowane na wartościach, jak bar(range(256))
+
+layouts = {}
+
+
+def plot_mode():
+    mode = os.environ.get(PLOTS_ENV_VAR, "fast")
+    if mode not in PLOT_MODES:
+        raise ValueError(f"Nieznany tryb wykresów: {mode}")
+    return mode
+
+
+def add_plots_arguments(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--plots", choices=PLOT_MODES, default=None,
+                       help="sposób rysowania wykresów (domyślnie fast)")
+    group.add_argument("--no-plots", action="store_true", help="tylko wyniki liczbowe, bez wykresów")
+    return parser
+
+
+def configure_plots(args):
+    # Przez zmienną środowiskową, żeby tryb dziedziczyły procesy robocze run_batch
+    if args.no_plots:
+        os.environ[PLOTS_ENV_VAR] = "none"
+    elif args.plots:
+        os.environ[PLOTS_ENV_VAR] = args.plots
+
+
+class FigureLayout:
+    def __init__(self, shape, figsize, hidden=(), suptitle_size=16):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.figure = Figure(figsize=figsize)
+        FigureCanvasAgg(self.figure)
+        self.axes = self.figure.subplots(*shape, squeeze=False)
+        self.suptitle = self.figure.suptitle("", fontsize=suptitle_size)
+        self.steps = {}
+        self.laid_out = False
+        for row, col in hidden:
+            self.axes[row, col].axis("off")
+
+    def draw_cell(self, cell):
+        if "lines" in cell:
+            self.draw_line_cell(cell)
+            return
+        row, col = cell["row"], cell["col"]
+        ax = self.axes[row, col]
+        artist = self.steps.get((row, col))
+
+        if artist is None:
+            # Pierwszy obraz: artysta i stałe opisy osi; granice ustawiane ręcznie, więc bez autoskalowania
+            log = cell.get("log", False)
+            ax.set_autoscale_on(False)
+            if log:
+                ax.set_yscale("log", nonpositive="clip")
+            # Liczności są całkowite, więc na osi logarytmicznej słupki wypełniane są od 0.5 zamiast od zera
+            artist = ax.stairs(cell["counts"], cell["edges"], color=cell.get("color"), alpha=cell.get("alpha", 1.0),
+                               fill=True, baseline=0.5 if log else 0)
+            self.steps[(row, col)] = artist
+            ax.set_xlabel(cell.get("xlabel", ""))
+            ax.set_ylabel(cell.get("ylabel", ""))
+        else:
+            artist.set_data(cell["counts"], cell["edges"])
+
+        ax.set_title(cell.get("title", ""))
+        self.set_limits(ax, cell)
+
+    def draw_line_cell(self, cell):
+        # Komórka z krzywymi: lines to krotki (etykieta, x, y, kolor); artyści Line2D i legenda powstają raz,
+        # dla kolejnych obrazów zmieniają się tylko dane (zestaw etykiet jest częścią nazwy układu)
+        row, col = cell["row"], cell["col"]
+        ax = self.axes[row, col]
+        for label, x, y, color in cell["lines"]:
+            artist = self.steps.get((row, col, label))
+            if artist is None:
+                ax.set_autoscale_on(False)
+                (self.steps[(row, col, label)],) = ax.plot(x, y, color=color, label=label)
+            else:
+                artist.set_data(x, y)
+        if not ax.get_legend():
+            ax.set_xlabel(cell.get("xlabel", ""))
+            ax.set_ylabel(cell.get("ylabel", ""))
+            ax.legend()
+
+        ax.set_title(cell.get("title", ""))
+        x = np.concatenate([np.asarray(line[1]) for line in cell["lines"]])
+        extent = (x.max() - x.min()) or 1
+        ax.set_xlim(x.min() - 0.05 * extent, x.max() + 0.05 * extent)
+        ax.set_ylim(*cell["ylim"])
+
+    @staticmethod
+    def set_limits(ax, cell):
+        # Granice liczone z danych wprost (jak autoskalowanie z marginesem 5%) - relim() na ścieżce
+        # schodków jest wolniejszy niż samo rysowanie osi
+        counts, edges = np.asarray(cell["counts"]), np.asarray(cell["edges"])
+        ax.set_xlim(edges[0] - 0.05 * (edges[-1] - edges[0]), edges[-1] + 0.05 * (edges[-1] - edges[0]))
+
+        if cell.get("log", False):
+            # Bez dodatnich wartości (np. zerowa różnica histogramów) oś logarytmiczna dostaje zakres zastępczy
+            positive = counts[counts > 0]
+            low, high = (positive.min(), positive.max()) if positive.size else (1, 10)
+            ax.set_ylim(low / (high / low) ** 0.05, high * (high / low) ** 0.05 if high > low else high * 10)
+            return
+        low, high = min(counts.min(), 0), max(counts.max(), 0)
+        extent = (high - low) or 1
+        ax.set_ylim(low - 0.05 * extent if low < 0 else 0, high + 0.05 * extent)
+
+    def save(self, save_path, rect=(0, 0, 1, 1)):
+        if not self.laid_out:
+            # Jednorazowe tight_layout bez przypinania silnika układu - inaczej savefig rysuje figurę dwa razy
+            from matplotlib.layout_engine import TightLayoutEngine
+            TightLayoutEngine(rect=rect).execute(self.figure)
+            self.laid_out = True
+        with span("save"):
+            self.figure.savefig(save_path, pil_kwargs=PNG_OPTIONS)
+
+
+def render_grid(name, shape, figsize, cells, save_path, suptitle="", rect=(0, 0, 1, 1), hidden=()):
+    # cells: słowniki {row, col, counts, edges, title, xlabel, ylabel, color, alpha, log}
+    # albo {row, col, lines, ylim, title, xlabel, ylabel} dla krzywych (draw_line_cell)
+    key = (name, shape, figsize)
+    layout = layouts.get(key)
+    if layout is None:
+        layout = layouts[key] = FigureLayout(shape, figsize, hidden)
+
+    layout.suptitle.set_text(suptitle)
+    for cell in cells:
+        layout.draw_cell(cell)
+    layout.save(save_path, rect)
+
+
+def coefficient_histogram_cell(transform, stats, row, col, title, color):
+    # Komórka z histogramem współczynników (stats["histogram"] to StreamingStats) w 50 przedziałach
+    edges = stats["histogram"].display_edges(50)
+    return {"row": row, "col": col, "counts": stats["histogram"].bin_counts(edges), "edges": edges, "title": title,
+            "xlabel": f"Wartość współczynnika {transform}", "ylabel": "Liczba wystąpień", "color": color, "alpha": 0.7, "log": True}
+
+
+def render_coefficient_comparison(transform, image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb,
+                                  stego_folders, output_graph_folder, color_label="RGB"):
+    # Układ create_comparison_plot z dct_analyze/dwt_analyze (transform = "DCT" albo "DWT"): wiersze 0 i 2
+    # to histogramy oryginału i obrazów stego (skala szarości, kolor), wiersze 1 i 3 - różnice względem
+    # oryginału; color_label opisuje wiersze koloru (YCbCr dla współczynników czytanych z plików JPEG)
+    cells = []
+    for row, variant, base_stats, stego_stats in [(0, "Grayscale", base_stats_gray, stego_stats_gray), (2, color_label, base_stats_rgb, stego_stats_rgb)]:
+        cells.append(coefficient_histogram_cell(transform, base_stats, row, 0, f"Histogram - Oryginał ({variant})", "blue"))
+        bins = base_stats["histogram"].display_edges(50)
+        base_hist = base_stats["histogram"].bin_counts(bins)
+        for idx, stego_stat in enumerate(stego_stats):
+            folder = os.path.basename(stego_folders[idx])
+            cells.append(coefficient_histogram_cell(transform, stego_stat, row, idx+1, f"Histogram - {folder} ({variant})", "green"))
+            cells.append({"row": row+1, "col": idx+1, "counts": stego_stat["histogram"].bin_counts(bins) - base_hist, "edges": bins,
+                          "title": f"Różnice histogramów - {folder} ({variant})", "xlabel": f"Wartość współczynnika {transform}",
+                          "ylabel": "Różnica liczby wystąpień", "color": "red", "alpha": 0.7, "log": True})
+
+    render_grid(f"comparison_{transform.lower()}", (4, 4), (20, 10), cells, os.path.join(output_graph_folder, f"{image_name}"),
+                suptitle=f"Porównanie współczynników {transform} - {image_name}", rect=[0, 0.03, 1, 0.95], hidden=[(1, 0), (3, 0)])
@@ -0,0 +1,173 @@
+"""
+Trwały magazyn cech adresowany zawartością plików.
+
+Wynik analizatora (histogramy, statystyki współczynników, wyniki detektorów) jest zapisywany jako
+plik .npz pod kluczem sha256(skróty zawartości plików wejściowych + nazwa analizatora + parametry),
+w katalogu <root>/<analizator>/<klucz[:2]>/<klucz>.npz. Zmiana pliku zmienia skrót, więc ponowny
+przebieg liczy tylko to, czego w magazynie brakuje; zmiana nazwy albo przeniesienie pliku niczego
+nie unieważnia.
+
+Tryby (--no-store, --from-store albo zmienna STEGO_FEATURE_STORE_MODE):
+    "use"  - odczyt i zapis (domyślnie)
+    "off"  - magazyn wyłączony, wszystko liczone od nowa
+    "only" - tylko odczyt; brakujące cechy to błąd MissingFeatures (OSError, jak nieczytelny plik -
+             obraz jest pomijany z ostrzeżeniem), obrazy nie są dekodowane - pozwala odtworzyć
+             raporty CSV/LaTeX bez dotykania pikseli
+Katalog magazynu: --feature-store albo zmienna STEGO_FEATURE_STORE (domyślnie <repo>/feature_store).
+Ustawienia trafiają do zmiennych środowiskowych, więc dziedziczą je procesy robocze run_batch.
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+
+import numpy as np
+
+STORE_ENV_VAR = "STEGO_FEATURE_STORE"
+STORE_MODE_ENV_VAR = "STEGO_FEATURE_STORE_MODE"
+STORE_MODES = ("use", "off", "only")
+DEFAULT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "feature_store"))
+FORMAT_VERSION = 1
+HASH_CHUNK = 1 << 20
+META_KEY = "__meta__"
+
+
+class MissingFeatures(OSError):
+    # Brak wpisu w magazynie jak brak pliku: wywołujące traktują go jak nieczytelny obraz (ostrzeżenie i pominięcie)
+    pass
+
+
+class FeatureStore:
+    def __init__(self, root=None, mode=None):
+        self.root = root
+        self.mode = mode
+        self.digests = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def current_root(self):
+        return self.root or os.environ.get(STORE_ENV_VAR) or DEFAULT_ROOT
+
+    @property
+    def current_mode(self):
+        mode = self.mode or os.environ.get(STORE_MODE_ENV_VAR, "use")
+        if mode not in STORE_MODES:
+            raise ValueError(f"Nieznany tryb magazynu cech: {mode}")
+        return mode
+
+    def file_digest(self, path):
+        # Skrót zawartości, zapamiętany dla (ścieżka, mtime, rozmiar) - plik czytany jest raz na proces
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        memo_key = (path, stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            digest = self.digests.get(memo_key)
+        if digest is not None:
+            return digest
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with self.lock:
+            self.digests[memo_key] = digest
+        return digest
+
+    def key(self, paths, analyzer, params):
+        description = {
+            "inputs": [self.file_digest(path) for path in paths],
+            "analyzer": analyzer,
+            "params": params,
+            "version": FORMAT_VERSION,
+        }
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def entry_path(self, analyzer, key):
+        return os.path.join(self.current_root, analyzer, key[:2], f"{key}.npz")
+
+    def get(self, paths, analyzer, params):
+        entry = self.entry_path(analyzer, self.key(paths, analyzer, params))
+        try:
+            with np.load(entry, allow_pickle=False) as data:
+                return {name: unpack(data[name]) for name in data.files if name != META_KEY}
+        except (OSError, ValueError, KeyError):
+            # Brak wpisu albo plik uszkodzony (np. przerwany zapis) - liczymy od nowa
+            return None
+
+    def put(self, paths, analyzer, params, features):
+        entry = self.entry_path(analyzer, self.key(paths, analyzer, params))
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        meta = json.dumps({"sources": [os.path.abspath(path) for path in paths], "analyzer": analyzer,
+                           "params": params, "version": FORMAT_VERSION}, sort_keys=True)
+
+        # Zapis do pliku tymczasowego i os.replace - równoległe procesy nie widzą niepełnych wpisów
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(entry), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez_compressed(file, **{META_KEY: np.array(meta)}, **features)
+            os.replace(temp_path, entry)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def lookup(self, paths, analyzer, params):
+        # Cechy z magazynu albo None, gdy trzeba je policzyć (także przy wyłączonym magazynie)
+        mode = self.current_mode
+        if mode == "off":
+            return None
+
+        features = self.get(paths, analyzer, params)
+        if features is not None:
+            self.hits += 1
+            return features
+        if mode == "only":
+            raise MissingFeatures(f"Brak cech {analyzer} dla {', '.join(paths)} w magazynie {self.current_root}")
+        return None
+
+    def save(self, paths, analyzer, params, features):
+        if self.current_mode == "use":
+            self.misses += 1
+            self.put(paths, analyzer, params, features)
+
+    def cached(self, paths, analyzer, params, compute):
+        # Cechy z magazynu albo compute() -> dict nazwa -> tablica/liczba/napis, zapisany na przyszłość
+        features = self.lookup(paths, analyzer, params)
+        if features is None:
+            features = compute()
+            self.save(paths, analyzer, params, features)
+        return features
+
+
+def unpack(value):
+    # Tablice 0-wymiarowe wracają jako zwykłe liczby/napisy Pythona
+    return value.item() if value.ndim == 0 else value
+
+
+default_store = FeatureStore()
+
+
+def cached_features(paths, analyzer, params, compute):
+    return default_store.cached(paths, analyzer, params, compute)
+
+
+def add_store_arguments(parser):
+    parser.add_argument("--feature-store", default=None,
+                        help=f"katalog magazynu cech (domyślnie {STORE_ENV_VAR} albo <repo>/feature_store)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--no-store", action="store_true", help="nie używaj magazynu cech, licz wszystko od nowa")
+    group.add_argument("--from-store", action="store_true",
+                       help="tylko odczyt z magazynu cech - raporty bez dekodowania obrazów")
+    return parser
+
+
+def configure_store(args):
+    if args.feature_store:
+        os.environ[STORE_ENV_VAR] = os.path.abspath(args.feature_store)
+    if args.no_store:
+        os.environ[STORE_MODE_ENV_VAR] = "off"
+    elif args.from_store:
+        os.environ[STORE_MODE_ENV_VAR] = "only"
@@ -0,0 +1,123 @@
+"""
+Wspólne jądro histogramów uint8 dla metod histogramowych i testu chi-kwadrat.
+
+Wszystkie kanały obrazu (np. R, G, B, alfa) są liczone jednym np.bincount: do wartości piksela
+dodawane jest przesunięcie 256 * numer_kanału, więc kanały trafiają do rozłącznych zakresów jednego
+licznika. Dla stosu obrazów przesunięcie obejmuje też numer obrazu. Dane idą porcjami wierszy przez
+bufor wielokrotnego użytku - bez kopii całego obrazu i bez binowania na liczbach zmiennoprzecinkowych
+jak w np.histogram. Wynik jest identyczny z np.histogram(kanał, bins=256, range=(0, 256)).
+
+image_histograms(ścieżka) zwraca histogramy R/G/B/gray (i alpha, jeśli plik ma kanał alfa),
+zapisuje je w magazynie cech i zapamiętuje dla (ścieżka, mtime) - histogramy oryginału liczone są
+raz na obraz, niezależnie od tego, z iloma obrazami stego jest porównywany. Pamięć podręczna ma
+ograniczoną liczbę wpisów (najdawniej używane są usuwane jak w image_cache), więc długie przebiegi
+wsadowe i procesy usługi nie rosną bez końca.
+"""
+import os
+import threading
+from collections import OrderedDict
+from functools import partial
+
+import numpy as np
+from PIL import Image
+
+from steganalysis.common.image_cache import has_alpha
+from steganalysis.common.strip_reader import iter_strips
+from steganalysis.common.feature_store import cached_features
+from steganalysis.common.instrumentation import span
+
+CHUNK_VALUES = 1 << 18  # bufor indeksów mieści się w cache L2, co przyspiesza bincount
+BINS = 256
+STORE_PARAMS = {"bins": BINS}  # klucz histogramów w magazynie cech
+MEMO_ENTRIES = 256  # ok. 10 KB na obraz
+
+histogram_memo = OrderedDict()
+memo_lock = threading.Lock()
+
+
+def interleaved_histograms(images, planes, chunk_values=CHUNK_VALUES):
+    # images: (n, wiersze, ..., planes) uint8 -> (n, planes, 256); kanały przeplecione na ostatniej osi
+    count = images.shape[0]
+    rows = images.reshape(count * images.shape[1], -1, planes)
+    rows_per_image = images.shape[1]
+    row_values = max(rows.shape[1] * planes, 1)
+    rows_per_chunk = max(1, chunk_values // row_values)
+
+    # Przesunięcie dla (obraz, kanał) - każdy trafia do własnego zakresu 256 przedziałów
+    offsets = (np.arange(count * planes, dtype=np.intp) * BINS).reshape(count, 1, planes)
+    counts = np.zeros(count * planes * BINS, dtype=np.int64)
+    buffer = np.empty((min(rows_per_chunk, rows.shape[0]),) + rows.shape[1:], dtype=np.intp)
+
+    for start in range(0, rows.shape[0], rows_per_chunk):
+        chunk = rows[start:start+rows_per_chunk]
+        out = buffer[:len(chunk)]
+        image_index = np.arange(start, start + len(chunk)) // rows_per_image
+        np.add(chunk, offsets[image_index], out=out)
+        counts += np.bincount(out.reshape(-1), minlength=len(counts))
+
+    return counts.reshape(count, planes, BINS)
+
+
+def check_uint8(images):
+    images = np.asarray(images)
+    if images.dtype != np.uint8:
+        raise ValueError("Jądro histogramów obsługuje tylko obrazy uint8")
+    return images
+
+
+def channel_histograms(image):
+    # (h, w) -> (1, 256); (h, w, c) -> (c, 256), kanały w kolejności z tablicy
+    image = check_uint8(image)
+    with span("stats"):
+        if image.ndim == 2:
+            return interleaved_histograms(image[None, :, :, None], 1)[0]
+        return interleaved_histograms(image[None], image.shape[-1])[0]
+
+
+def batch_histograms(images):
+    # Stos obrazów (n, h, w) albo (n, h, w, c) -> (n, c, 256), jednym przebiegiem
+    images = check_uint8(images)
+    with span("stats"):
+        if images.ndim == 3:
+            return interleaved_histograms(images[..., None], 1)
+        return interleaved_histograms(images, images.shape[-1])
+
+
+def compute_image_histograms(image_path, tiled=False):
+    alpha = has_alpha(image_path)
+    color = np.zeros((4 if alpha else 3, BINS), dtype=np.int64)
+    gray = np.zeros(BINS, dtype=np.int64)
+    for strip in iter_strips(image_path, "RGBA" if alpha else "RGB", tiled=tiled):
+        color += channel_histograms(strip)
+    for strip in iter_strips(image_path, "L", tiled=tiled):
+        gray += channel_histograms(strip)[0]
+
+    histograms = dict(zip(("R", "G", "B", "alpha"), color))
+    histograms["gray"] = gray
+    return histograms
+
+
+def image_histograms(image_path, tiled=False):
+    image_path = os.path.abspath(image_path)
+    key = (image_path, os.stat(image_path).st_mtime_ns)
+    with memo_lock:
+        histograms = histogram_memo.get(key)
+        if histograms is not None:
+            histogram_memo.move_to_end(key)
+            return histograms
+
+    histograms = cached_features([image_path], "histograms", STORE_PARAMS,
+                                 partial(compute_image_histograms, image_path, tiled=tiled))
+    with memo_lock:
+        histogram_memo[key] = histograms
+        while len(histogram_memo) > MEMO_ENTRIES:
+            histogram_memo.popitem(last=False)
+    return histograms
+
+
+def image_histograms_or_none(image_path, tiled=False):
+    # Jak load_image_or_none: None, gdy pliku nie ma albo nie da się go zdekodować
+    try:
+        return image_histograms(image_path, tiled)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
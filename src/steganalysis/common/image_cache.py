@@ -0,0 +1,136 @@
+"""
+Wspólny cache zdekodowanych obrazów dla wszystkich analizatorów.
+
+Każdy plik jest dekodowany raz (do RGB albo RGBA), a pozostałe tryby są z niego wyprowadzane:
+    "RGB"  - tablica (h, w, 3) w kolejności kanałów PIL
+    "RGBA" - tablica (h, w, 4)
+    "BGR"  - tablica (h, w, 3) w kolejności kanałów OpenCV (jak cv2.imread)
+    "L"    - skala szarości wg PIL convert("L") (ITU-R 601-2), liczona z RGB bez ponownego dekodowania
+
+Klucz to (ścieżka, mtime, tryb), więc zmieniony plik jest dekodowany ponownie. Tablice są tylko do
+odczytu - kto chce je modyfikować, musi zrobić kopię. Budżet pamięci ustawia set_cache_budget()
+albo zmienna środowiskowa STEGO_IMAGE_CACHE_MB; najdawniej używane wpisy są usuwane jako pierwsze.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from steganalysis.common.instrumentation import span
+
+DEFAULT_MAX_BYTES = int(os.environ.get("STEGO_IMAGE_CACHE_MB", "512")) * 1024 * 1024
+COLOR_MODES = ("RGB", "RGBA", "BGR", "L")
+
+
+class ImageCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def get(self, image_path, mode="RGB"):
+        if mode not in COLOR_MODES:
+            raise ValueError(f"Nieobsługiwany tryb koloru: {mode}")
+
+        image_path = os.path.abspath(image_path)
+        key = (image_path, os.stat(image_path).st_mtime_ns, mode)
+
+        with self.lock:
+            image_array = self.entries.get(key)
+            if image_array is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return image_array
+            self.misses += 1
+
+        image_array = self.decode(image_path, mode)
+        image_array.setflags(write=False)
+        self.put(key, image_array)
+        return image_array
+
+    def decode(self, image_path, mode):
+        if mode == "RGBA":
+            with span("decode"), Image.open(image_path) as image:
+                return np.array(image.convert("RGBA"))
+
+        if mode == "RGB":
+            # Jeśli RGBA jest już w cache, RGB to po prostu pierwsze trzy kanały
+            rgba = self.peek(image_path, "RGBA")
+            if rgba is not None:
+                with span("convert"):
+                    return np.ascontiguousarray(rgba[:, :, :3])
+            with span("decode"), Image.open(image_path) as image:
+                return np.array(image.convert("RGB"))
+
+        rgb = self.get(image_path, "RGB")
+        with span("convert"):
+            if mode == "BGR":
+                return np.ascontiguousarray(rgb[:, :, ::-1])
+            return np.array(Image.fromarray(rgb).convert("L"))
+
+    def peek(self, image_path, mode):
+        key = (image_path, os.stat(image_path).st_mtime_ns, mode)
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key, image_array):
+        with self.lock:
+            if image_array.nbytes > self.max_bytes or key in self.entries:
+                return
+            self.entries[key] = image_array
+            self.current_bytes += image_array.nbytes
+            self.evict()
+
+    def evict(self):
+        while self.current_bytes > self.max_bytes and self.entries:
+            _, image_array = self.entries.popitem(last=False)
+            self.current_bytes -= image_array.nbytes
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+
+default_cache = ImageCache()
+
+
+def set_cache_budget(max_bytes):
+    with default_cache.lock:
+        default_cache.max_bytes = max_bytes
+        default_cache.evict()
+
+
+def load_image(image_path, mode="RGB"):
+    return default_cache.get(image_path, mode)
+
+
+def has_alpha(image_path):
+    with Image.open(image_path) as image:
+        return "A" in image.getbands() or "transparency" in image.info
+
+
+def load_channels(image_path):
+    # Kanały R, G, B (i alpha, jeśli plik ma kanał alfa) jako widoki (h, w); None jak w load_image_or_none
+    try:
+        alpha = has_alpha(image_path)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    image = load_image_or_none(image_path, "RGBA" if alpha else "RGB")
+    if image is None:
+        return None
+    names = ("R", "G", "B", "alpha") if alpha else ("R", "G", "B")
+    return {name: image[:, :, i] for i, name in enumerate(names)}
+
+
+def load_image_or_none(image_path, mode="RGB"):
+    # Odpowiednik cv2.imread: None zamiast wyjątku, gdy pliku nie ma albo nie da się go zdekodować
+    try:
+        return load_image(image_path, mode)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
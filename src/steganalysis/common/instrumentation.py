@@ -0,0 +1,192 @@
+"""
+Opcjonalny pomiar etapów przetwarzania: decode, convert, transform, stats, plot, save.
+
+Analizatory i metody ukrywania otaczają etapy blokiem `with span("stage"):`. Bez --trace
+(zmienna STEGO_TRACE) span() zwraca jeden wspólny, pusty kontekst - koszt to odczyt zmiennej
+środowiskowej. Z --trace każdy span dopisuje do pliku JSONL rekord:
+    run, pid, image, stage, parent, start, wall_s, cpu_s, rss_peak_delta_bytes, read_bytes, written_bytes
+image to element przetwarzany przez run_batch (nazwa pliku), parent - etap otaczający. Spany się
+zagnieżdżają (np. decode wewnątrz stats) i czasy są włącznie z etapami wewnętrznymi; w podsumowaniu
+span zagnieżdżony w tym samym etapie nie jest liczony drugi raz. Czas CPU, RSS i bajty we/wy
+(/proc/self/io: rchar/wchar, tylko Linux) są liczone dla całego procesu; bez modułu resource
+(Windows) rss_peak_delta_bytes ma wartość null.
+
+Procesy robocze dziedziczą plik i identyfikator przebiegu przez zmienne środowiskowe i dopisują
+rekordy do tego samego pliku; po zakończeniu proces główny wypisuje na stderr podsumowanie przebiegu
+według etapów i najwolniejszych obrazów.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import contextlib
+import contextvars
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:  # Windows - bez getrusage, rss_peak_delta_bytes jest zapisywane jako null
+    resource = None
+
+TRACE_ENV_VAR = "STEGO_TRACE"
+TRACE_RUN_ENV_VAR = "STEGO_TRACE_RUN"
+STAGES = ("decode", "convert", "transform", "stats", "plot", "save")
+SUMMARY_IMAGES = 10
+
+current_image = contextvars.ContextVar("current_image", default=None)
+current_stage = contextvars.ContextVar("current_stage", default=None)
+disabled_span = contextlib.nullcontext()
+
+
+def max_rss_bytes():
+    if resource is None:
+        return None
+    # ru_maxrss: kilobajty na Linuksie, bajty na macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def io_counters():
+    try:
+        with open("/proc/self/io", "rb") as file:
+            fields = dict(line.split(b":", 1) for line in file.read().splitlines())
+        return int(fields[b"rchar"]), int(fields[b"wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class Span:
+    def __init__(self, stage, image, path):
+        self.stage = stage
+        self.image = image
+        self.path = path
+
+    def __enter__(self):
+        self.parent = current_stage.get()
+        self.token = current_stage.set(self.stage)
+        self.io = io_counters()
+        self.rss = max_rss_bytes()
+        self.start = time.time()
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        io = io_counters()
+        current_stage.reset(self.token)
+
+        record = {
+            "run": os.environ.get(TRACE_RUN_ENV_VAR),
+            "pid": os.getpid(),
+            "image": self.image if self.image is not None else current_image.get(),
+            "stage": self.stage,
+            "parent": self.parent,
+            "start": self.start,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "rss_peak_delta_bytes": max_rss_bytes() - self.rss if self.rss is not None else None,
+            "read_bytes": io[0] - self.io[0] if io and self.io else None,
+            "written_bytes": io[1] - self.io[1] if io and self.io else None,
+        }
+        write_record(self.path, record)
+        return False
+
+
+def write_record(path, record):
+    # Jeden write() z O_APPEND na rekord - wiersze z wielu procesów się nie przeplatają
+    line = (json.dumps(record) + "\n").encode("utf-8")
+    handle = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(handle, line)
+    finally:
+        os.close(handle)
+
+
+def span(stage, image=None):
+    path = os.environ.get(TRACE_ENV_VAR)
+    if not path:
+        return disabled_span
+    return Span(stage, image, path)
+
+
+def traced_call(function, item):
+    # Wywołanie function(item) z item jako bieżącym obrazem dla spanów w środku
+    if not os.environ.get(TRACE_ENV_VAR):
+        return function(item)
+    token = current_image.set(str(item))
+    try:
+        return function(item)
+    finally:
+        current_image.reset(token)
+
+
+def read_trace(path, run=None):
+    records = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if run is None or record["run"] == run:
+                records.append(record)
+    return records
+
+
+def summary_lines(records):
+    stages = defaultdict(lambda: {"spans": 0, "wall_s": 0.0, "cpu_s": 0.0, "rss": 0, "read": 0, "written": 0})
+    images = defaultdict(float)
+    for record in records:
+        if record["parent"] is None:
+            images[record["image"]] += record["wall_s"]
+        if record["parent"] == record["stage"]:
+            continue  # już wliczony w span otaczający tego samego etapu
+
+        total = stages[record["stage"]]
+        total["spans"] += 1
+        total["wall_s"] += record["wall_s"]
+        total["cpu_s"] += record["cpu_s"]
+        total["rss"] = max(total["rss"], record["rss_peak_delta_bytes"] or 0)
+        total["read"] += record["read_bytes"] or 0
+        total["written"] += record["written_bytes"] or 0
+
+    lines = [f"{'Stage':<12}{'Spans':<8}{'Wall [s]':<12}{'CPU [s]':<12}{'RSS +[MB]':<12}{'Read [MB]':<12}{'Written [MB]':<12}"]
+    order = [stage for stage in STAGES if stage in stages] + sorted(set(stages) - set(STAGES))
+    for stage in order:
+        total = stages[stage]
+        lines.append(f"{stage:<12}{total['spans']:<8}{total['wall_s']:<12.3f}{total['cpu_s']:<12.3f}"
+                     f"{total['rss'] / 2**20:<12.1f}{total['read'] / 2**20:<12.1f}{total['written'] / 2**20:<12.1f}")
+
+    slowest = sorted(images.items(), key=lambda item: item[1], reverse=True)[:SUMMARY_IMAGES]
+    if slowest:
+        lines.append("")
+        lines.append(f"{'Image':<32}{'Wall [s]':<12}")
+        lines += [f"{str(image):<32}{wall:<12.3f}" for image, wall in slowest]
+    return lines
+
+
+def print_summary(path, run):
+    try:
+        records = read_trace(path, run)
+    except OSError:
+        return
+    if records:
+        print(f"\nPomiar etapów ({len(records)} spanów, ślad w {path}):", file=sys.stderr)
+        print("\n".join(summary_lines(records)), file=sys.stderr)
+
+
+def add_trace_argument(parser):
+    parser.add_argument("--trace", default=os.environ.get(TRACE_ENV_VAR),
+                        help="plik JSONL na pomiary etapów (decode, convert, transform, stats, plot, save)")
+    return parser
+
+
+def configure_trace(args):
+    # Przez zmienne środowiskowe, żeby ślad zapisywały też procesy robocze run_batch
+    if not args.trace:
+        return
+    path = os.path.abspath(args.trace)
+    run = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+    os.environ[TRACE_ENV_VAR] = path
+    os.environ[TRACE_RUN_ENV_VAR] = run
+    atexit.register(print_summary, path, run)
@@ -0,0 +1,366 @@
+"""
+Odczyt skwantowanych współczynników DCT bezpośrednio ze strumienia JPEG (baseline, Huffman).
+
+Dekoder parsuje znaczniki (DQT, DHT, SOF0/SOF1, DRI, SOS) i dekoduje dane entropijne do liczb
+całkowitych - bez dekwantyzacji, odwrotnej DCT i konwersji kolorów. Wynik dla każdej składowej
+(Y, Cb, Cr albo jedna składowa w obrazach w skali szarości) to tablica int16 (nblocks, 8, 8)
+w naturalnej kolejności współczynników (wiersz = częstotliwość pionowa), bloki wierszami po siatce
+składowej (ceil(szerokość/8) x ceil(wysokość/8) po podpróbkowaniu), oraz tablica kwantyzacji
+(8, 8) uint16 tej składowej.
+
+Obsługiwane są skany z przeplotem i bez, dowolne współczynniki próbkowania i interwały restartu.
+Pliki progresywne, bezstratne, arytmetyczne i 12-bitowe zgłaszają ValueError - is_baseline_jpeg()
+pozwala sprawdzić to wcześniej, czytając tylko nagłówek.
+
+Analizy DCT używają współczynników z pliku tylko wtedy, gdy wszystkie porównywane pliki (oryginał
+i jego obrazy stego) to JPEG baseline, rozpoznawany po zawartości, nie po rozszerzeniu - skwantowane
+współczynniki oryginału JPEG i DCT pikseli obrazu stego PNG mają inną skalę i nie są porównywalne.
+W trybie kolorowym są to składowe Y, Cb, Cr pliku (Cb i Cr mogą mieć mniej bloków po podpróbkowaniu),
+a nie kanały RGB. --no-jpeg-coefficients (zmienna STEGO_JPEG_COEFFICIENTS=off) wymusza DCT
+zdekodowanych pikseli także dla samych plików JPEG.
+
+Współczynnik * wartość z tablicy kwantyzacji to DCT (norm="ortho") bloku pikseli pomniejszonych
+o 128 - ta sama skala co w compute_dct_for_channel, z DC przesuniętym o -1024.
+"""
+import os
+import re
+import functools
+from array import array
+
+import numpy as np
+
+from steganalysis.common.instrumentation import span
+
+ZIGZAG = np.array([
+    0, 1, 8, 16, 9, 2, 3, 10, 17, 24, 32, 25, 18, 11, 4, 5,
+    12, 19, 26, 33, 40, 48, 41, 34, 27, 20, 13, 6, 7, 14, 21, 28,
+    35, 42, 49, 56, 57, 50, 43, 36, 29, 22, 15, 23, 30, 37, 44, 51,
+    58, 59, 52, 45, 38, 31, 39, 46, 53, 60, 61, 54, 47, 55, 62, 63,
+])  # pozycja w bloku 8x8 (wierszami) k-tego współczynnika w kolejności zygzakowej
+BASELINE_SOF = (0xC0, 0xC1)
+UNSUPPORTED_SOF = (0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF)
+SCAN_END = re.compile(rb"\xff[^\x00\xd0-\xd7\xff]")  # znacznik kończący dane entropijne skanu
+RESTART = re.compile(rb"\xff[\xd0-\xd7]")
+COMPONENT_NAMES = {1: ("Y",), 3: ("Y", "Cb", "Cr"), 4: ("C", "M", "Y", "K")}
+JPEG_ENV_VAR = "STEGO_JPEG_COEFFICIENTS"
+
+
+class JpegCoefficients:
+    def __init__(self, width, height, names, coefficients, quant_tables, block_shapes):
+        self.width = width
+        self.height = height
+        self.names = names                  # nazwy składowych, np. ("Y", "Cb", "Cr")
+        self.coefficients = coefficients    # lista tablic int16 (nblocks, 8, 8)
+        self.quant_tables = quant_tables    # lista tablic uint16 (8, 8), jedna na składową
+        self.block_shapes = block_shapes    # lista (wiersze, kolumny) siatek bloków
+
+    def dequantized(self, index):
+        return self.coefficients[index].astype(np.int32) * self.quant_tables[index]
+
+
+def segments(data):
+    # (znacznik, początek danych, koniec danych) dla segmentów z długością, aż do SOS włącznie
+    pos = 2
+    while pos < len(data):
+        if data[pos] != 0xFF:
+            raise ValueError("Uszkodzony plik JPEG: oczekiwano znacznika")
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1  # bajty wypełnienia przed znacznikiem
+            continue
+        if marker == 0xD9 or 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            yield marker, pos + 2, pos + 2
+            pos += 2
+            continue
+        length = int.from_bytes(data[pos + 2:pos + 4], "big")
+        yield marker, pos + 4, pos + 2 + length
+        pos += 2 + length
+        if marker == 0xDA:
+            # Dane entropijne skanu - do pierwszego znacznika, który nie jest RSTn ani bajtem 0xFF00
+            match = SCAN_END.search(data, pos)
+            end = match.start() if match else len(data)
+            yield None, pos, end
+            pos = end
+
+
+def is_baseline_jpeg(image_path):
+    # Sam nagłówek: True dla JPEG baseline/extended z kodowaniem Huffmana i 8 bitami na próbkę
+    with open(image_path, "rb") as file:
+        if file.read(2) != b"\xff\xd8":
+            return False
+        while True:
+            header = file.read(2)
+            while header[:1] == b"\xff" and header[1:] == b"\xff":
+                header = header[1:] + file.read(1)
+            if len(header) < 2 or header[0] != 0xFF:
+                return False
+            marker = header[1]
+            if marker in BASELINE_SOF:
+                file.read(2)
+                return file.read(1) == b"\x08"
+            if marker in UNSUPPORTED_SOF or marker in (0xD9, 0xDA):
+                return False
+            length = int.from_bytes(file.read(2), "big")
+            file.seek(length - 2, 1)
+
+
+def use_jpeg_coefficients(*image_paths):
+    # Jedna decyzja dla całego porównania: współczynniki z pliku, tylko gdy każdy plik to JPEG baseline
+    return os.environ.get(JPEG_ENV_VAR, "on") != "off" and all(is_baseline_jpeg(path) for path in image_paths)
+
+
+def add_jpeg_argument(parser):
+    parser.add_argument("--no-jpeg-coefficients", action="store_true",
+                        help="dla plików JPEG licz DCT zdekodowanych pikseli zamiast czytać współczynniki z pliku")
+    return parser
+
+
+def configure_jpeg(args):
+    # Przez zmienną środowiskową, żeby ustawienie widziały też procesy robocze run_batch
+    if args.no_jpeg_coefficients:
+        os.environ[JPEG_ENV_VAR] = "off"
+
+
+def parse_quant_tables(payload, tables):
+    pos = 0
+    while pos < len(payload):
+        precision, table_id = payload[pos] >> 4, payload[pos] & 15
+        size = 128 if precision else 64
+        values = np.frombuffer(payload[pos + 1:pos + 1 + size], dtype=">u2" if precision else np.uint8)
+        table = np.zeros(64, dtype=np.uint16)
+        table[ZIGZAG] = values
+        tables[table_id] = table.reshape(8, 8)
+        pos += 1 + size
+
+
+def extend(value, size):
+    # Wartość o size bitach: kody z zerem na początku to liczby ujemne
+    return value - (1 << size) + 1 if value < (1 << (size - 1)) else value
+
+
+@functools.lru_cache(maxsize=32)
+def huffman_lookup(counts, symbols):
+    # Tablica 2**16 wpisów: 16 kolejnych bitów -> (zużyte bity, liczba zer, liczba bitów wartości, wartość).
+    # Gdy kod i bity wartości mieszczą się w 16 bitach, wartość jest gotowa; inaczej wartość = None
+    # i bity wartości trzeba doczytać. None zamiast wpisu = nieprawidłowy kod. Tablice standardowe
+    # powtarzają się między plikami, więc są zapamiętywane.
+    lookup = [None] * 65536
+    code = 0
+    position = 0
+    for length in range(1, 17):
+        for _ in range(counts[length - 1]):
+            symbol = symbols[position]
+            run, size = symbol >> 4, symbol & 15
+            first = code << (16 - length)
+            if size == 0 or length + size > 16:
+                lookup[first:first + (1 << (16 - length))] = [(length, run, size, None if size else 0)] * (1 << (16 - length))
+            else:
+                free = 16 - length - size
+                for value in range(1 << size):
+                    start = first + (value << free)
+                    lookup[start:start + (1 << free)] = [(length + size, run, size, extend(value, size))] * (1 << free)
+            code += 1
+            position += 1
+        code <<= 1
+    return lookup
+
+
+def parse_huffman_tables(payload, dc_tables, ac_tables):
+    pos = 0
+    while pos < len(payload):
+        table_class, table_id = payload[pos] >> 4, payload[pos] & 15
+        counts = bytes(payload[pos + 1:pos + 17])
+        symbols = bytes(payload[pos + 17:pos + 17 + sum(counts)])
+        (ac_tables if table_class else dc_tables)[table_id] = huffman_lookup(counts, symbols)
+        pos += 17 + sum(counts)
+
+
+def decode_blocks(data, plan, dc_lookups, ac_lookups, outputs):
+    # Dekoduje kolejne bloki segmentu danych entropijnych; plan to lista (indeks składowej, przesunięcie
+    # bloku w tablicy wynikowej składowej - array "h", 64 wartości na blok) w kolejności strumienia.
+    # Bity są czytane przez akumulator uzupełniany po 32 bity - jeden symbol zużywa najwyżej 27.
+    zigzag = ZIGZAG.tolist()
+    data = data.replace(b"\xff\x00", b"\xff")
+    limit = len(data) * 8 + 32  # dopełnienie za końcem segmentu (bity 1) nie może być dekodowane jako dane
+    data += b"\xff" * 8
+    predictors = [0] * len(outputs)
+    accumulator = 0
+    bits = 0
+    read = 0
+    try:
+        for component, base in plan:
+            lookup = dc_lookups[component]
+            out = outputs[component]
+
+            # DC: symbol = liczba bitów różnicy względem poprzedniego bloku tej składowej
+            if bits < 32:
+                accumulator = ((accumulator & ((1 << bits) - 1)) << 32) | int.from_bytes(data[read:read + 4], "big")
+                read += 4
+                bits += 32
+            length, run, size, value = lookup[(accumulator >> (bits - 16)) & 0xFFFF]
+            bits -= length
+            if value is None:
+                value = extend((accumulator >> (bits - size)) & ((1 << size) - 1), size)
+                bits -= size
+            predictors[component] += value
+            out[base] = predictors[component]
+
+            # AC: (liczba zer, liczba bitów wartości); (0, 0) = koniec bloku, (15, 0) = 16 zer
+            lookup = ac_lookups[component]
+            k = 1
+            while k < 64:
+                if bits < 32:
+                    accumulator = ((accumulator & ((1 << bits) - 1)) << 32) | int.from_bytes(data[read:read + 4], "big")
+                    read += 4
+                    bits += 32
+                length, run, size, value = lookup[(accumulator >> (bits - 16)) & 0xFFFF]
+                bits -= length
+                if not size:
+                    if run != 15:
+                        break
+                    k += 16
+                    continue
+                if value is None:
+                    value = extend((accumulator >> (bits - size)) & ((1 << size) - 1), size)
+                    bits -= size
+                k += run
+                out[base + zigzag[k]] = value
+                k += 1
+    except (TypeError, IndexError):
+        # Wpis None (kod spoza tablicy) albo więcej niż 64 współczynniki w bloku
+        raise ValueError("Uszkodzony strumień JPEG: nieprawidłowy kod Huffmana") from None
+
+    if read * 8 - bits > limit:
+        raise ValueError("Uszkodzony strumień JPEG: dane skanu kończą się przedwcześnie")
+
+
+def scan_plan(frame, scan_components, mcu_count_start, mcu_count):
+    # (indeks składowej, przesunięcie bloku) dla MCU [mcu_count_start, mcu_count_start + mcu_count)
+    plan = []
+    if len(scan_components) == 1:
+        # Skan bez przeplotu: MCU = jeden blok, wierszami po siatce składowej (bez dopełnienia do MCU)
+        component = scan_components[0]
+        rows, cols = frame["block_shapes"][component]
+        stride = frame["grid_cols"][component]
+        for mcu in range(mcu_count_start, min(mcu_count_start + mcu_count, rows * cols)):
+            row, col = divmod(mcu, cols)
+            plan.append((component, (row * stride + col) * 64))
+        return plan
+
+    mcu_cols = frame["mcu_cols"]
+    for mcu in range(mcu_count_start, min(mcu_count_start + mcu_count, frame["mcu_rows"] * mcu_cols)):
+        mcu_row, mcu_col = divmod(mcu, mcu_cols)
+        for component in scan_components:
+            h, v = frame["sampling"][component]
+            stride = frame["grid_cols"][component]
+            for y in range(v):
+                for x in range(h):
+                    plan.append((component, ((mcu_row * v + y) * stride + mcu_col * h + x) * 64))
+    return plan
+
+
+def read_jpeg_coefficients(image_path):
+    with open(image_path, "rb") as file:
+        data = file.read()
+    if data[:2] != b"\xff\xd8":
+        raise ValueError(f"{image_path} nie jest plikiem JPEG")
+
+    with span("decode"):
+        return parse_jpeg(data, image_path)
+
+
+def parse_jpeg(data, image_path):
+    quant_tables = {}
+    dc_tables = {}
+    ac_tables = {}
+    restart_interval = 0
+    frame = None
+    scan = None
+    outputs = None
+
+    for marker, start, end in segments(data):
+        payload = data[start:end]
+        if marker == 0xDB:
+            parse_quant_tables(payload, quant_tables)
+        elif marker == 0xC4:
+            parse_huffman_tables(payload, dc_tables, ac_tables)
+        elif marker == 0xDD:
+            restart_interval = int.from_bytes(payload[:2], "big")
+        elif marker in UNSUPPORTED_SOF:
+            raise ValueError(f"{image_path}: obsługiwany jest tylko JPEG baseline z kodowaniem Huffmana")
+        elif marker in BASELINE_SOF:
+            frame = parse_frame(payload, image_path)
+            outputs = [array("h", bytes(2 * 64 * rows * cols)) for rows, cols in frame["grid_shapes"]]
+        elif marker == 0xDA:
+            if frame is None:
+                raise ValueError(f"{image_path}: skan przed nagłówkiem SOF")
+            scan = [frame["ids"].index(payload[1 + 2 * i]) for i in range(payload[0])]
+            tables = [payload[2 + 2 * i] for i in range(payload[0])]
+            dc_lookups = {component: dc_tables[table >> 4] for component, table in zip(scan, tables)}
+            ac_lookups = {component: ac_tables[table & 15] for component, table in zip(scan, tables)}
+        elif marker is None:
+            decode_scan(data[start:end], frame, scan, dc_lookups, ac_lookups, restart_interval, outputs)
+        elif marker == 0xD9:
+            break
+
+    if frame is None:
+        raise ValueError(f"{image_path}: brak nagłówka SOF")
+    coefficients = []
+    for output, (grid_rows, grid_cols), (rows, cols) in zip(outputs, frame["grid_shapes"], frame["block_shapes"]):
+        grid = np.frombuffer(output, dtype=np.int16).reshape(grid_rows, grid_cols, 8, 8)
+        coefficients.append(np.ascontiguousarray(grid[:rows, :cols]).reshape(rows * cols, 8, 8))
+    names = COMPONENT_NAMES.get(len(frame["ids"]), tuple(str(i) for i in frame["ids"]))
+    return JpegCoefficients(frame["width"], frame["height"], names, coefficients,
+                            [quant_tables[table] for table in frame["quant"]], frame["block_shapes"])
+
+
+def parse_frame(payload, image_path):
+    if payload[0] != 8:
+        raise ValueError(f"{image_path}: obsługiwane są tylko próbki 8-bitowe")
+    height = int.from_bytes(payload[1:3], "big")
+    width = int.from_bytes(payload[3:5], "big")
+    if not height or not width:
+        raise ValueError(f"{image_path}: nieobsługiwany wymiar obrazu (znacznik DNL)")
+
+    ids, sampling, quant = [], [], []
+    for i in range(payload[5]):
+        component_id, factors, table = payload[6 + 3 * i:9 + 3 * i]
+        ids.append(component_id)
+        sampling.append((factors >> 4, factors & 15))
+        quant.append(table)
+
+    h_max = max(h for h, _ in sampling)
+    v_max = max(v for _, v in sampling)
+    mcu_cols = -(-width // (8 * h_max))
+    mcu_rows = -(-height // (8 * v_max))
+    # Siatka bloków składowej bez dopełnienia i siatka dopełniona do całych MCU (tak ją zapisuje koder)
+    block_shapes = [(-(-(-(-height * v // v_max)) // 8), -(-(-(-width * h // h_max)) // 8)) for h, v in sampling]
+    grid_shapes = [(mcu_rows * v, mcu_cols * h) for h, v in sampling]
+    return {"width": width, "height": height, "ids": ids, "sampling": sampling, "quant": quant,
+            "mcu_cols": mcu_cols, "mcu_rows": mcu_rows, "block_shapes": block_shapes, "grid_shapes": grid_shapes,
+            "grid_cols": [cols for _, cols in grid_shapes]}
+
+
+def decode_scan(data, frame, scan, dc_lookups, ac_lookups, restart_interval, outputs):
+    if len(scan) == 1:
+        rows, cols = frame["block_shapes"][scan[0]]
+        mcu_total = rows * cols
+    else:
+        mcu_total = frame["mcu_rows"] * frame["mcu_cols"]
+
+    # Interwał restartu dzieli skan na segmenty oddzielone znacznikami RSTn; w każdym predyktory DC od zera
+    parts = RESTART.split(data) if restart_interval else [data]
+    per_part = restart_interval or mcu_total
+    for index, part in enumerate(parts):
+        first = index * per_part
+        if first >= mcu_total:
+            break
+        decode_blocks(part, scan_plan(frame, scan, first, per_part), dc_lookups, ac_lookups, outputs)
+
+
+def component_coefficients(image_path, color_mode="L"):
+    # Składowe odpowiadające trybowi analizy DCT: "L" - luminancja Y, "RGB" - wszystkie składowe pliku;
+    # dict nazwa składowej -> tablica (nblocks, 8, 8) w kolejności pliku
+    jpeg = read_jpeg_coefficients(image_path)
+    count = 1 if color_mode == "L" else len(jpeg.names)
+    return dict(zip(jpeg.names[:count], jpeg.coefficients[:count]))
@@ -0,0 +1,41 @@
+"""
+Leniwe importy ciężkich zależności (matplotlib, pandas, scipy, pywt, cv2).
+
+    plt = lazy_module("matplotlib.pyplot")
+
+plt zachowuje się jak moduł, ale matplotlib.pyplot jest importowany dopiero przy pierwszym dostępie do
+atrybutu (plt.subplots(...)) - skrypt uruchomiony tylko po statystyki nie płaci za bibliotekę wykresów,
+a import skryptu (load_script, pakiet steganalysis) nie importuje niczego ciężkiego. Brak zależności
+wychodzi na jaw dopiero w funkcji, która jej potrzebuje.
+"""
+import importlib
+import threading
+
+import_lock = threading.Lock()
+
+
+class LazyModule:
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with import_lock:
+                module = self.__dict__["_module"] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self._load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._load(), attribute, value)
+
+    def __repr__(self):
+        state = "zaimportowany" if self.__dict__["_module"] is not None else "jeszcze nie zaimportowany"
+        return f"<moduł {self._name} ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
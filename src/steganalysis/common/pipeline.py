@@ -0,0 +1,184 @@
+"""
+Wspólny przebieg analiz obrazu: jeden plik, jedno dekodowanie, wszystkie analizatory.
+
+Każdy analizator deklaruje wyniki pośrednie, których potrzebuje (zdekodowany obraz, skala szarości,
+siatka bloków 8x8, histogramy kanałów, współczynniki DCT...), a wynik pośredni deklaruje, z jakich
+innych wyników powstaje. Harmonogram liczy każdy wynik pośredni co najwyżej raz na plik i zwalnia go,
+gdy skończy ostatni analizator (albo wynik pośredni), który z niego korzysta.
+
+    Intermediate(nazwa, compute, requires, stage) - compute(ścieżka, *wartości requires)
+    Analyzer(nazwa, requires, compute, feature_name, params, pair) - compute(wejścia) -> dict cech,
+        wejścia to dict nazwa -> wartość; analizator pary (pair=True) dostaje dwa takie dicty:
+        oryginału i obrazu stego
+
+requires wyniku pośredniego i params analizatora mogą być funkcjami ścieżek wszystkich plików przebiegu
+- np. współczynniki DCT powstają ze strumieni JPEG, a nie z bloków zdekodowanych pikseli, tylko gdy
+wszystkie porównywane pliki to JPEG baseline. Decyzja jest jedna dla całego przebiegu.
+
+Cechy analizatorów trafiają do magazynu cech pod kluczem (feature_name, params) - tym samym co
+w skryptach metod, więc skrypty i potok korzystają nawzajem ze swoich wyników. Analizator, którego
+cechy są już w magazynie, niczego nie zamawia, a plik, którego nikt nie potrzebuje, nie jest dekodowany.
+
+Pipeline.run(ścieżki): ścieżki[0] to oryginał. Analizatory pojedynczych plików działają na każdym
+pliku, analizatory par na parach (oryginał, kolejny plik). Wynik dla (nazwa analizatora, indeks pliku)
+to dict cech albo wyjątek, który przerwał jego liczenie (np. nieczytelny plik) - pozostałe analizatory
+działają dalej.
+"""
+from collections import Counter
+
+from steganalysis.common.feature_store import default_store
+from steganalysis.common.instrumentation import span
+
+
+class Intermediate:
+    def __init__(self, name, compute, requires=(), stage="convert"):
+        self.name = name
+        self.compute = compute
+        self.requires = requires if callable(requires) else tuple(requires)
+        self.stage = stage
+
+    def requirements(self, paths):
+        return tuple(self.requires(paths)) if callable(self.requires) else self.requires
+
+
+class Analyzer:
+    def __init__(self, name, requires, compute, feature_name=None, params=None, pair=False):
+        self.name = name
+        self.requires = tuple(requires)
+        self.compute = compute
+        self.feature_name = feature_name or name
+        self.params = params or {}
+        self.pair = pair
+
+    def store_params(self, paths):
+        return self.params(paths) if callable(self.params) else self.params
+
+
+class Schedule:
+    # Stan jednego przebiegu: policzone wyniki pośrednie (węzeł = (nazwa, indeks pliku)) i liczba
+    # konsumentów, którzy jeszcze na nie czekają
+    def __init__(self, pipeline, paths):
+        self.pipeline = pipeline
+        self.paths = paths
+        self.values = {}
+        self.errors = {}
+        self.consumers = Counter()
+        self.requires = {}  # nazwa wyniku pośredniego -> jego zależności w tym przebiegu
+
+    def dependencies(self, node):
+        name, index = node
+        if name not in self.requires:
+            self.requires[name] = self.pipeline.intermediates[name].requirements(self.paths)
+        return [(dependency, index) for dependency in self.requires[name]]
+
+    def add_consumer(self, node):
+        # Węzeł rejestruje się u swoich zależności przy pierwszym konsumencie - liczony jest tylko raz
+        if self.consumers[node] == 0:
+            for dependency in self.dependencies(node):
+                self.add_consumer(dependency)
+        self.consumers[node] += 1
+
+    def release(self, node):
+        self.consumers[node] -= 1
+        if self.consumers[node] > 0:
+            return
+        del self.consumers[node]
+        if node in self.values:
+            del self.values[node]
+        elif node not in self.errors:
+            # Węzeł nie został policzony i nikt go już nie potrzebuje - zwalniamy jego zależności
+            for dependency in self.dependencies(node):
+                self.release(dependency)
+
+    def evaluate(self, node):
+        if node in self.values:
+            return self.values[node]
+        if node in self.errors:
+            raise self.errors[node]
+
+        name, index = node
+        intermediate = self.pipeline.intermediates[name]
+        dependencies = self.dependencies(node)
+        try:
+            inputs = [self.evaluate(dependency) for dependency in dependencies]
+            with span(intermediate.stage):
+                value = intermediate.compute(self.paths[index], *inputs)
+        except Exception as error:
+            self.errors[node] = error
+            raise
+        finally:
+            inputs = None
+            for dependency in dependencies:
+                self.release(dependency)
+
+        self.values[node] = value
+        self.pipeline.computed[name] += 1
+        return value
+
+    def run_task(self, analyzer, files):
+        nodes = [(name, index) for index in files for name in analyzer.requires]
+        try:
+            inputs = [{name: self.evaluate((name, index)) for name in analyzer.requires} for index in files]
+            with span("stats"):
+                return analyzer.compute(*inputs)
+        finally:
+            inputs = None
+            for node in nodes:
+                self.release(node)
+
+
+class Pipeline:
+    def __init__(self, intermediates, analyzers, store=None):
+        self.intermediates = {intermediate.name: intermediate for intermediate in intermediates}
+        self.analyzers = list(analyzers)
+        self.store = store if store is not None else default_store
+        self.computed = Counter()  # ile razy policzono każdy wynik pośredni
+
+        for item in list(self.intermediates.values()) + self.analyzers:
+            if callable(item.requires):
+                continue
+            missing = [name for name in item.requires if name not in self.intermediates]
+            if missing:
+                raise ValueError(f"{item.name} wymaga nieznanych wyników pośrednich: {', '.join(missing)}")
+
+    def tasks(self, paths):
+        # (analizator, indeks wyniku, indeksy plików) plik po pliku - wyniki pośrednie pliku są
+        # zwalniane, zanim potok przejdzie do następnego (oryginał żyje, dopóki potrzebują go pary)
+        for index in range(len(paths)):
+            for analyzer in self.analyzers:
+                if not analyzer.pair:
+                    yield analyzer, index, (index,)
+                elif index > 0:
+                    yield analyzer, index, (0, index)
+
+    def run(self, paths):
+        results = {}
+        scheduled = []
+        for analyzer, index, files in self.tasks(paths):
+            try:
+                sources = [paths[f] for f in files]
+                features = self.store.lookup(sources, analyzer.feature_name, analyzer.store_params(paths))
+            except OSError as error:
+                results[analyzer.name, index] = error
+                continue
+            if features is not None:
+                results[analyzer.name, index] = features
+            else:
+                scheduled.append((analyzer, index, files))
+
+        schedule = Schedule(self, paths)
+        for analyzer, index, files in scheduled:
+            for f in files:
+                for name in analyzer.requires:
+                    schedule.add_consumer((name, f))
+
+        for analyzer, index, files in scheduled:
+            try:
+                features = schedule.run_task(analyzer, files)
+            except Exception as error:
+                results[analyzer.name, index] = error
+                continue
+            sources = [paths[f] for f in files]
+            self.store.save(sources, analyzer.feature_name, analyzer.store_params(paths), features)
+            results[analyzer.name, index] = features
+        return results
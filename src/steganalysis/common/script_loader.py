@@ -0,0 +1,26 @@
+"""
+Ładowanie skryptów metod jako modułów.
+
+Katalogi metod nie są pakietami, a nazwa 1_channel.py nie jest poprawną nazwą modułu, więc skrypty
+są ładowane z pliku (ścieżka względem src/steganalysis/). Kod pod `if __name__ == "__main__"` się nie wykonuje.
+Moduł jest rejestrowany w sys.modules, więc jego funkcje można przekazywać do puli procesów (pickle).
+"""
+import os
+import sys
+import importlib.util
+
+package_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+src_dir = os.path.dirname(package_dir)
+
+
+def load_script(relative_path):
+    name = "script_" + os.path.splitext(os.path.basename(relative_path))[0]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(package_dir, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
@@ -0,0 +1,191 @@
+"""
+Strumieniowe statystyki współczynników: średnia i wariancja (Welford/Chan), histogram o stałych
+krawędziach, min/max i kwantyle odczytywane z histogramu.
+
+MomentStats dodaje trzeci i czwarty moment centralny (skośność i kurtoza, łączone wzorami Pébaya).
+
+Akumulator aktualizuje się porcjami (np. partiami bloków 8x8) i można go łączyć między obrazami
+(merge), więc pamięć nie zależy od rozmiaru obrazu. Histogram ma drobne przedziały o stałej szerokości;
+do wykresów są one sklejane w display_edges()/bin_counts() dokładnie, bez ponownego binowania danych.
+"""
+import numpy as np
+
+from steganalysis.common.instrumentation import span
+
+# Zakresy wartości współczynników dla 8-bitowych bloków 8x8 (z zapasem); wartości spoza są przycinane
+DCT_RANGE = (-2048.0, 2048.0)
+DWT_RANGE = (-1024.0, 1024.0)
+
+
+class StreamingStats:
+    def __init__(self, value_range, bin_width=1.0):
+        self.low, self.high = value_range
+        self.bin_width = bin_width
+        self.counts = np.zeros(int(round((self.high - self.low) / bin_width)), dtype=np.int64)
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def edges(self):
+        return self.low + self.bin_width * np.arange(len(self.counts) + 1)
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std_dev(self):
+        return float(np.sqrt(self.variance))
+
+    def update(self, values):
+        values = np.asarray(values).reshape(-1)
+        if values.size == 0:
+            return self
+
+        with span("stats"):
+            self.combine(values.size, *self.batch_moments(values))
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+
+            indices = np.floor((values - self.low) / self.bin_width).astype(np.int64)
+            np.clip(indices, 0, len(self.counts) - 1, out=indices)
+            self.counts += np.bincount(indices, minlength=len(self.counts))
+        return self
+
+    def batch_moments(self, values):
+        batch_mean = float(np.mean(values, dtype=np.float64))
+        return batch_mean, float(np.sum(np.square(values - batch_mean, dtype=np.float64)))
+
+    def moments(self):
+        return self.mean, self.m2
+
+    def combine(self, count, mean, m2):
+        # Równoległa wersja algorytmu Welforda (Chan i in.) - łączenie dwóch zbiorów (n, średnia, M2)
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def merge(self, other):
+        if (other.low, other.high, other.bin_width) != (self.low, self.high, self.bin_width):
+            raise ValueError("Nie można łączyć histogramów o różnych krawędziach")
+        self.combine(other.count, *other.moments())
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.counts += other.counts
+        return self
+
+    def quantile(self, q):
+        # Kwantyl z histogramu, z interpolacją liniową wewnątrz przedziału (błąd <= szerokość przedziału)
+        if self.count == 0:
+            return np.nan
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        value = np.interp(np.asarray(q) * self.count, cumulative, self.edges)
+        return np.clip(value, self.min, self.max)
+
+    def display_edges(self, bins=50):
+        # Krawędzie do wykresu pokrywające [min, max], wyrównane do siatki drobnych przedziałów
+        if self.count == 0:
+            return np.array([self.low, self.low + self.bin_width])
+        first = int(np.floor((max(self.min, self.low) - self.low) / self.bin_width))
+        last = min(int(np.floor((min(self.max, self.high) - self.low) / self.bin_width)) + 1, len(self.counts))
+        step = max(1, -(-(last - first) // bins))
+        return self.low + self.bin_width * np.arange(first, last + step, step)
+
+    def bin_counts(self, edges):
+        # Liczności w przedziałach o krawędziach leżących na siatce drobnych przedziałów; wartości
+        # spoza [edges[0], edges[-1]) są pomijane, jak w np.histogram
+        positions = np.round((np.asarray(edges) - self.low) / self.bin_width).astype(np.int64)
+        positions = np.clip(positions, 0, len(self.counts))
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        return np.diff(cumulative[positions])
+
+    def to_arrays(self, prefix=""):
+        # Stan akumulatora jako tablice (do magazynu cech); from_arrays odtwarza go bez utraty dokładności
+        state = [self.low, self.high, self.bin_width, self.count, self.mean, self.m2, self.min, self.max]
+        return {f"{prefix}counts": self.counts, f"{prefix}state": np.array(state, dtype=np.float64)}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=""):
+        low, high, bin_width, count, mean, m2, minimum, maximum = arrays[f"{prefix}state"]
+        stats = cls((low, high), bin_width)
+        stats.counts = np.array(arrays[f"{prefix}counts"], dtype=np.int64)
+        stats.count = int(count)
+        stats.mean, stats.m2, stats.min, stats.max = float(mean), float(m2), float(minimum), float(maximum)
+        return stats
+
+    def summary(self):
+        return {"mean": self.mean, "std_dev": self.std_dev, "min": self.min, "max": self.max, "count": self.count}
+
+
+class MomentStats(StreamingStats):
+    def __init__(self, value_range, bin_width=1.0):
+        super().__init__(value_range, bin_width)
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    @property
+    def skewness(self):
+        return float(np.sqrt(self.count) * self.m3 / self.m2 ** 1.5) if self.m2 > 0 else 0.0
+
+    @property
+    def kurtosis(self):
+        # Kurtoza nadwyżkowa (0 dla rozkładu normalnego)
+        return float(self.count * self.m4 / (self.m2 * self.m2) - 3.0) if self.m2 > 0 else 0.0
+
+    def batch_moments(self, values):
+        batch_mean = float(np.mean(values, dtype=np.float64))
+        deviations = np.subtract(values, batch_mean, dtype=np.float64)
+        squares = np.square(deviations)
+        return (batch_mean, float(np.sum(squares)), float(np.dot(squares, deviations)), float(np.dot(squares, squares)))
+
+    def moments(self):
+        return self.mean, self.m2, self.m3, self.m4
+
+    def combine(self, count, mean, m2, m3=0.0, m4=0.0):
+        # Łączenie (n, średnia, M2, M3, M4) dwóch zbiorów - Pébay 2008; M3 i M4 liczone ze starych M2/M3
+        if count == 0:
+            return
+        n_a, n_b = self.count, count
+        total = n_a + n_b
+        delta = mean - self.mean
+        self.m4 += (m4 + delta ** 4 * n_a * n_b * (n_a * n_a - n_a * n_b + n_b * n_b) / total ** 3
+                    + 6 * delta * delta * (n_a * n_a * m2 + n_b * n_b * self.m2) / total ** 2
+                    + 4 * delta * (n_a * m3 - n_b * self.m3) / total)
+        self.m3 += (m3 + delta ** 3 * n_a * n_b * (n_a - n_b) / total ** 2
+                    + 3 * delta * (n_a * m2 - n_b * self.m2) / total)
+        super().combine(count, mean, m2)
+
+    def to_arrays(self, prefix=""):
+        arrays = super().to_arrays(prefix)
+        arrays[f"{prefix}moments"] = np.array([self.m3, self.m4], dtype=np.float64)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix=""):
+        stats = super().from_arrays(arrays, prefix)
+        stats.m3, stats.m4 = (float(value) for value in arrays[f"{prefix}moments"])
+        return stats
+
+    def summary(self):
+        return {**super().summary(), "skewness": self.skewness, "kurtosis": self.kurtosis}
+
+
+def image_channels(image_array):
+    # Obraz (h, w) albo (h, w, 3) -> lista kanałów (h, w)
+    if image_array.ndim == 2:
+        return [image_array]
+    return [image_array[:, :, c] for c in range(3)]
+
+
+def histogram_kwargs(stats, bins=50):
+    # Argumenty dla ax.hist rysującego gotowe liczności zamiast surowych współczynników
+    edges = stats["histogram"].display_edges(bins)
+    counts = stats["histogram"].bin_counts(edges)
+    return {"x": edges[:-1], "bins": edges, "weights": counts}
@@ -0,0 +1,109 @@
+"""
+Odczyt obrazu pasami wierszy (tryb "tiled") dla obrazów większych niż pamięć.
+
+Pasy mają wysokość będącą wielokrotnością 8, więc są wyrównane do siatki bloków 8x8 analiz DCT/DWT.
+Dla nieskompresowanych rastrów (TIFF bez kompresji, PPM/PGM, BMP) każdy pas jest dekodowany osobno
+z pliku - w pamięci nigdy nie ma całej klatki. Formaty z jednym strumieniem kompresji (PNG, JPEG,
+skompresowany TIFF) nie pozwalają dekodować fragmentu; wtedy obraz jest dekodowany w całości przez
+wspólny cache i dzielony na pasy, a wynik analiz jest taki sam.
+
+Konwersja trybów koloru na pasie jest taka sama jak w image_cache, więc iter_strips(tiled=True)
+i iter_strips(tiled=False) dają identyczne piksele.
+"""
+import numpy as np
+from PIL import Image
+
+from steganalysis.common.image_cache import load_image, COLOR_MODES
+from steganalysis.common.instrumentation import span
+
+STRIP_ROWS = 256
+RAW_BYTES_PER_PIXEL = {"L": 1, "LA": 2, "RGB": 3, "BGR": 3, "RGBA": 4, "BGRA": 4, "RGBX": 4, "BGRX": 4}
+
+
+def add_tiled_argument(parser):
+    parser.add_argument("--tiled", action="store_true",
+                        help="czytaj obrazy pasami wierszy zamiast dekodować całą klatkę")
+    return parser
+
+
+def raw_tile_layout(image):
+    # (offset, rawmode, stride, ystep) dla obrazów zapisanych jako jeden nieskompresowany kafel
+    if len(image.tile) != 1:
+        return None
+    codec, extents, offset, args = image.tile[0]
+    if codec != "raw" or tuple(extents) != (0, 0) + image.size:
+        return None
+
+    if isinstance(args, str):
+        args = (args,)
+    rawmode = args[0]
+    stride = args[1] if len(args) > 1 else 0
+    ystep = args[2] if len(args) > 2 else 1
+    if rawmode not in RAW_BYTES_PER_PIXEL:
+        return None
+    if stride <= 0:
+        stride = image.size[0] * RAW_BYTES_PER_PIXEL[rawmode]
+    return offset, rawmode, stride, ystep
+
+
+def supports_strip_reading(image_path):
+    with Image.open(image_path) as image:
+        return raw_tile_layout(image) is not None
+
+
+def convert_strip(strip_image, mode):
+    # Te same konwersje co w ImageCache.decode
+    with span("convert"):
+        if mode == "RGBA":
+            return np.array(strip_image.convert("RGBA"))
+        rgb = np.array(strip_image.convert("RGB"))
+        if mode == "RGB":
+            return rgb
+        if mode == "BGR":
+            return np.ascontiguousarray(rgb[:, :, ::-1])
+        return np.array(Image.fromarray(rgb).convert("L"))
+
+
+def read_strip(image_path, y0, y1, mode="RGB"):
+    with Image.open(image_path) as image:
+        width, height = image.size
+        offset, rawmode, stride, ystep = raw_tile_layout(image)
+        y1 = min(y1, height)
+
+        # Obrazy zapisane od dołu (BMP) mają wiersz y pod offsetem (height - 1 - y) * stride
+        if ystep >= 0:
+            offset += y0 * stride
+        else:
+            offset += (height - y1) * stride
+
+        image._size = (width, y1 - y0)
+        if hasattr(image, "_tile_size"):
+            image._tile_size = image._size  # TiffImageFile alokuje bufor według _tile_size
+        image.tile = [("raw", (0, 0, width, y1 - y0), offset, (rawmode, stride, ystep))]
+        with span("decode"):
+            image.load()
+        return convert_strip(image, mode)
+
+
+def image_height(image_path):
+    with Image.open(image_path) as image:
+        return image.size[1]
+
+
+def iter_strips(image_path, mode="RGB", strip_rows=STRIP_ROWS, tiled=False):
+    if mode not in COLOR_MODES:
+        raise ValueError(f"Nieobsługiwany tryb koloru: {mode}")
+    if strip_rows % 8:
+        raise ValueError("Wysokość pasa musi być wielokrotnością 8")
+
+    if tiled and supports_strip_reading(image_path):
+        height = image_height(image_path)
+        for y0 in range(0, height, strip_rows):
+            yield read_strip(image_path, y0, y0 + strip_rows, mode)
+        return
+
+    if tiled:
+        print(f"Warning: {image_path} nie pozwala na odczyt pasami - dekodowanie całego obrazu.")
+    image_array = load_image(image_path, mode)
+    for y0 in range(0, image_array.shape[0], strip_rows):
+        yield image_array[y0:y0+strip_rows]
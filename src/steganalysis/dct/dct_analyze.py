@@ -0,0 +1,251 @@
+import os
+import sys
+import argparse
+from functools import partial
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import load_image
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.streaming_stats import StreamingStats, DCT_RANGE, image_channels, histogram_kwargs
+from steganalysis.common.strip_reader import iter_strips, add_tiled_argument
+from steganalysis.common.feature_store import cached_features, add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.fast_plots import render_coefficient_comparison, plot_mode, add_plots_arguments, configure_plots
+from steganalysis.common.jpeg_coefficients import use_jpeg_coefficients, component_coefficients, add_jpeg_argument, configure_jpeg
+from steganalysis.common.coefficient_analysis import split_into_blocks, print_summary, add_folder_arguments
+from steganalysis.common.lazy_imports import lazy_module
+
+fftpack = lazy_module("scipy.fftpack")
+plt = lazy_module("matplotlib.pyplot")
+
+def compute_dct_coefficients(image_path, color_mode="L", jpeg=None):
+    # jpeg=None: decyzja dla tego jednego pliku; porównania przekazują decyzję dla wszystkich swoich plików
+    if jpeg is None:
+        jpeg = use_jpeg_coefficients(image_path)
+    if jpeg:
+        # Skwantowane współczynniki prosto z pliku: "L" - luminancja Y (nblocks, 8, 8), "RGB" - dict
+        # składowych {"Y", "Cb", "Cr"}, bo po podpróbkowaniu Cb i Cr mają mniej bloków niż Y
+        components = component_coefficients(image_path, color_mode)
+        return components["Y"] if color_mode == "L" else components
+
+    image_array = load_image(image_path, color_mode)
+
+    if color_mode == "RGB":
+        dct_coefficients = []
+        for c in range(3): 
+            channel = image_array[:, :, c]
+            dct_channel = compute_dct_for_channel(channel)
+            dct_coefficients.append(dct_channel)
+        dct_coefficients = np.stack(dct_coefficients)
+    else:
+        dct_coefficients = compute_dct_for_channel(image_array)
+    
+    return dct_coefficients
+
+def transform_blocks(blocks):
+    # Transformata wszystkich bloków jednym wywołaniem: najpierw kolumny, potem wiersze
+    with span("transform"):
+        return fftpack.dct(fftpack.dct(blocks, axis=1, norm='ortho'), axis=2, norm='ortho')
+
+def compute_dct_for_channel(channel):
+    block_size = 8
+    blocks = split_into_blocks(channel, block_size)
+    return np.ascontiguousarray(transform_blocks(blocks))
+
+def stats_from_accumulator(accumulator):
+    return {"mean": accumulator.mean, "std_dev": accumulator.std_dev, "histogram": accumulator}
+
+def empty_dct_stats():
+    return stats_from_accumulator(StreamingStats(DCT_RANGE))
+
+def analyze_dct_distribution(dct_coefficients):
+    accumulator = StreamingStats(DCT_RANGE)
+    for coefficients in (dct_coefficients.values() if isinstance(dct_coefficients, dict) else [dct_coefficients]):
+        accumulator.update(coefficients)
+    return stats_from_accumulator(accumulator)
+
+def stream_dct_statistics(image_path, color_mode="L", accumulator=None, batch_blocks=4096, tiled=False, jpeg=None):
+    # Statystyki liczone pasami wierszy i partiami bloków - w pamięci jest tylko jedna partia współczynników.
+    # Ta sama kolejność aktualizacji w trybie tiled i w pamięci, więc wyniki są identyczne.
+    if accumulator is None:
+        accumulator = StreamingStats(DCT_RANGE)
+
+    if jpeg is None:
+        jpeg = use_jpeg_coefficients(image_path)
+    if jpeg:
+        for coefficients in component_coefficients(image_path, color_mode).values():
+            for start in range(0, len(coefficients), batch_blocks):
+                accumulator.update(coefficients[start:start+batch_blocks])
+        return stats_from_accumulator(accumulator)
+
+    for strip in iter_strips(image_path, color_mode, tiled=tiled):
+        for channel in image_channels(strip):
+            blocks = split_into_blocks(channel)
+            for start in range(0, len(blocks), batch_blocks):
+                accumulator.update(transform_blocks(blocks[start:start+batch_blocks]))
+
+    return stats_from_accumulator(accumulator)
+
+def dct_params(image_path, color_mode="L", jpeg=None):
+    params = {"color_mode": color_mode, "block_size": 8, "range": list(DCT_RANGE)}
+    if jpeg is None:
+        jpeg = use_jpeg_coefficients(image_path)
+    if jpeg:
+        params["source"] = "jpeg"  # skwantowane współczynniki z pliku zamiast DCT zdekodowanych pikseli
+    return params
+
+def dct_statistics(image_path, color_mode="L", tiled=False, jpeg=None):
+    # Statystyki z magazynu cech - liczone tylko dla plików, których zawartości magazyn jeszcze nie zna
+    if jpeg is None:
+        jpeg = use_jpeg_coefficients(image_path)
+    params = dct_params(image_path, color_mode, jpeg)
+    def compute():
+        accumulator = StreamingStats(DCT_RANGE)
+        stream_dct_statistics(image_path, color_mode, accumulator=accumulator, tiled=tiled, jpeg=jpeg)
+        return accumulator.to_arrays()
+
+    features = cached_features([image_path], "dct_stats", params, compute)
+    return stats_from_accumulator(StreamingStats.from_arrays(features))
+
+render_comparison_plot = partial(render_coefficient_comparison, "DCT")  # szybka ścieżka, układ jak create_comparison_plot
+
+def create_comparison_plot(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders, output_graph_folder, color_label="RGB"):
+    fig, axs = plt.subplots(4, 4, figsize=(20, 10))
+    fig.suptitle(f"Porównanie współczynników DCT - {image_name}", fontsize=16)
+
+    # Wykres dla grayscale
+    axs[0, 0].hist(**histogram_kwargs(base_stats_gray), color="blue", alpha=0.7, edgecolor="black")
+    axs[0, 0].set_title("Histogram - Oryginał (Grayscale)")
+    axs[0, 0].set_xlabel("Wartość współczynnika DCT")
+    axs[0, 0].set_ylabel("Liczba wystąpień")
+    axs[0, 0].set_yscale('log')
+
+    for idx, stego_stat in enumerate(stego_stats_gray):
+        axs[0, idx+1].hist(**histogram_kwargs(stego_stat), color="green", alpha=0.7, edgecolor="black")
+        axs[0, idx+1].set_title(f"Histogram - {os.path.basename(stego_folders[idx])} (Grayscale)")
+        axs[0, idx+1].set_xlabel("Wartość współczynnika DCT")
+        axs[0, idx+1].set_ylabel("Liczba wystąpień")
+        axs[0, idx+1].set_yscale('log')
+
+    bins = base_stats_gray["histogram"].display_edges(50)
+    base_hist = base_stats_gray["histogram"].bin_counts(bins)
+    for idx, stego_stat in enumerate(stego_stats_gray):
+        stego_hist = stego_stat["histogram"].bin_counts(bins)
+        diff_hist = stego_hist - base_hist
+        axs[1, idx+1].bar(bins[:-1], diff_hist, width=np.diff(bins), color="red", alpha=0.7, edgecolor="black")
+        axs[1, idx+1].set_title(f"Różnice histogramów - {os.path.basename(stego_folders[idx])} (Grayscale)")
+        axs[1, idx+1].set_xlabel("Wartość współczynnika DCT")
+        axs[1, idx+1].set_ylabel("Różnica liczby wystąpień")
+        axs[1, idx+1].set_yscale('log')
+
+    # Wykres dla RGB (YCbCr dla współczynników z plików JPEG)
+    axs[2, 0].hist(**histogram_kwargs(base_stats_rgb), color="blue", alpha=0.7, edgecolor="black")
+    axs[2, 0].set_title(f"Histogram - Oryginał ({color_label})")
+    axs[2, 0].set_xlabel("Wartość współczynnika DCT")
+    axs[2, 0].set_ylabel("Liczba wystąpień")
+    axs[2, 0].set_yscale('log')
+
+    for idx, stego_stat in enumerate(stego_stats_rgb):
+        axs[2, idx+1].hist(**histogram_kwargs(stego_stat), color="green", alpha=0.7, edgecolor="black")
+        axs[2, idx+1].set_title(f"Histogram - {os.path.basename(stego_folders[idx])} ({color_label})")
+        axs[2, idx+1].set_xlabel("Wartość współczynnika DCT")
+        axs[2, idx+1].set_ylabel("Liczba wystąpień")
+        axs[2, idx+1].set_yscale('log')
+
+    bins_rgb = base_stats_rgb["histogram"].display_edges(50)
+    base_hist_rgb = base_stats_rgb["histogram"].bin_counts(bins_rgb)
+    for idx, stego_stat in enumerate(stego_stats_rgb):
+        stego_hist_rgb = stego_stat["histogram"].bin_counts(bins_rgb)
+        diff_hist_rgb = stego_hist_rgb - base_hist_rgb
+        axs[3, idx+1].bar(bins_rgb[:-1], diff_hist_rgb, width=np.diff(bins_rgb), color="red", alpha=0.7, edgecolor="black")
+        axs[3, idx+1].set_title(f"Różnice histogramów - {os.path.basename(stego_folders[idx])} ({color_label})")
+        axs[3, idx+1].set_xlabel("Wartość współczynnika DCT")
+        axs[3, idx+1].set_ylabel("Różnica liczby wystąpień")
+        axs[3, idx+1].set_yscale('log')
+
+    axs[1, 0].axis("off")  # Usuń pusty wykres
+    axs[3, 0].axis("off")  # Usuń pusty wykres
+    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
+
+    output_path = os.path.join(output_graph_folder, f"{image_name}")
+    with span("save"):
+        plt.savefig(output_path)
+    plt.close()
+
+
+def compare_image(image_name, base_folder, stego_folders, output_graph_folder, tiled=False):
+    print(f"Analiza obrazu: {image_name}")
+
+    base_image_path = os.path.join(base_folder, image_name)
+    base_name = os.path.splitext(image_name)[0]
+    stego_image_paths = [os.path.join(stego_folder, f"{base_name}.png") for stego_folder in stego_folders]
+    try:
+        # Współczynniki z plików JPEG tylko wtedy, gdy wszystkie porównywane pliki to JPEG baseline
+        jpeg = use_jpeg_coefficients(base_image_path, *filter(os.path.exists, stego_image_paths))
+        base_stats_gray = dct_statistics(base_image_path, color_mode="L", tiled=tiled, jpeg=jpeg)
+        base_stats_rgb = dct_statistics(base_image_path, color_mode="RGB", tiled=tiled, jpeg=jpeg)
+    except (OSError, ValueError) as error:
+        # Nieczytelny plik albo (przy --from-store) brak cech w magazynie - obraz jest pomijany
+        print(f"Warning: Could not load image {image_name}: {error}")
+        return
+
+    stego_stats_gray = []
+    stego_stats_rgb = []
+
+    for stego_folder, stego_image_path in zip(stego_folders, stego_image_paths):
+        if not os.path.exists(stego_image_path):
+            print(f"Brak obrazu {image_name} w folderze {stego_folder}")
+            stego_stats_gray.append(empty_dct_stats())
+            stego_stats_rgb.append(empty_dct_stats())
+            continue
+
+        try:
+            stego_stats_gray.append(dct_statistics(stego_image_path, color_mode="L", tiled=tiled, jpeg=jpeg))
+            stego_stats_rgb.append(dct_statistics(stego_image_path, color_mode="RGB", tiled=tiled, jpeg=jpeg))
+        except (OSError, ValueError) as error:
+            print(f"Warning: Could not load stego image {stego_image_path}: {error}")
+            del stego_stats_gray[len(stego_stats_rgb):]
+            stego_stats_gray.append(empty_dct_stats())
+            stego_stats_rgb.append(empty_dct_stats())
+
+    color_label = "YCbCr" if jpeg else "RGB"
+    print_summary(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders, color_label)
+    mode = plot_mode()
+    with span("plot"):
+        if mode == "fast":
+            render_comparison_plot(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders, output_graph_folder, color_label)
+        elif mode == "classic":
+            create_comparison_plot(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders, output_graph_folder, color_label)
+
+def compare_images(base_folder, stego_folders, output_graph_folder, jobs=1, tiled=False):
+    base_images = [f for f in os.listdir(base_folder) if f.endswith(('.jpg', '.jpeg', '.png'))]
+
+    compare = partial(compare_image, base_folder=base_folder, stego_folders=stego_folders, output_graph_folder=output_graph_folder, tiled=tiled)
+    run_batch(compare, base_images, jobs=jobs)
+
+BASE_FOLDER = r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS"
+OUTPUT_GRAPH_FOLDER = r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS\DCT ANALYZE"
+STEGO_FOLDERS = [
+    r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS\KRYS DCT",
+    r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS\KRYS RGBA",
+    r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS\KRYS LSB"
+]
+
+def main(argv=None):
+    parser = add_plots_arguments(add_store_arguments(add_tiled_argument(add_trace_argument(add_jobs_argument(argparse.ArgumentParser())))))
+    args = add_folder_arguments(add_jpeg_argument(parser), BASE_FOLDER, STEGO_FOLDERS, OUTPUT_GRAPH_FOLDER).parse_args(argv)
+    configure_store(args)
+    configure_trace(args)
+    configure_plots(args)
+    configure_jpeg(args)
+    base_folder = args.base_folder
+    output_graph_folder = args.output_folder
+    stego_folders = args.stego_folders
+    os.makedirs(output_graph_folder, exist_ok=True)
+
+    compare_images(base_folder, stego_folders, output_graph_folder, jobs=args.jobs, tiled=args.tiled)
+
+if __name__ == "__main__":
+    main()
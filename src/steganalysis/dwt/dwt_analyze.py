@@ -0,0 +1,435 @@
+import os
+import sys
+import argparse
+from functools import partial
+import numpy as np
+from PIL import Image
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import load_image
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.streaming_stats import StreamingStats, MomentStats, DWT_RANGE, image_channels, histogram_kwargs
+from steganalysis.common.strip_reader import iter_strips, add_tiled_argument, supports_strip_reading, read_strip, image_height
+from steganalysis.common.feature_store import cached_features, add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.fast_plots import render_coefficient_comparison, plot_mode, add_plots_arguments, configure_plots
+from steganalysis.common.coefficient_analysis import split_into_blocks, print_summary, add_folder_arguments
+from steganalysis.common.lazy_imports import lazy_module
+
+pywt = lazy_module("pywt")
+plt = lazy_module("matplotlib.pyplot")
+
+def compute_dwt_coefficients(image_path, color_mode="L", wavelet="haar"):
+    image_array = load_image(image_path, color_mode)
+
+    if color_mode == "RGB":
+        dwt_coefficients = []
+        for c in range(3):  
+            channel = image_array[:, :, c]
+            coeffs = compute_dwt_for_channel(channel, wavelet)
+            dwt_coefficients.append(coeffs)
+        dwt_coefficients = np.stack(dwt_coefficients)
+
+    else:
+        dwt_coefficients = compute_dwt_for_channel(image_array, wavelet)
+
+    return dwt_coefficients
+
+SUBBANDS = ("cA", "cH", "cV", "cD")
+
+def transform_blocks(blocks, wavelet, out):
+    with span("transform"):
+        cA, (cH, cV, cD) = pywt.dwt2(blocks, wavelet=wavelet, axes=(1, 2))
+        out[:, 0] = cA
+        out[:, 1] = cH
+        out[:, 2] = cV
+        out[:, 3] = cD
+    return out
+
+def subband_buffer(block_count, wavelet, block_size=8):
+    subband_size = pywt.dwt_coeff_len(block_size, wavelet.dec_len, "symmetric")
+    return np.empty((block_count, len(SUBBANDS), subband_size, subband_size), dtype=np.float32)
+
+def compute_dwt_for_channel(channel, wavelet, block_size=8, chunk_blocks=65536):
+    blocks = split_into_blocks(channel, block_size)
+    wavelet = pywt.Wavelet(wavelet)
+
+    # Jedna tablica (nblocks, 4 pasma, n, n) zamiast listy krotek małych tablic
+    dwt_coefficients = subband_buffer(len(blocks), wavelet, block_size)
+
+    for start in range(0, len(blocks), chunk_blocks):
+        transform_blocks(blocks[start:start+chunk_blocks], wavelet, dwt_coefficients[start:start+chunk_blocks])
+
+    return dwt_coefficients
+
+def subband_views(dwt_coefficients):
+    # Nazwane widoki pasm cA/cH/cV/cD (działa także dla tablicy RGB z osią kanałów na początku)
+    return {name: dwt_coefficients[..., idx, :, :] for idx, name in enumerate(SUBBANDS)}
+
+class DwtAccumulator:
+    # Statystyki całości i każdego pasma osobno, aktualizowane partiami bloków
+    def __init__(self):
+        self.total = StreamingStats(DWT_RANGE)
+        self.subbands = {name: StreamingStats(DWT_RANGE) for name in SUBBANDS}
+
+    def update(self, dwt_coefficients):
+        self.total.update(dwt_coefficients)
+        for name, view in subband_views(dwt_coefficients).items():
+            self.subbands[name].update(view)
+        return self
+
+    def merge(self, other):
+        self.total.merge(other.total)
+        for name in SUBBANDS:
+            self.subbands[name].merge(other.subbands[name])
+        return self
+
+    def to_arrays(self):
+        arrays = self.total.to_arrays("total_")
+        for name, subband in self.subbands.items():
+            arrays.update(subband.to_arrays(f"{name}_"))
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        accumulator = cls()
+        accumulator.total = StreamingStats.from_arrays(arrays, "total_")
+        accumulator.subbands = {name: StreamingStats.from_arrays(arrays, f"{name}_") for name in SUBBANDS}
+        return accumulator
+
+def stats_from_accumulator(accumulator):
+    subband_stats = {}
+    for name, subband in accumulator.subbands.items():
+        subband_stats[name] = {"mean": subband.mean, "std_dev": subband.std_dev, "histogram": subband}
+
+    total = accumulator.total
+    return {"mean": total.mean, "std_dev": total.std_dev, "subbands": subband_stats, "histogram": total}
+
+def empty_dwt_stats():
+    return stats_from_accumulator(DwtAccumulator())
+
+def analyze_dwt_distribution(dwt_coefficients):
+    return stats_from_accumulator(DwtAccumulator().update(dwt_coefficients))
+
+def stream_dwt_statistics(image_path, color_mode="L", wavelet="haar", accumulator=None, batch_blocks=4096, tiled=False):
+    # Statystyki liczone pasami wierszy i partiami bloków - współczynniki trafiają do jednego bufora
+    # wielokrotnego użytku. Ta sama kolejność aktualizacji w trybie tiled i w pamięci.
+    if accumulator is None:
+        accumulator = DwtAccumulator()
+    wavelet = pywt.Wavelet(wavelet)
+    buffer = subband_buffer(batch_blocks, wavelet)
+
+    for strip in iter_strips(image_path, color_mode, tiled=tiled):
+        for channel in image_channels(strip):
+            blocks = split_into_blocks(channel)
+            for start in range(0, len(blocks), batch_blocks):
+                batch = blocks[start:start+batch_blocks]
+                accumulator.update(transform_blocks(batch, wavelet, buffer[:len(batch)]))
+
+    return stats_from_accumulator(accumulator)
+
+def dwt_statistics(image_path, color_mode="L", wavelet="haar", tiled=False):
+    # Statystyki z magazynu cech - liczone tylko dla plików, których zawartości magazyn jeszcze nie zna
+    params = {"color_mode": color_mode, "wavelet": wavelet, "block_size": 8, "range": list(DWT_RANGE)}
+    def compute():
+        accumulator = DwtAccumulator()
+        stream_dwt_statistics(image_path, color_mode, wavelet, accumulator=accumulator, tiled=tiled)
+        return accumulator.to_arrays()
+
+    features = cached_features([image_path], "dwt_stats", params, compute)
+    return stats_from_accumulator(DwtAccumulator.from_arrays(features))
+
+# Tryb "full": wielopoziomowa dekompozycja wavedec2 całego kanału (albo dużych kafli) zamiast
+# jednopoziomowej DWT niezależnych bloków 8x8. Statystyki (z momentami 3. i 4. rzędu) dla każdego
+# poziomu i pasma: cA<n> (aproksymacja najgrubszego poziomu) oraz cH/cV/cD<poziom>, 1 = najdrobniejszy.
+# "histogram" w wyniku to pasma szczegółów poziomu 1, więc wykresy i podsumowanie działają jak dla bloków.
+TILE_PIXELS = 16 * 2**20  # większe obrazy są dzielone na pasy wierszy o mniej więcej tylu pikselach
+DETAIL_SUBBANDS = SUBBANDS[1:]
+
+wavelet_buffers = {}
+
+def level_range(level):
+    # Współczynniki rosną mniej więcej dwukrotnie z każdym poziomem - zakres i szerokość przedziału też
+    scale = 2 ** (level - 1)
+    return (DWT_RANGE[0] * scale, DWT_RANGE[1] * scale), float(scale)
+
+def level_subband_names(levels):
+    return [f"cA{levels}"] + [f"{name}{level}" for level in range(levels, 0, -1) for name in DETAIL_SUBBANDS]
+
+class WaveletLevelsAccumulator:
+    def __init__(self, levels):
+        self.levels = levels
+        self.subbands = {}
+        for name in level_subband_names(levels):
+            value_range, bin_width = level_range(int(name[2:]))
+            self.subbands[name] = MomentStats(value_range, bin_width)
+        self.finest = MomentStats(*level_range(1))
+
+    def update(self, coefficients):
+        # coefficients jak z pywt.wavedec2: [cA_n, (cH_n, cV_n, cD_n), ..., (cH_1, cV_1, cD_1)]
+        self.subbands[f"cA{self.levels}"].update(coefficients[0])
+        for level, details in zip(range(self.levels, 0, -1), coefficients[1:]):
+            for name, detail in zip(DETAIL_SUBBANDS, details):
+                self.subbands[f"{name}{level}"].update(detail)
+                if level == 1:
+                    self.finest.update(detail)
+        return self
+
+    def to_arrays(self):
+        arrays = self.finest.to_arrays("finest_")
+        for name, subband in self.subbands.items():
+            arrays.update(subband.to_arrays(f"{name}_"))
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, levels):
+        accumulator = cls(levels)
+        accumulator.finest = MomentStats.from_arrays(arrays, "finest_")
+        accumulator.subbands = {name: MomentStats.from_arrays(arrays, f"{name}_") for name in level_subband_names(levels)}
+        return accumulator
+
+def level_stats_from_accumulator(accumulator):
+    subband_stats = {name: {"mean": subband.mean, "std_dev": subband.std_dev, "skewness": subband.skewness,
+                            "kurtosis": subband.kurtosis, "histogram": subband}
+                     for name, subband in accumulator.subbands.items()}
+    finest = accumulator.finest
+    return {"mean": finest.mean, "std_dev": finest.std_dev, "subbands": subband_stats, "histogram": finest}
+
+def empty_level_stats(levels):
+    return level_stats_from_accumulator(WaveletLevelsAccumulator(levels))
+
+def channel_buffer(shape):
+    # Jeden bufor float32 na kształt kanału/kafla - wspólny dla kanałów R, G, B i kolejnych obrazów
+    # tego samego rozmiaru; kilka ostatnich kształtów (np. krótszy ostatni kafel) zostaje w pamięci
+    buffer = wavelet_buffers.pop(shape, None)
+    if buffer is None:
+        buffer = np.empty(shape, dtype=np.float32)
+    wavelet_buffers[shape] = buffer
+    while len(wavelet_buffers) > 4:
+        del wavelet_buffers[next(iter(wavelet_buffers))]
+    return buffer
+
+def decompose_channel(channel, wavelet, levels):
+    max_level = pywt.dwt_max_level(min(channel.shape), wavelet.dec_len)
+    if levels > max_level:
+        raise ValueError(f"Kanał {channel.shape[1]}x{channel.shape[0]} pozwala najwyżej na {max_level} poziomów falki {wavelet.name}")
+    buffer = channel_buffer(channel.shape)
+    np.copyto(buffer, channel)
+    with span("transform"):
+        return pywt.wavedec2(buffer, wavelet, level=levels)
+
+def effective_tile_rows(image_path, tile_rows=0, levels=1):
+    # 0 = cały kanał, jeśli ma najwyżej TILE_PIXELS pikseli, inaczej pasy po ok. TILE_PIXELS pikseli;
+    # wysokość pasa to wielokrotność 2**levels, więc siatki wszystkich poziomów są wyrównane
+    with Image.open(image_path) as image:
+        width, height = image.size
+    if tile_rows <= 0:
+        if width * height <= TILE_PIXELS:
+            return height
+        tile_rows = TILE_PIXELS // width
+    step = 2 ** levels
+    return min(height, max(step, tile_rows // step * step))
+
+def tile_bounds(height, tile_rows):
+    # Pasy [y0, y1); krótka reszta (poniżej pół pasa) dołącza do poprzedniego pasa
+    starts = list(range(0, height, tile_rows))
+    if len(starts) > 1 and height - starts[-1] < tile_rows // 2:
+        starts.pop()
+    return list(zip(starts, starts[1:] + [height]))
+
+def image_tiles(image_path, color_mode, tile_rows, tiled=False):
+    bounds = tile_bounds(image_height(image_path), tile_rows)
+    if tiled and len(bounds) > 1 and supports_strip_reading(image_path):
+        for y0, y1 in bounds:
+            yield read_strip(image_path, y0, y1, color_mode)
+        return
+    image_array = load_image(image_path, color_mode)
+    for y0, y1 in bounds:
+        yield image_array[y0:y1]
+
+def stream_dwt_level_statistics(image_path, color_mode="L", wavelet="haar", levels=3, tile_rows=0, accumulator=None, tiled=False):
+    if accumulator is None:
+        accumulator = WaveletLevelsAccumulator(levels)
+    wavelet = pywt.Wavelet(wavelet)
+    tile_rows = effective_tile_rows(image_path, tile_rows, levels)
+    for tile in image_tiles(image_path, color_mode, tile_rows, tiled):
+        for channel in image_channels(tile):
+            accumulator.update(decompose_channel(channel, wavelet, levels))
+    return level_stats_from_accumulator(accumulator)
+
+def dwt_level_statistics(image_path, color_mode="L", wavelet="haar", levels=3, tile_rows=0, tiled=False):
+    params = {"color_mode": color_mode, "wavelet": wavelet, "levels": levels,
+              "tile_rows": effective_tile_rows(image_path, tile_rows, levels), "range": list(DWT_RANGE)}
+    def compute():
+        accumulator = WaveletLevelsAccumulator(levels)
+        stream_dwt_level_statistics(image_path, color_mode, wavelet, levels, tile_rows, accumulator=accumulator, tiled=tiled)
+        return accumulator.to_arrays()
+
+    features = cached_features([image_path], "dwt_levels", params, compute)
+    return level_stats_from_accumulator(WaveletLevelsAccumulator.from_arrays(features, levels))
+
+def print_level_summary(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders):
+    names = ["Oryginał"] + [os.path.basename(folder) for folder in stego_folders]
+    for name, gray, rgb in zip(names, [base_stats_gray] + stego_stats_gray, [base_stats_rgb] + stego_stats_rgb):
+        for variant, stats in (("gray", gray), ("rgb", rgb)):
+            for subband, values in stats["subbands"].items():
+                print(f"{image_name:<20}{name:<15}{variant:<6}{subband:<6}{values['mean']:<12.4f}{values['std_dev']:<12.4f}"
+                      f"{values['skewness']:<12.4f}{values['kurtosis']:<12.4f}")
+
+def add_wavelet_arguments(parser):
+    parser.add_argument("--dwt-mode", choices=("blocks", "full"), default="blocks",
+                        help="blocks: jednopoziomowa DWT bloków 8x8; full: wielopoziomowa wavedec2 całego kanału")
+    parser.add_argument("--wavelet", default="haar", help="falka pywt, np. haar, db2, sym4, bior2.2")
+    parser.add_argument("--levels", type=int, default=3, help="liczba poziomów dekompozycji w trybie full")
+    parser.add_argument("--tile-rows", type=int, default=0,
+                        help=f"wysokość pasa w trybie full (0 = cały kanał do {TILE_PIXELS >> 20} MP, większe obrazy pasami)")
+    return parser
+
+render_comparison_plot = partial(render_coefficient_comparison, "DWT")  # szybka ścieżka, układ jak create_comparison_plot
+
+def create_comparison_plot(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders, output_graph_folder):
+    fig, axs = plt.subplots(4, 4, figsize=(20, 10))
+    fig.suptitle(f"Porównanie współczynników DWT - {image_name}", fontsize=16)
+
+    # Wykres dla grayscale
+    axs[0, 0].hist(**histogram_kwargs(base_stats_gray), color="blue", alpha=0.7, edgecolor="black")
+    axs[0, 0].set_title("Histogram - Oryginał (Grayscale)")
+    axs[0, 0].set_xlabel("Wartość współczynnika DWT")
+    axs[0, 0].set_ylabel("Liczba wystąpień")
+    axs[0, 0].set_yscale("log")
+
+    for idx, stego_stat in enumerate(stego_stats_gray):
+        axs[0, idx+1].hist(**histogram_kwargs(stego_stat), color="green", alpha=0.7, edgecolor="black")
+        axs[0, idx+1].set_title(f"Histogram - {os.path.basename(stego_folders[idx])} (Grayscale)")
+        axs[0, idx+1].set_xlabel("Wartość współczynnika DWT")
+        axs[0, idx+1].set_ylabel("Liczba wystąpień")
+        axs[0, idx+1].set_yscale("log")
+
+    bins = base_stats_gray["histogram"].display_edges(50)
+    base_hist = base_stats_gray["histogram"].bin_counts(bins)
+    for idx, stego_stat in enumerate(stego_stats_gray):
+        stego_hist = stego_stat["histogram"].bin_counts(bins)
+        diff_hist = stego_hist - base_hist
+        axs[1, idx+1].bar(bins[:-1], diff_hist, width=np.diff(bins), color="red", alpha=0.7, edgecolor="black")
+        axs[1, idx+1].set_title(f"Różnice histogramów - {os.path.basename(stego_folders[idx])} (Grayscale)")
+        axs[1, idx+1].set_xlabel("Wartość współczynnika DWT")
+        axs[1, idx+1].set_ylabel("Różnica liczby wystąpień")
+        axs[1, idx+1].set_yscale("log")
+
+    # Wykres dla RGB
+    axs[2, 0].hist(**histogram_kwargs(base_stats_rgb), color="blue", alpha=0.7, edgecolor="black")
+    axs[2, 0].set_title("Histogram - Oryginał (RGB)")
+    axs[2, 0].set_xlabel("Wartość współczynnika DWT")
+    axs[2, 0].set_ylabel("Liczba wystąpień")
+    axs[2, 0].set_yscale("log")
+
+    for idx, stego_stat in enumerate(stego_stats_rgb):
+        axs[2, idx+1].hist(**histogram_kwargs(stego_stat), color="green", alpha=0.7, edgecolor="black")
+        axs[2, idx+1].set_title(f"Histogram - {os.path.basename(stego_folders[idx])} (RGB)")
+        axs[2, idx+1].set_xlabel("Wartość współczynnika DWT")
+        axs[2, idx+1].set_ylabel("Liczba wystąpień")
+        axs[2, idx+1].set_yscale("log")
+
+    bins_rgb = base_stats_rgb["histogram"].display_edges(50)
+    base_hist_rgb = base_stats_rgb["histogram"].bin_counts(bins_rgb)
+    for idx, stego_stat in enumerate(stego_stats_rgb):
+        stego_hist_rgb = stego_stat["histogram"].bin_counts(bins_rgb)
+        diff_hist_rgb = stego_hist_rgb - base_hist_rgb
+        axs[3, idx+1].bar(bins_rgb[:-1], diff_hist_rgb, width=np.diff(bins_rgb), color="red", alpha=0.7, edgecolor="black")
+        axs[3, idx+1].set_title(f"Różnice histogramów - {os.path.basename(stego_folders[idx])} (RGB)")
+        axs[3, idx+1].set_xlabel("Wartość współczynnika DWT")
+        axs[3, idx+1].set_ylabel("Różnica liczby wystąpień")
+        axs[3, idx+1].set_yscale("log")
+
+    axs[1, 0].axis("off")  # Usuń pusty wykres
+    axs[3, 0].axis("off")  # Usuń pusty wykres
+    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
+
+    output_path = os.path.join(output_graph_folder, f"{image_name}")
+    with span("save"):
+        plt.savefig(output_path)
+    plt.close()
+
+
+def compare_image(image_name, base_folder, stego_folders, output_graph_folder, tiled=False, dwt_mode="blocks", wavelet="haar", levels=3, tile_rows=0):
+    print(f"Analiza obrazu: {image_name}")
+
+    if dwt_mode == "full":
+        statistics = partial(dwt_level_statistics, wavelet=wavelet, levels=levels, tile_rows=tile_rows, tiled=tiled)
+        empty_stats = partial(empty_level_stats, levels)
+    else:
+        statistics = partial(dwt_statistics, wavelet=wavelet, tiled=tiled)
+        empty_stats = empty_dwt_stats
+
+    base_image_path = os.path.join(base_folder, image_name)
+    try:
+        base_stats_gray = statistics(base_image_path, color_mode="L")
+        base_stats_rgb = statistics(base_image_path, color_mode="RGB")
+    except (OSError, ValueError) as error:
+        # Nieczytelny plik albo (przy --from-store) brak cech w magazynie - obraz jest pomijany
+        print(f"Warning: Could not load image {image_name}: {error}")
+        return
+
+    stego_stats_gray = []
+    stego_stats_rgb = []
+
+    for stego_folder in stego_folders:
+        base_name = os.path.splitext(image_name)[0]
+        stego_image_path = os.path.join(stego_folder, f"{base_name}.png")
+
+        if not os.path.exists(stego_image_path):
+            print(f"Brak obrazu {image_name} w folderze {stego_folder}")
+            stego_stats_gray.append(empty_stats())
+            stego_stats_rgb.append(empty_stats())
+            continue
+
+        try:
+            stego_stats_gray.append(statistics(stego_image_path, color_mode="L"))
+            stego_stats_rgb.append(statistics(stego_image_path, color_mode="RGB"))
+        except (OSError, ValueError) as error:
+            print(f"Warning: Could not load stego image {stego_image_path}: {error}")
+            del stego_stats_gray[len(stego_stats_rgb):]
+            stego_stats_gray.append(empty_stats())
+            stego_stats_rgb.append(empty_stats())
+
+    print_summary(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders)
+    if dwt_mode == "full":
+        print_level_summary(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders)
+    mode = plot_mode()
+    with span("plot"):
+        if mode == "fast":
+            render_comparison_plot(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders, output_graph_folder)
+        elif mode == "classic":
+            create_comparison_plot(image_name, base_stats_gray, stego_stats_gray, base_stats_rgb, stego_stats_rgb, stego_folders, output_graph_folder)
+
+def compare_images(base_folder, stego_folders, output_graph_folder, jobs=1, tiled=False, **dwt_options):
+    base_images = [f for f in os.listdir(base_folder) if f.endswith(('.jpg', '.jpeg', '.png'))]
+
+    compare = partial(compare_image, base_folder=base_folder, stego_folders=stego_folders, output_graph_folder=output_graph_folder, tiled=tiled, **dwt_options)
+    run_batch(compare, base_images, jobs=jobs)
+
+BASE_FOLDER = r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS"
+OUTPUT_GRAPH_FOLDER = r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS\DWT ANALYZE"
+STEGO_FOLDERS = [
+    r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS\KRYS DCT",
+    r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS\KRYS RGBA",
+    r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS\KRYS LSB"
+]
+
+def main(argv=None):
+    parser = add_plots_arguments(add_store_arguments(add_tiled_argument(add_trace_argument(add_jobs_argument(argparse.ArgumentParser())))))
+    args = add_folder_arguments(add_wavelet_arguments(parser), BASE_FOLDER, STEGO_FOLDERS, OUTPUT_GRAPH_FOLDER).parse_args(argv)
+    configure_store(args)
+    configure_trace(args)
+    configure_plots(args)
+    base_folder = args.base_folder
+    output_graph_folder = args.output_folder
+    stego_folders = args.stego_folders
+    os.makedirs(output_graph_folder, exist_ok=True)
+
+    compare_images(base_folder, stego_folders, output_graph_folder, jobs=args.jobs, tiled=args.tiled,
+                   dwt_mode=args.dwt_mode, wavelet=args.wavelet, levels=args.levels, tile_rows=args.tile_rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Ocena detektorów na oznaczonym korpusie okładek i obrazów stego: krzywe ROC, AUC, EER i skuteczność
+wykrywania przy ustalonym odsetku fałszywych alarmów, osobno dla każdej metody osadzania.
+
+Korpus to manifest CSV z generowania korpusu (krys_analiza_i_Steganografia.py --corpus: kolumny cover,
+stego, method) albo - domyślnie - katalogi images/original_images (okładki) i images/<metoda>_images.
+Każdy obraz jest oceniany raz przez wszystkie wybrane detektory (wynik: im większy, tym bardziej
+prawdopodobne osadzenie), porcjami w puli procesów run_batch - w pamięci są tylko wyniki, nie obrazy.
+Detektory korzystają z magazynu cech (rs_rates, spa_rates, pov_curves), więc ponowna ocena, także
+z innym zestawem metod albo progów, nie dekoduje obrazów.
+
+Progi są przeglądane wektorowo: po posortowaniu wyników TPR/FPR dla wszystkich progów naraz to
+skumulowane sumy etykiet.
+
+    python src/steganalysis/evaluation/evaluate_detectors.py --manifest corpus/manifest.csv -j 8
+"""
+import os
+import sys
+import argparse
+from functools import partial
+
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.feature_store import add_store_arguments, configure_store
+from steganalysis.common.instrumentation import add_trace_argument, configure_trace
+from steganalysis.common.script_loader import load_script
+from steganalysis.common.lazy_imports import lazy_module
+
+pd = lazy_module("pandas")
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['lsb', 'rgba', 'dct']
+
+DETECTORS = ("rs", "spa", "pov")
+TARGET_FPRS = (0.01, 0.05, 0.1)
+SCORE_BATCH = 4096  # obrazy na porcję run_batch - ogranicza liczbę wyników w locie
+
+scripts = {}
+
+
+def detector_script(name):
+    # Skrypt metody ładowany raz na proces (także w procesach roboczych)
+    paths = {"rs": "rs_method/rs_analysis.py", "spa": "spa_method/sample_pairs_analysis.py",
+             "pov": "chi_square_method/pov_chi_square.py"}
+    if name not in scripts:
+        scripts[name] = load_script(paths[name])
+    return scripts[name]
+
+
+def rate_score(name, image_path):
+    # RS/SPA: największy szacowany ułamek osadzenia spośród kanałów
+    rates = detector_script(name).estimate_rates(image_path)
+    if rates is None:
+        return np.nan
+    return float(np.nanmax(list(rates.values())))
+
+
+def pov_score(image_path):
+    # Atak chi-kwadrat par wartości: największe średnie prawdopodobieństwo osadzenia wzdłuż obrazu -
+    # rośnie zarówno z długością wiadomości, jak i z pewnością detektora
+    result = detector_script("pov").pov_curves(image_path)
+    if result is None:
+        return np.nan
+    _, curves = result
+    return float(max(np.mean(probability) for probability in curves.values()))
+
+
+SCORES = {"rs": partial(rate_score, "rs"), "spa": partial(rate_score, "spa"), "pov": pov_score}
+
+
+def score_image(image_path, detectors):
+    return np.array([SCORES[name](image_path) for name in detectors], dtype=np.float64)
+
+
+def score_images(paths, detectors, jobs=1):
+    # (n, detektory); NaN dla obrazów, których nie da się wczytać
+    scores = np.empty((len(paths), len(detectors)), dtype=np.float64)
+    score = partial(score_image, detectors=detectors)
+    for start in range(0, len(paths), SCORE_BATCH):
+        batch = paths[start:start + SCORE_BATCH]
+        scores[start:start + len(batch)] = run_batch(score, batch, jobs=jobs)
+        if len(paths) > SCORE_BATCH:
+            print(f"Ocenione obrazy: {start + len(batch)}/{len(paths)}", file=sys.stderr)
+    return scores
+
+
+def roc_curve(scores, labels):
+    # Wszystkie progi naraz: (fpr, tpr, progi) dla progów malejących, jak sklearn.metrics.roc_curve
+    order = np.argsort(-scores, kind="mergesort")
+    scores, labels = scores[order], labels[order]
+    last = np.r_[np.flatnonzero(np.diff(scores)), scores.size - 1]  # ostatnia pozycja każdego progu
+    true_positives = np.cumsum(labels)[last]
+    false_positives = last + 1 - true_positives
+    tpr = np.r_[0, true_positives] / max(true_positives[-1], 1)
+    fpr = np.r_[0, false_positives] / max(false_positives[-1], 1)
+    return fpr, tpr, np.r_[np.inf, scores[last]]
+
+
+def equal_error_rate(fpr, tpr):
+    # Punkt, w którym FPR = FNR, interpolowany liniowo między sąsiednimi progami
+    difference = fpr - (1 - tpr)  # niemalejące wzdłuż krzywej
+    i = int(np.searchsorted(difference, 0.0))
+    if i == 0:
+        return float(fpr[0])
+    if i == difference.size:
+        return float(fpr[-1])
+    t = -difference[i - 1] / (difference[i] - difference[i - 1])
+    return float(fpr[i - 1] + t * (fpr[i] - fpr[i - 1]))
+
+
+def detection_at_fpr(fpr, tpr, targets=TARGET_FPRS):
+    # Największy TPR wśród progów, których FPR nie przekracza celu
+    return tpr[np.searchsorted(fpr, targets, side="right") - 1]
+
+
+def evaluate(scores, labels, targets=TARGET_FPRS):
+    valid = ~np.isnan(scores)
+    scores, labels = scores[valid], labels[valid]
+    metrics = {
+        "covers": int((labels == 0).sum()),
+        "stego": int(labels.sum()),
+        "skipped": int((~valid).sum()),
+    }
+    if not metrics["covers"] or not metrics["stego"]:
+        # Bez okładek albo bez obrazów stego (np. wszystkie wyniki NaN) krzywa ROC nie istnieje -
+        # metryki NaN i pusta krzywa zamiast przerwania całego raportu
+        metrics.update({"auc": np.nan, "eer": np.nan, **{f"tpr@{target:g}": np.nan for target in targets}})
+        return metrics, (np.empty(0), np.empty(0), np.empty(0))
+
+    fpr, tpr, thresholds = roc_curve(scores, labels)
+    metrics["auc"] = float(np.trapezoid(tpr, fpr))
+    metrics["eer"] = equal_error_rate(fpr, tpr)
+    metrics.update({f"tpr@{target:g}": float(rate) for target, rate in zip(targets, detection_at_fpr(fpr, tpr, targets))})
+    return metrics, (fpr, tpr, thresholds)
+
+
+def manifest_corpus(manifest_path):
+    manifest = pd.read_csv(manifest_path, usecols=["cover", "stego", "method"])
+    covers = manifest["cover"].drop_duplicates()
+    return pd.DataFrame({
+        "path": np.r_[covers.to_numpy(), manifest["stego"].to_numpy()],
+        "method": np.r_[np.full(len(covers), "cover", dtype=object), manifest["method"].to_numpy()],
+    })
+
+
+def folder_corpus(methods=methods):
+    rows = []
+    for img in sorted(os.listdir(original_images_dir)):
+        rows.append((os.path.join(original_images_dir, img), "cover"))
+        for method in methods:
+            stego_path = os.path.join(images_dir, f"{method}_images", img)
+            if os.path.exists(stego_path):
+                rows.append((stego_path, method))
+    return pd.DataFrame(rows, columns=["path", "method"])
+
+
+def evaluate_corpus(corpus, detectors=DETECTORS, targets=TARGET_FPRS, jobs=1):
+    # Wiersz raportu i krzywa ROC dla każdej pary (detektor, metoda): okładki kontra obrazy stego metody
+    scores = score_images(corpus["path"].tolist(), detectors, jobs=jobs)
+    is_cover = (corpus["method"] == "cover").to_numpy()
+    rows, curves = [], {}
+    for method in corpus.loc[~is_cover, "method"].unique():
+        subset = is_cover | (corpus["method"] == method).to_numpy()
+        labels = (~is_cover[subset]).astype(np.int64)
+        for d, detector in enumerate(detectors):
+            metrics, curve = evaluate(scores[subset, d], labels, targets)
+            rows.append({"detector": detector, "method": method, **metrics})
+            curves[detector, method] = curve
+    return pd.DataFrame(rows), curves, scores
+
+
+def print_report(report):
+    print(report.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+
+
+def save_curves(curves, roc_path):
+    arrays = {}
+    for (detector, method), (fpr, tpr, thresholds) in curves.items():
+        arrays.update({f"{detector}/{method}/fpr": fpr, f"{detector}/{method}/tpr": tpr,
+                       f"{detector}/{method}/thresholds": thresholds})
+    np.savez_compressed(roc_path, **arrays)
+
+
+def main(argv=None):
+    parser = add_store_arguments(add_trace_argument(add_jobs_argument(argparse.ArgumentParser())))
+    parser.add_argument("--manifest", default=None,
+                        help="manifest korpusu CSV (domyślnie images/original_images i images/<metoda>_images)")
+    parser.add_argument("--detectors", nargs="+", choices=DETECTORS, default=list(DETECTORS),
+                        help="oceniane detektory")
+    parser.add_argument("--fpr", nargs="+", type=float, default=list(TARGET_FPRS),
+                        help="odsetki fałszywych alarmów, przy których raportowany jest TPR")
+    parser.add_argument("--output", default="detector_evaluation.csv", help="raport CSV")
+    parser.add_argument("--roc", default="detector_roc.npz", help="krzywe ROC (fpr, tpr, progi) jako .npz")
+    parser.add_argument("--scores", default=None, help="opcjonalny CSV z wynikami detektorów dla każdego obrazu")
+    args = parser.parse_args(argv)
+    configure_store(args)
+    configure_trace(args)
+
+    corpus = manifest_corpus(args.manifest) if args.manifest else folder_corpus()
+    report, curves, scores = evaluate_corpus(corpus, args.detectors, tuple(args.fpr), jobs=args.jobs)
+
+    print_report(report)
+    report.to_csv(args.output, index=False)
+    save_curves(curves, args.roc)
+    if args.scores:
+        corpus.assign(**{detector: scores[:, d] for d, detector in enumerate(args.detectors)}).to_csv(args.scores, index=False)
+
+
+if __name__ == "__main__":
+    main()
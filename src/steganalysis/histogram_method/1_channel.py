@@ -0,0 +1,139 @@
+import numpy as np
+import os
+import sys
+import argparse
+from functools import partial
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.histogram_kernel import channel_histograms, image_histograms_or_none
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.strip_reader import add_tiled_argument
+from steganalysis.common.feature_store import add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.fast_plots import render_grid, plot_mode, add_plots_arguments, configure_plots, BYTE_EDGES
+from steganalysis.common.lazy_imports import lazy_module
+
+plt = lazy_module("matplotlib.pyplot")
+
+def calculate_histogram(image):
+    return channel_histograms(image).sum(axis=0)  # wszystkie kanały razem, jak np.histogram(image.flatten())
+
+def plot_histograms_9(original_histograms, stego_histograms, diffs, img_name, save_path=None):
+
+    methods = ['LSB', 'RGBA', 'DCT']
+    color='darkorange'
+    fig, axes = plt.subplots(3, 3, figsize=(15, 15))
+    fig.suptitle(f"Histogramy dla obrazu: {img_name}", fontsize=16)  # Global title
+
+    for i, method in enumerate(methods):
+        # Original histogram
+        axes[i, 0].bar(range(256), original_histograms[i], color=color)
+        axes[i, 0].set_title(f'Oryginalny - {method}')
+        axes[i, 0].set_xlabel('Intensywność pikseli')
+        axes[i, 0].set_ylabel('Liczba wystąpień')
+
+        # Stego histogram
+        axes[i, 1].bar(range(256), stego_histograms[i], color=color)
+        axes[i, 1].set_title(f'Stego - {method}')
+        axes[i, 1].set_xlabel('Intensywność pikseli')
+        axes[i, 1].set_ylabel('Liczba wystąpień')
+
+        # Difference histogram
+        axes[i, 2].bar(range(256), diffs[i], color=color)
+        axes[i, 2].set_title(f'Różnica - {method}')
+        axes[i, 2].set_xlabel('Intensywność pikseli')
+        axes[i, 2].set_ylabel('Liczba wystąpień')
+
+    plt.tight_layout(rect=[0, 0, 1, 0.96])  # Adjust layout for global title
+    if save_path:
+        with span("save"):
+            plt.savefig(save_path)
+    else:
+        plt.show()
+
+    plt.close()
+
+def render_histograms_9(original_histograms, stego_histograms, diffs, img_name, save_path):
+    # Ten sam układ co plot_histograms_9, ale figura budowana raz i histogramy jako schodki
+    cells = []
+    for i, method in enumerate(['LSB', 'RGBA', 'DCT']):
+        for j, (label, histogram) in enumerate([('Oryginalny', original_histograms[i]), ('Stego', stego_histograms[i]), ('Różnica', diffs[i])]):
+            cells.append({"row": i, "col": j, "counts": histogram, "edges": BYTE_EDGES, "title": f'{label} - {method}',
+                          "xlabel": 'Intensywność pikseli', "ylabel": 'Liczba wystąpień', "color": 'darkorange'})
+    render_grid("histograms_9", (3, 3), (15, 15), cells, save_path,
+                suptitle=f"Histogramy dla obrazu: {img_name}", rect=[0, 0, 1, 0.96])
+
+def detect_stego_changes_9(original_image, stego_images, img_name):
+    original_histogram = calculate_histogram(original_image)
+    stego_histograms = [calculate_histogram(stego_image) for stego_image in stego_images]
+    compare_histograms_9(original_histogram, stego_histograms, img_name)
+
+def compare_histograms_9(original_histogram, stego_histograms, img_name):
+    original_histograms = []
+    plotted_histograms = []
+    diffs = []
+
+    methods = ['lsb', 'rgba', 'dct']
+    for method, stego_histogram in zip(methods, stego_histograms):
+        print("Original histogram:\n",original_histogram)
+        print("Stego histogram:\n",stego_histogram)
+        diff = np.abs(original_histogram - stego_histogram)
+        print("Difference:\n",diff)
+
+        original_histograms.append(original_histogram)
+        plotted_histograms.append(stego_histogram)
+        diffs.append(diff)
+
+    mode = plot_mode()
+    if mode == "none":
+        return
+
+    save_dir = os.path.join(images_dir, "histogram_images_gray", img_name)
+    os.makedirs(save_dir, exist_ok=True)
+    hist_filename = os.path.join(save_dir, f"{img_name}_combined_histograms.png")
+    with span("plot"):
+        if mode == "fast":
+            render_histograms_9(original_histograms, plotted_histograms, diffs, img_name, hist_filename)
+        else:
+            plot_histograms_9(original_histograms, plotted_histograms, diffs, img_name, hist_filename)
+
+# Directories setup
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['lsb', 'rgba', 'dct']
+
+def gray_histogram(image_path, tiled=False):
+    # Histogramy są zapamiętywane dla pliku - oryginał liczony jest raz dla wszystkich metod
+    histograms = image_histograms_or_none(image_path, tiled)
+    return None if histograms is None else histograms["gray"]
+
+def process_image(img, tiled=False):
+    original_histogram = gray_histogram(os.path.join(original_images_dir, img), tiled)
+    stego_histograms = []
+
+    for method in methods:
+        stego_image_dir = os.path.join(images_dir, f"{method}_images")
+        stego_filename = os.path.join(stego_image_dir, img)
+        stego_histogram = gray_histogram(stego_filename, tiled)
+        if stego_histogram is not None:
+            stego_histograms.append(stego_histogram)
+        else:
+            print(f"Warning: Could not load stego image for {img} with method {method}.")
+            break
+
+    if original_histogram is not None and len(stego_histograms) == len(methods):
+        compare_histograms_9(original_histogram, stego_histograms, img.split('.')[0])
+    else:
+        print(f"Warning: Could not load all image pairs for {img}.")
+
+if __name__ == "__main__":
+    parser = add_store_arguments(add_tiled_argument(add_trace_argument(add_jobs_argument(argparse.ArgumentParser()))))
+    args = add_plots_arguments(parser).parse_args()
+    configure_store(args)
+    configure_trace(args)
+    configure_plots(args)
+    images = [img for img in os.listdir(original_images_dir) if img.endswith(('.png', '.jpg', '.jpeg'))]
+    run_batch(partial(process_image, tiled=args.tiled), images, jobs=args.jobs)
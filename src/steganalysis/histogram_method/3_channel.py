@@ -0,0 +1,127 @@
+import numpy as np
+import os
+import sys
+import argparse
+from functools import partial
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.histogram_kernel import channel_histograms, image_histograms_or_none
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.strip_reader import add_tiled_argument
+from steganalysis.common.feature_store import add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.fast_plots import render_grid, plot_mode, add_plots_arguments, configure_plots, BYTE_EDGES
+from steganalysis.common.lazy_imports import lazy_module
+
+plt = lazy_module("matplotlib.pyplot")
+
+def calculate_histogram(image):
+    return channel_histograms(image).sum(axis=0)  # wszystkie kanały razem, jak np.histogram(image.flatten())
+
+def plot_histograms_rgb_9(original_histograms, stego_histograms, diffs, img_name, method, save_path=None):
+    """
+    Plots 9 subplots: 3 rows (channels: Blue, Green, Red) x 3 columns (Original, Stego, Difference).
+    """
+    channels = ['Niebieski', 'Zielony', 'Czerwony']
+    colors = ['blue', 'green', 'red']
+
+    fig, axes = plt.subplots(3, 3, figsize=(15, 15))
+    fig.suptitle(f"Histogramy dla obrazu: {img_name} - Metoda: {method.upper()}", fontsize=16)  # Global title
+
+    for i, channel in enumerate(channels):
+        # Original histogram
+        axes[i, 0].bar(range(256), original_histograms[i], color=colors[i])
+        axes[i, 0].set_title(f'Oryginalny - {channel}')
+        axes[i, 0].set_xlabel('Intensywność pikseli')
+        axes[i, 0].set_ylabel('Liczba wystąpień')
+
+        # Stego histogram
+        axes[i, 1].bar(range(256), stego_histograms[i], color=colors[i])
+        axes[i, 1].set_title(f'Stego - {channel}')
+        axes[i, 1].set_xlabel('Intensywność pikseli')
+        axes[i, 1].set_ylabel('Liczba wystąpień')
+
+        # Difference histogram
+        axes[i, 2].bar(range(256), diffs[i], color='orange')  # Difference uses orange
+        axes[i, 2].set_title(f'Różnica - {channel}')
+        axes[i, 2].set_xlabel('Intensywność pikseli')
+        axes[i, 2].set_ylabel('Liczba wystąpień')
+
+    plt.tight_layout(rect=[0, 0, 1, 0.96])  # Adjust layout for global title
+    if save_path:
+        with span("save"):
+            plt.savefig(save_path)
+    else:
+        plt.show()
+
+    plt.close()
+
+def render_histograms_rgb_9(original_histograms, stego_histograms, diffs, img_name, method, save_path):
+    # Ten sam układ co plot_histograms_rgb_9, ale figura budowana raz i histogramy jako schodki
+    channels = ['Niebieski', 'Zielony', 'Czerwony']
+    colors = ['blue', 'green', 'red']
+
+    cells = []
+    for i, channel in enumerate(channels):
+        columns = [('Oryginalny', original_histograms[i], colors[i]), ('Stego', stego_histograms[i], colors[i]), ('Różnica', diffs[i], 'orange')]
+        for j, (label, histogram, color) in enumerate(columns):
+            cells.append({"row": i, "col": j, "counts": histogram, "edges": BYTE_EDGES, "title": f'{label} - {channel}',
+                          "xlabel": 'Intensywność pikseli', "ylabel": 'Liczba wystąpień', "color": color})
+    render_grid("histograms_rgb_9", (3, 3), (15, 15), cells, save_path,
+                suptitle=f"Histogramy dla obrazu: {img_name} - Metoda: {method.upper()}", rect=[0, 0, 1, 0.96])
+
+def detect_stego_changes_rgb_9(original_image, stego_image, img_name, method):
+    compare_histograms_rgb_9(channel_histograms(original_image), channel_histograms(stego_image), img_name, method)
+
+def compare_histograms_rgb_9(original_histograms, stego_histograms, img_name, method):
+    # Iterate through Blue, Green, and Red channels
+    diffs = [np.abs(original_histogram - stego_histogram) for original_histogram, stego_histogram in zip(original_histograms, stego_histograms)]
+    print(f"{img_name:<20}{method:<10}" + "".join(f"{channel}={int(diff.sum()):<12}" for channel, diff in zip("BGR", diffs)))
+
+    mode = plot_mode()
+    if mode == "none":
+        return
+
+    save_dir = os.path.join(images_dir, "histogram_images_rgb", img_name, method)
+    os.makedirs(save_dir, exist_ok=True)
+    hist_filename = os.path.join(save_dir, f"{img_name}_histograms_{method}.png")
+    with span("plot"):
+        if mode == "fast":
+            render_histograms_rgb_9(original_histograms, stego_histograms, diffs, img_name, method, hist_filename)
+        else:
+            plot_histograms_rgb_9(original_histograms, stego_histograms, diffs, img_name, method, hist_filename)
+
+# Directories setup
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['lsb', 'rgba', 'dct']
+
+def bgr_histograms(image_path, tiled=False):
+    histograms = image_histograms_or_none(image_path, tiled)
+    return None if histograms is None else [histograms["B"], histograms["G"], histograms["R"]]
+
+def process_image(img, tiled=False):
+    # Histogramy oryginału liczone raz i używane dla wszystkich metod
+    original_histograms = bgr_histograms(os.path.join(original_images_dir, img), tiled)
+
+    for method in methods:
+        stego_image_dir = os.path.join(images_dir, f"{method}_images")
+        stego_filename = os.path.join(stego_image_dir, img)
+        stego_histograms = bgr_histograms(stego_filename, tiled)
+
+        if original_histograms is not None and stego_histograms is not None:
+            compare_histograms_rgb_9(original_histograms, stego_histograms, img.split('.')[0], method)
+        else:
+            print(f"Warning: Could not load image pair for {img} with method {method}.")
+
+if __name__ == "__main__":
+    parser = add_store_arguments(add_tiled_argument(add_trace_argument(add_jobs_argument(argparse.ArgumentParser()))))
+    args = add_plots_arguments(parser).parse_args()
+    configure_store(args)
+    configure_trace(args)
+    configure_plots(args)
+    images = [img for img in os.listdir(original_images_dir) if img.endswith(('.png', '.jpg', '.jpeg'))]
+    run_batch(partial(process_image, tiled=args.tiled), images, jobs=args.jobs)
@@ -0,0 +1,250 @@
+"""
+Mapy lokalizacji osadzenia: statystyki LSB liczone w oknach przesuwanych po siatce obrazu.
+
+hide_data_lsb i hide_data_alpha zapisują wiadomość w pierwszych wierszach obrazu, hide_data_dct
+w pierwszych blokach - w statystyce całego obrazu ten sygnał ginie. Tutaj każda statystyka jest liczona
+dla każdego położenia okna:
+
+    pov         - prawdopodobieństwo osadzenia z ataku chi-kwadrat par wartości (jak pov_chi_square)
+    lsb_pairs   - udział par sąsiednich pikseli różniących się o 1, które leżą w tej samej parze LSB
+                  (2k, 2k+1); w naturalnych obrazach to około połowy, osadzanie w LSB podnosi udział
+    dct_parity  - obciążenie parzystości współczynnika [7, 7] bloków 8x8: 2 * |ułamek parzystych - 0.5|;
+                  w czystych blokach współczynnik to zwykle 0 (obciążenie blisko 1), hide_data_dct
+                  wymusza bity wiadomości (obciążenie blisko 0)
+
+Wskaźniki (histogram wartości, pary pikseli, parzystość bloków) są zliczane raz na komórkę siatki
+(--cell pikseli, wielokrotność 8, więc komórki zawierają całe bloki DCT), a z liczności komórek
+budowane są tablice sum prefiksowych (summed-area tables). Suma w oknie dowolnej wielkości to cztery
+odczyty tablicy, więc koszt położenia nie zależy od rozmiaru okna, a kilka rozmiarów (--window)
+korzysta z tych samych tablic. Okna przesuwają się co komórkę; rozmiar okna to wielokrotność komórki.
+
+Mapa ma kształt (wiersze komórek - k + 1, kolumny komórek - k + 1) dla okna k komórek; wartość [i, j]
+dotyczy okna z lewym górnym rogiem w pikselu (i * cell, j * cell). Mapy trafiają do magazynu cech
+i do plików .npz, a z --overlay także jako PNG z mapą nałożoną na obraz.
+
+    python src/steganalysis/localization/localize_lsb.py --cell 16 --window 32 64 --overlay -j 4
+"""
+import os
+import sys
+import argparse
+from functools import partial
+
+import numpy as np
+from PIL import Image
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import load_image_or_none, has_alpha
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.feature_store import cached_features, add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.script_loader import load_script
+from steganalysis.common.lazy_imports import lazy_module
+
+matplotlib = lazy_module("matplotlib")
+
+BLOCK_SIZE = 8
+CELL = 16
+WINDOWS = (64,)
+STATISTICS = ("pov", "lsb_pairs", "dct_parity")
+OVERLAY_OPACITY = 0.6
+PNG_OPTIONS = {"compress_level": 1}
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['original', 'lsb', 'rgba', 'dct']
+
+pov_script = None
+
+
+def pov_probability(histograms):
+    global pov_script
+    if pov_script is None:
+        pov_script = load_script(os.path.join("chi_square_method", "pov_chi_square.py"))
+    return pov_script.pov_probability(histograms)
+
+
+def cell_sums(indicator, cell):
+    # (h, w) -> (h // cell, w // cell); niepełne komórki na krawędziach są pomijane
+    rows, cols = indicator.shape[0] // cell, indicator.shape[1] // cell
+    return indicator[:rows * cell, :cols * cell].reshape(rows, cell, cols, cell).sum(axis=(1, 3), dtype=np.int64)
+
+
+def cell_histograms(channels, cell):
+    # channels: (h, w, c) uint8 -> (wiersze, kolumny, 256) - histogram wartości wszystkich kanałów komórki,
+    # liczony pasami po `cell` wierszy, żeby indeksy bincount nie zajmowały pamięci całego obrazu
+    rows, cols = channels.shape[0] // cell, channels.shape[1] // cell
+    column_cell = (np.arange(cols * cell) // cell * 256)[None, :, None]
+    histograms = np.empty((rows, cols, 256), dtype=np.int64)
+    for row in range(rows):
+        band = channels[row * cell:(row + 1) * cell, :cols * cell]
+        histograms[row] = np.bincount((column_cell + band).reshape(-1), minlength=cols * 256).reshape(cols, 256)
+    return histograms
+
+
+def lsb_pair_indicators(channels):
+    # Pary poziome (x, x+1): różnica 1 i ta sama para LSB; wskaźnik przypisany do lewego piksela.
+    # Na uint8: u - v zawija się do 1 albo 255, a ta sama para (2k, 2k+1) to u ^ v == 1
+    u, v = channels[:, :-1], channels[:, 1:]
+    difference = u - v
+    close = (difference == 1) | (difference == 255)
+    same = (u ^ v) == 1
+    pad = ((0, 0), (0, 1))
+    return np.pad(same.sum(axis=2), pad), np.pad(close.sum(axis=2), pad)
+
+
+def dct_parity_indicators(channels):
+    # (wiersze bloków, kolumny bloków): liczba kanałów, w których zaokrąglony współczynnik [7, 7] jest
+    # parzysty - ten sam współczynnik i zaokrąglenie co extract_data_dct
+    n = np.arange(BLOCK_SIZE)
+    basis = np.cos(np.pi * (2 * n + 1) * (BLOCK_SIZE - 1) / (2 * BLOCK_SIZE)) * np.sqrt(2.0 / BLOCK_SIZE)
+    rows, cols = channels.shape[0] // BLOCK_SIZE, channels.shape[1] // BLOCK_SIZE
+    blocks = channels[:rows * BLOCK_SIZE, :cols * BLOCK_SIZE].reshape(rows, BLOCK_SIZE, cols, BLOCK_SIZE, -1)
+    coefficients = np.einsum("aybxc,y,x->abc", blocks.astype(np.float64), basis, basis)
+    return (np.round(coefficients).astype(np.int64) % 2 == 0).sum(axis=2)
+
+
+def summed_area_table(cells):
+    # (wiersze, kolumny, ...) -> (wiersze + 1, kolumny + 1, ...) z zerowym pierwszym wierszem i kolumną
+    table = np.zeros((cells.shape[0] + 1, cells.shape[1] + 1) + cells.shape[2:], dtype=np.int64)
+    np.cumsum(np.cumsum(cells, axis=0), axis=1, out=table[1:, 1:])
+    return table
+
+
+def window_sums(table, size):
+    # Sumy we wszystkich oknach size x size komórek: cztery odczyty tablicy na położenie
+    return table[size:, size:] - table[:-size, size:] - table[size:, :-size] + table[:-size, :-size]
+
+
+def ratio(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, np.nan), where=denominator > 0)
+
+
+def group_tables(channels, cell, dct=False):
+    with span("stats"):
+        same, close = lsb_pair_indicators(channels)
+        tables = {
+            "histograms": summed_area_table(cell_histograms(channels, cell)),
+            "same": summed_area_table(cell_sums(same, cell)),
+            "close": summed_area_table(cell_sums(close, cell)),
+        }
+        if dct:
+            tables["even"] = summed_area_table(cell_sums(dct_parity_indicators(channels), cell // BLOCK_SIZE))
+    return tables
+
+
+def group_heatmaps(tables, window, cell, channel_count):
+    with span("stats"):
+        heatmaps = {
+            "pov": pov_probability(window_sums(tables["histograms"], window)),
+            "lsb_pairs": ratio(window_sums(tables["same"], window), window_sums(tables["close"], window)),
+        }
+        if "even" in tables:
+            blocks = (window * cell // BLOCK_SIZE) ** 2 * channel_count
+            heatmaps["dct_parity"] = 2 * np.abs(window_sums(tables["even"], window) / blocks - 0.5)
+    return heatmaps
+
+
+def compute_heatmaps(image_path, cell=CELL, windows=WINDOWS):
+    alpha = has_alpha(image_path)
+    image = load_image_or_none(image_path, "RGBA" if alpha else "RGB")
+    if image is None:
+        raise OSError(f"Nie można wczytać obrazu {image_path}")
+
+    groups = {"RGB": (image[:, :, :3], True)}
+    if alpha:
+        groups["alpha"] = (image[:, :, 3:], False)
+
+    features = {}
+    for group, (channels, dct) in groups.items():
+        tables = group_tables(channels, cell, dct)
+        for window in windows:
+            size = window // cell
+            if size > min(tables["same"].shape[:2]) - 1:
+                continue  # okno większe niż obraz
+            for statistic, heatmap in group_heatmaps(tables, size, cell, channels.shape[2]).items():
+                features[f"{group}_{statistic}_w{window}"] = heatmap.astype(np.float32)
+    return features
+
+
+def localization_heatmaps(image_path, cell=CELL, windows=WINDOWS):
+    # {"<kanały>_<statystyka>_w<okno>": mapa}; None, gdy obrazu nie da się wczytać
+    windows = tuple(sorted(set(windows)))
+    if cell % BLOCK_SIZE or any(window % cell for window in windows):
+        raise ValueError(f"Komórka musi być wielokrotnością {BLOCK_SIZE}, a okna wielokrotnością komórki")
+    params = {"cell": cell, "windows": list(windows), "statistics": list(STATISTICS)}
+    try:
+        return cached_features([image_path], "localization", params, partial(compute_heatmaps, image_path, cell, windows))
+    except (OSError, ValueError):
+        return None
+
+
+def overlay(image_path, heatmap, cell, window, save_path, colormap="inferno"):
+    # Mapa rozciągnięta na piksele (wartość okna w jego środkowej komórce) i nałożona na obraz w skali szarości
+    with span("plot"):
+        with Image.open(image_path) as image:
+            gray = np.asarray(image.convert("L"), dtype=np.float32) / 255.0
+        values = np.repeat(np.repeat(heatmap, cell, axis=0), cell, axis=1)
+        offset = (window - cell) // 2
+        colors = matplotlib.colormaps[colormap](np.nan_to_num(values, nan=0.0))[:, :, :3]
+        mask = np.zeros(gray.shape, dtype=bool)
+        mask[offset:offset + values.shape[0], offset:offset + values.shape[1]] = ~np.isnan(values)
+
+        result = np.repeat(gray[:, :, None], 3, axis=2)
+        region = result[offset:offset + values.shape[0], offset:offset + values.shape[1]]
+        visible = mask[offset:offset + values.shape[0], offset:offset + values.shape[1], None]
+        region[:] = np.where(visible, (1 - OVERLAY_OPACITY) * region + OVERLAY_OPACITY * colors, region)
+    with span("save"):
+        Image.fromarray((result * 255).round().astype(np.uint8)).save(save_path, **PNG_OPTIONS)
+
+
+def image_folder(method):
+    return original_images_dir if method == 'original' else os.path.join(images_dir, f"{method}_images")
+
+
+def process_image(img, cell=CELL, windows=WINDOWS, output_dir=None, draw_overlay=False):
+    img_name = img.split('.')[0]
+    save_dir = os.path.join(output_dir or os.path.join(images_dir, "localization"), img_name)
+    for method in methods:
+        image_path = os.path.join(image_folder(method), img)
+        heatmaps = localization_heatmaps(image_path, cell, windows)
+        if heatmaps is None:
+            print(f"Warning: Could not load image {img} for method {method}.")
+            continue
+
+        os.makedirs(save_dir, exist_ok=True)
+        np.savez_compressed(os.path.join(save_dir, f"{img_name}_{method}_heatmaps.npz"), cell=cell, **heatmaps)
+        for name, heatmap in heatmaps.items():
+            if np.isnan(heatmap).all():
+                continue
+            window = int(name.rsplit("_w", 1)[1])
+            i, j = np.unravel_index(np.nanargmax(heatmap), heatmap.shape)
+            print(f"{img_name:<20}{method:<10}{name:<24}max={np.nanmax(heatmap):<10.4f}"
+                  f"mean={np.nanmean(heatmap):<10.4f}at=({i * cell}, {j * cell})")
+            if draw_overlay:
+                overlay(image_path, heatmap, cell, window, os.path.join(save_dir, f"{img_name}_{method}_{name}.png"))
+
+
+def main(argv=None):
+    parser = add_store_arguments(add_trace_argument(add_jobs_argument(argparse.ArgumentParser())))
+    parser.add_argument("--cell", type=int, default=CELL, help="krok siatki w pikselach (wielokrotność 8)")
+    parser.add_argument("--window", type=int, nargs="+", default=list(WINDOWS),
+                        help="rozmiary okien w pikselach (wielokrotności --cell)")
+    parser.add_argument("--overlay", action="store_true", help="zapisz mapy nałożone na obraz jako PNG")
+    parser.add_argument("--output-dir", default=None, help="katalog map (domyślnie images/localization)")
+    args = parser.parse_args(argv)
+    configure_store(args)
+    configure_trace(args)
+    if args.cell % BLOCK_SIZE or any(window % args.cell for window in args.window):
+        parser.error(f"--cell musi być wielokrotnością {BLOCK_SIZE}, a --window wielokrotnością --cell")
+
+    images = [img for img in os.listdir(original_images_dir) if img.endswith(('.png', '.jpg', '.jpeg'))]
+    process = partial(process_image, cell=args.cell, windows=tuple(args.window), output_dir=args.output_dir,
+                      draw_overlay=args.overlay)
+    run_batch(process, images, jobs=args.jobs)
+
+
+if __name__ == "__main__":
+    main()
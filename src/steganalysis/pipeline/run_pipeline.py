@@ -0,0 +1,271 @@
+"""
+Wszystkie analizy obrazu w jednym przebiegu: histogramy (1_channel/3_channel), test chi-kwadrat,
+statystyki DCT i DWT (skala szarości i RGB) oraz opcjonalnie detektory RS, SPA i ślepy atak chi-kwadrat (POV).
+
+Skrypty metod dekodują i przekształcają ten sam plik każdy osobno. Tutaj analizatory deklarują
+potrzebne wyniki pośrednie, a common.pipeline liczy każdy z nich raz na plik:
+
+    color -> rgb -> gray -> gray_histogram
+      |       |      '----> gray_blocks -> dct_gray
+      |       '-----------> rgb_blocks  -> dct_rgb
+      '-> color_histograms
+
+    jpeg_coefficients -> dct_gray, dct_rgb   (gdy wszystkie pliki przebiegu to JPEG baseline -
+                                              bez dekodowania pikseli)
+
+color to jedno dekodowanie pliku (RGBA, jeśli plik ma kanał alfa, inaczej RGB), a konwersje są takie
+same jak w image_cache. Siatki bloków mają kształt (kanały, wiersze, kolumny, 8, 8); analizatory
+DCT/DWT przechodzą je pasami, kanałami i partiami w tej samej kolejności co stream_*_statistics, więc
+cechy są identyczne z cechami skryptów i dzielą z nimi wpisy w magazynie cech.
+
+    python src/steganalysis/pipeline/run_pipeline.py --analyzers histograms chi_square dct_gray -j 4
+"""
+import os
+import sys
+import argparse
+import functools
+from functools import partial
+
+import numpy as np
+from PIL import Image
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import default_cache, has_alpha
+from steganalysis.common.histogram_kernel import channel_histograms, STORE_PARAMS as HISTOGRAM_PARAMS
+from steganalysis.common.streaming_stats import StreamingStats, DCT_RANGE, DWT_RANGE
+from steganalysis.common.strip_reader import STRIP_ROWS
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.feature_store import add_store_arguments, configure_store
+from steganalysis.common.instrumentation import add_trace_argument, configure_trace
+from steganalysis.common.pipeline import Intermediate, Analyzer, Pipeline
+from steganalysis.common.script_loader import load_script
+from steganalysis.common.jpeg_coefficients import JpegCoefficients, use_jpeg_coefficients, read_jpeg_coefficients, add_jpeg_argument, configure_jpeg
+
+BLOCK_SIZE = 8
+BATCH_BLOCKS = 4096
+WAVELET = "haar"
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['lsb', 'rgba', 'dct']
+
+@functools.cache
+def method_script(relative_path):
+    # Jądra metod (DCT, DWT, chi-kwadrat, RS, SPA) pochodzą ze skryptów, ładowanych dopiero gdy potrzebne
+    return load_script(relative_path)
+
+def decode_color(image_path):
+    image_path = os.path.abspath(image_path)
+    return default_cache.decode(image_path, "RGBA" if has_alpha(image_path) else "RGB")
+
+def rgb_from_color(image_path, color):
+    return np.ascontiguousarray(color[:, :, :3]) if color.shape[2] == 4 else color
+
+def gray_from_rgb(image_path, rgb):
+    return np.array(Image.fromarray(rgb).convert("L"))
+
+def histograms_of(image_path, image):
+    return channel_histograms(image)
+
+def block_grid(image_path, image, block_size=BLOCK_SIZE):
+    # (h, w) albo (h, w, c) -> (kanały, wiersze, kolumny, 8, 8); niepełne bloki na krawędziach są pomijane
+    channels = image[None] if image.ndim == 2 else np.moveaxis(image, 2, 0)
+    rows = image.shape[0] // block_size
+    cols = image.shape[1] // block_size
+    cropped = channels[:, :rows * block_size, :cols * block_size]
+    return np.ascontiguousarray(cropped.reshape(len(channels), rows, block_size, cols, block_size).swapaxes(2, 3))
+
+def dct_requirements(blocks_name, paths):
+    return ["jpeg_coefficients"] if use_jpeg_coefficients(*paths) else [blocks_name]
+
+def dct_grid(color_mode, image_path, source):
+    if isinstance(source, JpegCoefficients):
+        # Jak w stream_dct_statistics: składowe (Y albo Y, Cb, Cr) jedna po drugiej, każda jako jeden "pas" bloków
+        components = source.coefficients[:1] if color_mode == "L" else source.coefficients
+        return [coefficients[None] for coefficients in components]
+    transform_blocks = method_script(os.path.join("dct", "dct_analyze.py")).transform_blocks
+    return transform_blocks(source.reshape(-1, BLOCK_SIZE, BLOCK_SIZE)).reshape(source.shape)
+
+def strip_batches(grid, batch_blocks=BATCH_BLOCKS):
+    # Partie bloków w kolejności stream_dct_statistics/stream_dwt_statistics: pasy po STRIP_ROWS wierszy
+    # obrazu, w pasie kolejne kanały, w kanale partie po batch_blocks bloków. grid to siatki kanałów
+    # (wiersze, kolumny, 8, 8) - tablica (kanały, ...) albo lista, gdy kanały mają różne siatki
+    block_rows = STRIP_ROWS // BLOCK_SIZE
+    for row in range(0, max(len(channel) for channel in grid), block_rows):
+        for channel in grid:
+            blocks = channel[row:row+block_rows].reshape(-1, BLOCK_SIZE, BLOCK_SIZE)
+            for start in range(0, len(blocks), batch_blocks):
+                yield blocks[start:start+batch_blocks]
+
+INTERMEDIATES = [
+    Intermediate("color", decode_color, stage="decode"),
+    Intermediate("rgb", rgb_from_color, ["color"]),
+    Intermediate("gray", gray_from_rgb, ["rgb"]),
+    Intermediate("color_histograms", histograms_of, ["color"], stage="stats"),
+    Intermediate("gray_histogram", histograms_of, ["gray"], stage="stats"),
+    Intermediate("gray_blocks", block_grid, ["gray"]),
+    Intermediate("rgb_blocks", block_grid, ["rgb"]),
+    Intermediate("jpeg_coefficients", read_jpeg_coefficients, stage="decode"),
+    Intermediate("dct_gray", partial(dct_grid, "L"), partial(dct_requirements, "gray_blocks"), stage="transform"),
+    Intermediate("dct_rgb", partial(dct_grid, "RGB"), partial(dct_requirements, "rgb_blocks"), stage="transform"),
+]
+
+def image_histograms(inputs):
+    # Te same cechy co histogram_kernel.image_histograms
+    histograms = dict(zip(("R", "G", "B", "alpha"), inputs["color_histograms"]))
+    histograms["gray"] = inputs["gray_histogram"][0]
+    return histograms
+
+def chi_square_pair(original, stego):
+    # Te same cechy co chi_square_test.pair_histograms; różnice liczone pasami jak w histograms_from_files
+    difference_histogram = method_script(os.path.join("chi_square_method", "chi_square_test.py")).difference_histogram
+    difference = sum(difference_histogram(original["gray"][row:row+STRIP_ROWS], stego["gray"][row:row+STRIP_ROWS])
+                     for row in range(0, original["gray"].shape[0], STRIP_ROWS))
+    return {"original": original["gray_histogram"][0], "stego": stego["gray_histogram"][0], "difference": difference}
+
+def dct_stats(name, inputs):
+    accumulator = StreamingStats(DCT_RANGE)
+    for batch in strip_batches(inputs[name]):
+        accumulator.update(batch)
+    return accumulator.to_arrays()
+
+@functools.cache
+def dwt_buffer(wavelet_name):
+    # Falka i bufor pasm partii, wspólne dla kolejnych obrazów w procesie
+    dwt_analyze = method_script(os.path.join("dwt", "dwt_analyze.py"))
+    wavelet = dwt_analyze.pywt.Wavelet(wavelet_name)
+    return wavelet, dwt_analyze.subband_buffer(BATCH_BLOCKS, wavelet)
+
+def dwt_stats(name, inputs):
+    dwt_analyze = method_script(os.path.join("dwt", "dwt_analyze.py"))
+    accumulator = dwt_analyze.DwtAccumulator()
+    wavelet, buffer = dwt_buffer(WAVELET)
+    for batch in strip_batches(inputs[name]):
+        accumulator.update(dwt_analyze.transform_blocks(batch, wavelet, buffer[:len(batch)]))
+    return accumulator.to_arrays()
+
+def detector_rates(relative_path, rate_name, inputs):
+    rate = getattr(method_script(relative_path), rate_name)
+    color = inputs["color"]
+    names = ("R", "G", "B", "alpha")[:color.shape[2]]
+    return {name: rate(color[:, :, i]) for i, name in enumerate(names)}
+
+def pov_curves(inputs):
+    # Te same cechy co pov_chi_square.compute_pov_curves (color to RGBA dokładnie wtedy, gdy plik ma alfę)
+    pov_chi_square = method_script(os.path.join("chi_square_method", "pov_chi_square.py"))
+    return pov_chi_square.curves_from_image(inputs["color"], pov_chi_square.SAMPLE_POINTS)
+
+def script_params(relative_path, params_name, paths):
+    # Klucz cech skryptu metody (stała albo funkcja bez argumentów), ładowanego dopiero gdy potrzebny
+    params = getattr(method_script(relative_path), params_name)
+    return params() if callable(params) else params
+
+def coefficient_params(color_mode, value_range, **extra):
+    return {"color_mode": color_mode, **extra, "block_size": BLOCK_SIZE, "range": list(value_range)}
+
+def dct_params(color_mode, paths):
+    # Jak dct_analyze.dct_params - skwantowane współczynniki JPEG mają osobne wpisy; paths to wszystkie
+    # pliki przebiegu, więc oryginał i obrazy stego mają wpisy z tego samego źródła
+    params = coefficient_params(color_mode, DCT_RANGE)
+    if use_jpeg_coefficients(*paths):
+        params["source"] = "jpeg"
+    return params
+
+ANALYZERS = [
+    Analyzer("histograms", ["color_histograms", "gray_histogram"], image_histograms, params=HISTOGRAM_PARAMS),
+    Analyzer("chi_square", ["gray", "gray_histogram"], chi_square_pair, feature_name="chi_square_pair", pair=True,
+             params=partial(script_params, os.path.join("chi_square_method", "chi_square_test.py"), "STORE_PARAMS")),
+    Analyzer("dct_gray", ["dct_gray"], partial(dct_stats, "dct_gray"), feature_name="dct_stats",
+             params=partial(dct_params, "L")),
+    Analyzer("dct_rgb", ["dct_rgb"], partial(dct_stats, "dct_rgb"), feature_name="dct_stats",
+             params=partial(dct_params, "RGB")),
+    Analyzer("dwt_gray", ["gray_blocks"], partial(dwt_stats, "gray_blocks"), feature_name="dwt_stats",
+             params=coefficient_params("L", DWT_RANGE, wavelet=WAVELET)),
+    Analyzer("dwt_rgb", ["rgb_blocks"], partial(dwt_stats, "rgb_blocks"), feature_name="dwt_stats",
+             params=coefficient_params("RGB", DWT_RANGE, wavelet=WAVELET)),
+    Analyzer("rs", ["color"], partial(detector_rates, os.path.join("rs_method", "rs_analysis.py"), "rs_rate"),
+             feature_name="rs_rates", params=partial(script_params, os.path.join("rs_method", "rs_analysis.py"), "STORE_PARAMS")),
+    Analyzer("spa", ["color"], partial(detector_rates, os.path.join("spa_method", "sample_pairs_analysis.py"), "spa_rate"),
+             feature_name="spa_rates", params=partial(script_params, os.path.join("spa_method", "sample_pairs_analysis.py"), "STORE_PARAMS")),
+    Analyzer("pov", ["color"], pov_curves, feature_name="pov_curves",
+             params=partial(script_params, os.path.join("chi_square_method", "pov_chi_square.py"), "store_params")),
+]
+ANALYZER_NAMES = [analyzer.name for analyzer in ANALYZERS]
+DEFAULT_ANALYZERS = ["histograms", "chi_square", "dct_gray", "dct_rgb", "dwt_gray", "dwt_rgb"]
+
+def build_pipeline(names):
+    return Pipeline(INTERMEDIATES, [analyzer for analyzer in ANALYZERS if analyzer.name in names])
+
+def histogram_row(features, original):
+    if original is None:
+        return None
+    names = [name for name in ("B", "G", "R", "alpha", "gray") if name in features and name in original]
+    return "".join(f"{name}={int(np.abs(features[name] - original[name]).sum()):<12}" for name in names)
+
+def chi_square_row(features, original):
+    chi_square_from_histograms = method_script(os.path.join("chi_square_method", "chi_square_test.py")).chi_square_from_histograms
+    chi2, p = chi_square_from_histograms(features["original"], features["stego"])
+    return f"chi2={chi2:<14.4f}p={p:<12.4g}"
+
+def dct_row(features, original):
+    stats = StreamingStats.from_arrays(features)
+    return f"mean={stats.mean:<12.4f}std={stats.std_dev:<12.4f}"
+
+def dwt_row(features, original):
+    stats = StreamingStats.from_arrays(features, "total_")
+    return f"mean={stats.mean:<12.4f}std={stats.std_dev:<12.4f}"
+
+def rates_row(features, original):
+    return "".join(f"{name}={float(rate):<10.4f}" for name, rate in features.items())
+
+def pov_row(features, original):
+    return "".join(f"{name}={float(curve[-1]):<10.4f}" for name, curve in features.items() if name != "fractions")
+
+ROWS = {"histograms": histogram_row, "chi_square": chi_square_row, "dct_gray": dct_row, "dct_rgb": dct_row,
+        "dwt_gray": dwt_row, "dwt_rgb": dwt_row, "rs": rates_row, "spa": rates_row,
+        "pov": pov_row}
+
+def process_image(img, analyzers=DEFAULT_ANALYZERS):
+    img_name = img.split('.')[0]
+    variants = ['original']
+    paths = [os.path.join(original_images_dir, img)]
+    for method in methods:
+        stego_filename = os.path.join(images_dir, f"{method}_images", img)
+        if os.path.exists(stego_filename):
+            variants.append(method)
+            paths.append(stego_filename)
+        else:
+            print(f"Warning: Could not load stego image for {img} with method {method}.")
+
+    pipeline = build_pipeline(analyzers)
+    results = pipeline.run(paths)
+    for index, method in enumerate(variants):
+        for analyzer in pipeline.analyzers:
+            features = results.get((analyzer.name, index))
+            if features is None:
+                continue
+            if isinstance(features, Exception):
+                print(f"Warning: {analyzer.name} failed for {img} with method {method}: {features}")
+                continue
+            original = results.get((analyzer.name, 0))
+            row = ROWS[analyzer.name](features, None if index == 0 or isinstance(original, Exception) else original)
+            if row is not None:
+                print(f"{img_name:<20}{method:<10}{analyzer.name:<12}{row}")
+    return results
+
+def main(argv=None):
+    parser = add_jpeg_argument(add_store_arguments(add_trace_argument(add_jobs_argument(argparse.ArgumentParser()))))
+    parser.add_argument("--analyzers", nargs="+", choices=ANALYZER_NAMES, default=DEFAULT_ANALYZERS,
+                        help="analizatory uruchamiane we wspólnym przebiegu")
+    args = parser.parse_args(argv)
+    configure_store(args)
+    configure_trace(args)
+    configure_jpeg(args)
+    images = [img for img in os.listdir(original_images_dir) if img.endswith(('.png', '.jpg', '.jpeg'))]
+    run_batch(partial(process_image, analyzers=args.analyzers), images, jobs=args.jobs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Kaskada selekcji dla dużych strumieni obrazów: tanie testy najpierw, transformaty blokowe tylko dla
+obrazów podejrzanych.
+
+Etapy w kolejności kosztu (obraz, który przekroczy próg etapu, od razu przechodzi do analiz ciężkich,
+a obraz, który przejdzie wszystkie tanie etapy, kończy jako czysty bez liczenia DCT/DWT):
+
+    header  - anomalie nagłówka (sam odczyt nagłówka, bez dekodowania): rozszerzenie niezgodne z formatem,
+              dane dopisane za końcem strumienia obrazu, brak znacznika końca (liczba anomalii)
+    alpha   - tylko pliki z kanałem alfa: entropia LSB alfy wśród pikseli nasyconych (0/1, 254/255);
+              naturalna alfa ma tam LSB stały, osadzanie w alfie daje entropię bliską 1
+    pov     - atak chi-kwadrat par wartości na histogramach (bincount) prefiksów obrazu RGB
+
+Statystyki alfy i POV są liczone dla prefiksów o rosnących geometrycznie długościach (256, 512, ...
+pikseli w kolejności wierszowej, jak zapisują hide_data_lsb i hide_data_alpha), a wynikiem jest
+maksimum - krótka wiadomość na początku obrazu nie ginie w statystyce całego pliku, a koszt to nadal
+jeden przebieg bincount. Analizy ciężkie to analizatory run_pipeline (domyślnie DCT i DWT w skali
+szarości i RGB), z magazynem cech jak w potoku.
+
+Raport podaje dla każdego etapu liczbę obrazów, które do niego weszły, odsetek eskalowanych i czas,
+a na koniec szacowany czas zaoszczędzony (średni koszt analiz ciężkich razy liczba obrazów, które ich
+uniknęły). Przy korpusie z etykietami (manifest albo katalogi images/) także odsetek eskalowanych
+obrazów każdej metody - czułość kaskady - i okładek - koszt fałszywych eskalacji. Czasy analiz ciężkich
+mierzy się uczciwie tylko z --no-store.
+
+    python src/steganalysis/pipeline/triage_cascade.py --manifest corpus/manifest.csv --pov-threshold 0.2 -j 8
+    python src/steganalysis/pipeline/triage_cascade.py --input-dir /mnt/inbound --output triage.csv
+"""
+import os
+import sys
+import time
+import argparse
+import functools
+from functools import partial
+
+import numpy as np
+from PIL import Image
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import load_image, has_alpha
+from steganalysis.common.histogram_kernel import channel_histograms
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.feature_store import add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.jpeg_coefficients import add_jpeg_argument, configure_jpeg
+from steganalysis.common.script_loader import load_script
+from steganalysis.common.lazy_imports import lazy_module
+
+pd = lazy_module("pandas")
+
+STAGES = ("header", "alpha", "pov")
+THRESHOLDS = {"header": 1, "alpha": 0.5, "pov": 0.5}
+HEAVY_ANALYZERS = ["dct_gray", "dct_rgb", "dwt_gray", "dwt_rgb"]
+FIRST_PREFIX = 256
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+FORMAT_EXTENSIONS = {"PNG": (".png",), "JPEG": (".jpg", ".jpeg"), "BMP": (".bmp",), "TIFF": (".tif", ".tiff")}
+PNG_SIGNATURE_BYTES = 8
+TAIL_CHUNK_BYTES = 64 * 1024  # porcja czytana od końca pliku przy szukaniu EOI
+
+
+@functools.cache
+def script(relative_path):
+    # Skrypty metod ładowane raz na proces (także w procesach roboczych)
+    return load_script(relative_path)
+
+
+def png_trailing_bytes(file):
+    # Przejście po nagłówkach fragmentów PNG aż do IEND - dane fragmentów są przeskakiwane, nie czytane
+    file.seek(PNG_SIGNATURE_BYTES)
+    while True:
+        header = file.read(8)
+        if len(header) < 8:
+            return None
+        length = int.from_bytes(header[:4], "big")
+        file.seek(length + 4, os.SEEK_CUR)
+        if header[4:] == b"IEND":
+            end = file.tell()
+            return file.seek(0, os.SEEK_END) - end
+
+
+def jpeg_trailing_bytes(file, chunk_bytes=TAIL_CHUNK_BYTES):
+    # Ostatni znacznik EOI; dopisany za nim drugi plik JPEG też kończy się EOI i zostanie przeoczony.
+    # Szukamy od końca porcjami (z zakładką 1 bajtu na znacznik na granicy porcji) - w typowym pliku
+    # EOI jest w ostatniej porcji, więc reszta pliku nie jest czytana
+    size = file.seek(0, os.SEEK_END)
+    end = size
+    while end > 0:
+        start = max(0, end - chunk_bytes)
+        file.seek(start)
+        chunk = file.read(end - start + (1 if end < size else 0))
+        position = chunk.rfind(b"\xff\xd9")
+        if position >= 0:
+            return size - (start + position) - 2
+        end = start
+    return None
+
+
+def trailing_bytes(file_path, image_format):
+    # Bajty za końcem strumienia obrazu; None, gdy brak znacznika końca, 0 dla innych formatów
+    readers = {"PNG": png_trailing_bytes, "JPEG": jpeg_trailing_bytes}
+    if image_format not in readers:
+        return 0
+    with open(file_path, "rb") as file:
+        return readers[image_format](file)
+
+
+def header_anomalies(file_path):
+    # Image.open czyta tylko nagłówek - format bez dekodowania pikseli
+    with Image.open(file_path) as img:
+        image_format = img.format
+    anomalies = []
+    extension = os.path.splitext(file_path)[1].lower()
+    if image_format in FORMAT_EXTENSIONS and extension not in FORMAT_EXTENSIONS[image_format]:
+        anomalies.append("extension")
+    trailing = trailing_bytes(file_path, image_format)
+    if trailing is None:
+        anomalies.append("no_end_marker")
+    elif trailing > 0:
+        anomalies.append(f"trailing_data:{trailing}")
+    return anomalies
+
+
+def geometric_boundaries(count, first=FIRST_PREFIX):
+    # 0, first, 2*first, 4*first, ..., count - granice odcinków, których sumy skumulowane dają prefiksy
+    boundaries = [0]
+    length = first
+    while length < count:
+        boundaries.append(length)
+        length *= 2
+    boundaries.append(count)
+    return np.array(boundaries)
+
+
+def binary_entropy(probability):
+    p = np.clip(probability, 1e-12, 1 - 1e-12)
+    return -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+
+
+def alpha_score(alpha):
+    # Entropia LSB wśród pikseli nasyconych w prefiksach: piksel "odwrócony" to 1 albo 254
+    alpha = alpha.reshape(-1)
+    boundaries = geometric_boundaries(alpha.size)[:-1]
+    half = alpha >> 1
+    saturated = np.cumsum(np.add.reduceat(((half == 0) | (half == 127)).astype(np.int64), boundaries))
+    flipped = np.cumsum(np.add.reduceat(((alpha == 1) | (alpha == 254)).astype(np.int64), boundaries))
+    fraction = np.where(saturated > 0, flipped / np.maximum(saturated, 1), 0.0)
+    return float(binary_entropy(fraction).max())
+
+
+def pov_score(rgb):
+    # Największe prawdopodobieństwo osadzenia spośród prefiksów, dla R, G, B razem (kolejność hide_data_lsb)
+    pixels = rgb.reshape(-1, 1, 3)
+    boundaries = geometric_boundaries(len(pixels))
+    segments = np.stack([channel_histograms(pixels[p0:p1]).sum(axis=0) for p0, p1 in zip(boundaries[:-1], boundaries[1:])])
+    pov_probability = script(os.path.join("chi_square_method", "pov_chi_square.py")).pov_probability
+    return float(pov_probability(np.cumsum(segments, axis=0)).max())
+
+
+def cheap_scores(file_path):
+    # Generator (etap, wynik, opis) w kolejności kosztu; alpha tylko dla plików z kanałem alfa
+    anomalies = header_anomalies(file_path)
+    yield "header", len(anomalies), ";".join(anomalies)
+
+    alpha = has_alpha(file_path)
+    color = load_image(file_path, "RGBA" if alpha else "RGB")
+    if alpha:
+        with span("stats"):
+            score = alpha_score(color[:, :, 3])
+        yield "alpha", score, ""
+
+    with span("stats"):
+        score = pov_score(color[:, :, :3])
+    yield "pov", score, ""
+
+
+def run_heavy(file_path, analyzers):
+    run_pipeline = script(os.path.join("pipeline", "run_pipeline.py"))
+    pipeline = run_pipeline.build_pipeline(analyzers)
+    results = pipeline.run([file_path])
+    rows = {}
+    for analyzer in pipeline.analyzers:
+        features = results.get((analyzer.name, 0))
+        if isinstance(features, Exception):
+            raise features
+        rows[analyzer.name] = run_pipeline.ROWS[analyzer.name](features, None)
+    return rows
+
+
+def triage_image(file_path, label="unknown", thresholds=THRESHOLDS, analyzers=HEAVY_ANALYZERS):
+    img_name = os.path.splitext(os.path.basename(file_path))[0]
+    result = {"path": file_path, "method": label, "exit": "clean", "anomalies": ""}
+    result.update({stage: np.nan for stage in STAGES})
+    result.update({f"seconds_{stage}": 0.0 for stage in (*STAGES, "heavy")})
+
+    start = time.perf_counter()
+    try:
+        for stage, score, details in cheap_scores(file_path):
+            now = time.perf_counter()
+            result[f"seconds_{stage}"] = now - start
+            start = now
+            result[stage] = score
+            if details:
+                result["anomalies"] = details
+            if score >= thresholds[stage]:
+                result["exit"] = stage
+                break
+    except Exception as error:
+        print(f"Warning: Could not triage {file_path}: {error}")
+        result["exit"] = "error"
+        return result
+
+    if result["exit"] == "clean":
+        return result
+
+    start = time.perf_counter()
+    try:
+        rows = run_heavy(file_path, analyzers)
+    except Exception as error:
+        print(f"Warning: Heavy analyzers failed for {file_path}: {error}")
+        return result
+    result["seconds_heavy"] = time.perf_counter() - start
+    for name, row in rows.items():
+        print(f"{img_name:<20}{label:<10}{result['exit']:<8}{name:<12}{row}")
+    return result
+
+
+def triage_pair(item, thresholds=THRESHOLDS, analyzers=HEAVY_ANALYZERS):
+    file_path, label = item
+    return triage_image(file_path, label, thresholds, analyzers)
+
+
+def input_corpus(input_dir):
+    # Strumień bez etykiet: wszystkie obrazy katalogu (rekurencyjnie) jako "unknown"
+    paths = []
+    for root, _, files in os.walk(input_dir):
+        paths += [os.path.join(root, name) for name in files if name.lower().endswith(IMAGE_EXTENSIONS)]
+    return pd.DataFrame({"path": sorted(paths), "method": "unknown"})
+
+
+def stage_report(results):
+    # Etapy tanie: weszło, eskalowane, przeszło dalej; na końcu analizy ciężkie i zaoszczędzony czas
+    rows = []
+    for stage in STAGES:
+        entered = results[stage].notna()
+        escalated = (results["exit"] == stage)
+        count = int(entered.sum())
+        rows.append({
+            "stage": stage,
+            "entered": count,
+            "escalated": int(escalated.sum()),
+            "escalation_rate": escalated.sum() / count if count else np.nan,
+            "pass_through": (entered & ~escalated).sum() / count if count else np.nan,
+            "seconds": results[f"seconds_{stage}"].sum(),
+        })
+
+    heavy = results["seconds_heavy"] > 0
+    heavy_count = int(heavy.sum())
+    mean_heavy = results.loc[heavy, "seconds_heavy"].mean() if heavy_count else np.nan
+    skipped = int((results["exit"] == "clean").sum())
+    rows.append({
+        "stage": "heavy",
+        "entered": heavy_count,
+        "escalated": heavy_count,
+        "escalation_rate": heavy_count / len(results) if len(results) else np.nan,
+        "pass_through": np.nan,
+        "seconds": results["seconds_heavy"].sum(),
+    })
+    return pd.DataFrame(rows), mean_heavy * skipped, skipped
+
+
+def recall_report(results):
+    # Odsetek eskalowanych obrazów każdej etykiety (okładki: fałszywe eskalacje)
+    labeled = results[results["method"] != "unknown"]
+    if labeled.empty:
+        return None
+    escalated = ~labeled["exit"].isin(["clean", "error"])
+    return (escalated.groupby(labeled["method"]).agg(["size", "mean"])
+            .rename(columns={"size": "images", "mean": "escalated"}).reset_index())
+
+
+def print_reports(results):
+    report, saved, skipped = stage_report(results)
+    print(report.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+    cheap = sum(results[f"seconds_{stage}"].sum() for stage in STAGES)
+    total = cheap + results["seconds_heavy"].sum()
+    if np.isnan(saved):
+        print(f"Czas: {total:.2f} s; {skipped} obrazów bez analiz ciężkich, brak eskalacji do oszacowania ich kosztu")
+    else:
+        print(f"Czas: {total:.2f} s; {skipped} obrazów bez analiz ciężkich, zaoszczędzone ok. {saved:.2f} s "
+              f"({saved / (total + saved):.1%} pełnego przebiegu)")
+    errors = int((results["exit"] == "error").sum())
+    if errors:
+        print(f"Nieczytelne obrazy: {errors}")
+
+    recall = recall_report(results)
+    if recall is not None:
+        print(recall.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+
+
+def main(argv=None):
+    parser = add_jpeg_argument(add_store_arguments(add_trace_argument(add_jobs_argument(argparse.ArgumentParser()))))
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--manifest", default=None, help="manifest korpusu CSV (etykiety okładka/metoda)")
+    source.add_argument("--input-dir", default=None, help="katalog strumienia obrazów bez etykiet")
+    for stage in STAGES:
+        parser.add_argument(f"--{stage}-threshold", type=float, default=THRESHOLDS[stage],
+                            help=f"wynik etapu {stage}, od którego obraz idzie do analiz ciężkich")
+    run_pipeline = script(os.path.join("pipeline", "run_pipeline.py"))
+    parser.add_argument("--analyzers", nargs="+", choices=run_pipeline.ANALYZER_NAMES, default=HEAVY_ANALYZERS,
+                        help="analizy ciężkie dla obrazów eskalowanych")
+    parser.add_argument("--output", default="triage.csv", help="wyniki etapów dla każdego obrazu (CSV)")
+    args = parser.parse_args(argv)
+    configure_store(args)
+    configure_trace(args)
+    configure_jpeg(args)
+
+    pair_analyzers = [analyzer.name for analyzer in run_pipeline.ANALYZERS if analyzer.pair and analyzer.name in args.analyzers]
+    if pair_analyzers:
+        parser.error(f"analizy par nie działają w strumieniu bez oryginałów: {', '.join(pair_analyzers)}")
+
+    evaluate_detectors = script(os.path.join("evaluation", "evaluate_detectors.py"))
+    if args.input_dir:
+        corpus = input_corpus(args.input_dir)
+    elif args.manifest:
+        corpus = evaluate_detectors.manifest_corpus(args.manifest)
+    else:
+        corpus = evaluate_detectors.folder_corpus()
+
+    thresholds = {stage: getattr(args, f"{stage}_threshold") for stage in STAGES}
+    triage = partial(triage_pair, thresholds=thresholds, analyzers=args.analyzers)
+    results = pd.DataFrame(run_batch(triage, list(zip(corpus["path"], corpus["method"])), jobs=args.jobs))
+
+    print_reports(results)
+    results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
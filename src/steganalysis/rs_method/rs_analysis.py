@@ -0,0 +1,115 @@
+import os
+import sys
+import argparse
+from functools import partial
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import load_channels
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.feature_store import cached_features, add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+
+# Analiza RS (Fridrich, Goljan, Du): obraz dzielony jest na grupy 4 sąsiednich pikseli w wierszu,
+# na środkowe piksele grupy (maska [0, 1, 1, 0]) działa odwrócenie F1 (2k <-> 2k+1) albo F-1
+# (2k-1 <-> 2k), a grupa jest regularna (R) albo singularna (S), jeśli jej zmienność rośnie albo maleje.
+# Liczności R/S dla obrazu i dla obrazu z odwróconymi wszystkimi LSB dają równanie kwadratowe na
+# długość osadzonej wiadomości. Wszystkie grupy są przetwarzane naraz (tablice numpy, bez pętli).
+
+GROUP_SIZE = 4
+STORE_PARAMS = {"group_size": GROUP_SIZE, "mask": [0, 1, 1, 0]}  # klucz cech w magazynie
+
+def flip_positive(x):
+    # F1: 0<->1, 2<->3, ...
+    return x ^ 1
+
+def flip_negative(x):
+    # F-1: -1<->0, 1<->2, ...
+    return ((x + 1) ^ 1) - 1
+
+def pixel_groups(channel):
+    # (h, w) uint8 -> (4, grupy) int16: kolejne piksele grup jako ciągłe wiersze; ostatnie kolumny,
+    # które nie tworzą pełnej grupy, są pomijane
+    width = channel.shape[1] - channel.shape[1] % GROUP_SIZE
+    return np.ascontiguousarray(channel[:, :width].reshape(-1, GROUP_SIZE).T, dtype=np.int16)
+
+def variation(x0, x1, x2, x3):
+    return np.abs(x1 - x0) + np.abs(x2 - x1) + np.abs(x3 - x2)
+
+def rs_counts(groups):
+    # Udziały grup (R_M, S_M, R_-M, S_-M) dla maski [0, 1, 1, 0]
+    x0, x1, x2, x3 = groups
+    original = variation(x0, x1, x2, x3)
+
+    counts = []
+    for flip in (flip_positive, flip_negative):
+        flipped = variation(x0, flip(x1), flip(x2), x3)
+        counts += [np.count_nonzero(flipped > original), np.count_nonzero(flipped < original)]
+    return np.array(counts, dtype=np.float64) / max(groups.shape[1], 1)
+
+def rs_rate(channel):
+    # Szacowany ułamek pikseli kanału niosących wiadomość (0 - brak, 1 - pełne osadzenie w LSB)
+    groups = pixel_groups(channel)
+    if groups.shape[1] == 0:
+        return np.nan
+
+    r_m, s_m, r_neg, s_neg = rs_counts(groups)
+    r_m1, s_m1, r_neg1, s_neg1 = rs_counts(groups ^ 1)
+
+    d0, d1 = r_m - s_m, r_m1 - s_m1
+    d_neg0, d_neg1 = r_neg - s_neg, r_neg1 - s_neg1
+    a = 2 * (d1 + d0)
+    b = d_neg0 - d_neg1 - d1 - 3 * d0
+    c = d0 - d_neg0
+
+    if a == 0:
+        if b == 0:
+            return np.nan
+        x = -c / b
+    else:
+        roots = np.roots([a, b, c])
+        roots = roots[np.isreal(roots)].real
+        x = roots[np.argmin(np.abs(roots))] if roots.size else -b / (2 * a)
+
+    return float(np.clip(x / (x - 0.5), 0.0, 1.0))
+
+def compute_rates(image_path):
+    channels = load_channels(image_path)
+    if channels is None:
+        raise OSError(f"Nie można wczytać obrazu {image_path}")
+    with span("stats"):
+        return {name: rs_rate(channel) for name, channel in channels.items()}
+
+def estimate_rates(image_path):
+    # Szacunki z magazynu cech; None, gdy obrazu nie da się wczytać
+    try:
+        return cached_features([image_path], "rs_rates", STORE_PARAMS, partial(compute_rates, image_path))
+    except (OSError, ValueError):
+        return None
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['original', 'lsb', 'rgba', 'dct']
+
+def image_folder(method):
+    return original_images_dir if method == 'original' else os.path.join(images_dir, f"{method}_images")
+
+def process_image(img):
+    img_name = img.split('.')[0]
+    for method in methods:
+        rates = estimate_rates(os.path.join(image_folder(method), img))
+        if rates is None:
+            print(f"Warning: Could not load image {img} for method {method}.")
+            continue
+        row = "".join(f"{name}={rate:<10.4f}" for name, rate in rates.items())
+        print(f"{img_name:<20}{method:<10}{row}")
+
+if __name__ == "__main__":
+    args = add_store_arguments(add_trace_argument(add_jobs_argument(argparse.ArgumentParser()))).parse_args()
+    configure_store(args)
+    configure_trace(args)
+    images = [img for img in os.listdir(original_images_dir) if img.endswith(('.png', '.jpg', '.jpeg'))]
+    run_batch(process_image, images, jobs=args.jobs)
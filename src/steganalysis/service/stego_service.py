@@ -0,0 +1,371 @@
+"""
+Usługa steganalizy działająca w tle: rozgrzane procesy robocze i API HTTP na localhost albo gnieździe Unix.
+
+Każdy skrypt metody to nowy proces, który importuje cv2, scipy, pywt, pandas i matplotlib - dla
+pojedynczych podejrzanych obrazów start trwa dłużej niż sama analiza. Tutaj procesy robocze importują
+wszystko raz (warm_worker z batch_runner) i trzymają zbudowany potok analiz (common.pipeline) oraz bufory
+jąder metod, a żądania dostają tylko obliczenia.
+
+    POST /analyze  {"paths": ["a.png", ...]}  -> {"results": [werdykt, ...]}
+    POST /analyze  <bajty obrazu>              -> {"results": [werdykt]}
+    GET  /health                               -> liczniki kolejki i puli
+
+Obrazy czekają w ograniczonej kolejce; dyspozytor zbiera z niej partie (do --batch-size obrazów,
+czekając co najwyżej --batch-wait ms) i wysyła je do puli dopiero, gdy jest wolny proces - partie nie
+piętrzą się w puli, tylko w kolejce. Gdy kolejka jest pełna, żądanie od razu dostaje 503 z Retry-After
+(backpressure) zamiast czekać bez końca, a żądanie bez wyniku po REQUEST_TIMEOUT sekundach - 504.
+
+Gdy proces roboczy padnie (np. zabity przez brak pamięci), cała pula jest zepsuta: partie w toku dostają
+werdykt "error", a pula jest zastępowana nową. /health zwraca 503 ze stanem "broken", gdy nowej puli nie
+udało się uruchomić albo dyspozytor nie działa.
+
+Werdykt zawiera podsumowanie cech każdego analizatora i decyzję "stego"/"clean": obraz jest podejrzany,
+gdy któryś detektor (RS, SPA - szacowany ułamek osadzenia, POV - średnie prawdopodobieństwo osadzenia)
+przekracza swój próg. Cechy przechodzą przez magazyn cech, więc ponownie wysłany plik nie jest liczony.
+
+    python src/steganalysis/service/stego_service.py --port 8765 -j 4
+    curl -s localhost:8765/analyze -d '{"paths": ["images/lsb_images/man.png"]}'
+    curl -s localhost:8765/analyze --data-binary @podejrzany.jpg
+"""
+import os
+import sys
+import json
+import time
+import queue
+import tempfile
+import argparse
+import threading
+import socketserver
+from collections import Counter
+from functools import partial
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.batch_runner import warm_worker, resolve_jobs, add_jobs_argument
+from steganalysis.common.feature_store import add_store_arguments, configure_store
+from steganalysis.common.jpeg_coefficients import add_jpeg_argument, configure_jpeg
+from steganalysis.common.streaming_stats import StreamingStats
+from steganalysis.common.script_loader import load_script
+
+DEFAULT_ANALYZERS = ["histograms", "pov", "dct_gray", "dwt_gray", "rs", "spa"]
+THRESHOLDS = {"rs": 0.1, "spa": 0.1, "pov": 0.5}
+MAX_BODY_BYTES = 256 * 1024 * 1024
+REQUEST_TIMEOUT = 600
+
+worker_state = {}
+
+
+class Overloaded(Exception):
+    pass
+
+
+def warm_analyzers(analyzers):
+    # Inicjalizator procesu roboczego: potok i skrypty metod (z ich importami) ładowane raz
+    run_pipeline = load_script(os.path.join("pipeline", "run_pipeline.py"))
+    pipeline = run_pipeline.build_pipeline(analyzers)
+    for analyzer in pipeline.analyzers:
+        if analyzer.name.startswith("dwt"):
+            run_pipeline.dwt_buffer(run_pipeline.WAVELET)
+    for relative_path in ("dct/dct_analyze.py", "chi_square_method/pov_chi_square.py",
+                          "rs_method/rs_analysis.py", "spa_method/sample_pairs_analysis.py"):
+        run_pipeline.method_script(relative_path)
+    worker_state["pipeline"] = pipeline
+
+
+def summarize(name, features):
+    # Zwięzłe, serializowalne do JSON podsumowanie cech analizatora i wynik detektora (albo None)
+    if name == "histograms":
+        levels = np.arange(256)
+        summary = {}
+        for channel, counts in features.items():
+            total = max(int(counts.sum()), 1)
+            mean = float(levels @ counts / total)
+            summary[channel] = {"mean": mean, "std": float(np.sqrt(((levels - mean) ** 2) @ counts / total))}
+        return summary, None
+    if name in ("dct_gray", "dct_rgb", "dwt_gray", "dwt_rgb"):
+        stats = StreamingStats.from_arrays(features, "total_" if name.startswith("dwt") else "")
+        return {"count": int(stats.count), "mean": float(stats.mean), "std": float(stats.std_dev)}, None
+    if name in ("rs", "spa"):
+        rates = {channel: float(rate) for channel, rate in features.items()}
+        valid = [rate for rate in rates.values() if not np.isnan(rate)]
+        return {channel: None if np.isnan(rate) else rate for channel, rate in rates.items()}, max(valid, default=None)
+    if name == "pov":
+        curves = {channel: curve for channel, curve in features.items() if channel != "fractions"}
+        summary = {channel: {"final": float(curve[-1]), "mean": float(np.mean(curve))} for channel, curve in curves.items()}
+        return summary, max(item["mean"] for item in summary.values())
+    return {}, None
+
+
+def verdict(image_path, results, analyzers):
+    features, scores, errors = {}, {}, {}
+    for name in analyzers:
+        result = results.get((name, 0))
+        if isinstance(result, Exception):
+            errors[name] = str(result)
+            continue
+        features[name], score = summarize(name, result)
+        if score is not None:
+            scores[name] = score
+    if not features:
+        return {"path": image_path, "verdict": "error", "errors": errors}
+
+    detected = sorted(name for name, score in scores.items() if score >= THRESHOLDS[name])
+    return {"path": image_path, "verdict": "stego" if detected else "clean", "detected_by": detected,
+            "scores": scores, "features": features, "errors": errors}
+
+
+def analyze_batch(paths):
+    pipeline = worker_state["pipeline"]
+    names = [analyzer.name for analyzer in pipeline.analyzers]
+    return [verdict(path, pipeline.run([path]), names) for path in paths]
+
+
+def remove_spooled(path, future=None):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class Service:
+    def __init__(self, analyzers=DEFAULT_ANALYZERS, jobs=1, queue_size=64, batch_size=4, batch_wait=0.002):
+        self.jobs = resolve_jobs(jobs)
+        self.pending = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.slots = threading.BoundedSemaphore(self.jobs)  # partie w puli - najwyżej jedna na proces
+        self.lock = threading.Lock()
+        self.counters = Counter()
+        self.analyzers = list(analyzers)
+        self.pool_error = None  # błąd ostatniej nieudanej wymiany zepsutej puli
+        self.executor = self.new_executor()
+        # Rozgrzewka wszystkich procesów przed przyjęciem pierwszego żądania
+        list(self.executor.map(time.sleep, [0.01] * self.jobs))
+        self.dispatcher = threading.Thread(target=self.dispatch, daemon=True)
+        self.dispatcher.start()
+
+    def submit(self, paths):
+        # Future dla każdej ścieżki; całe żądanie jest odrzucane, gdy nie zmieści się w kolejce
+        futures = [Future() for _ in paths]
+        with self.lock:
+            if self.pending.qsize() + len(paths) > self.pending.maxsize:
+                self.counters["rejected"] += len(paths)
+                raise Overloaded(f"Kolejka pełna ({self.pending.qsize()}/{self.pending.maxsize})")
+            for path, future in zip(paths, futures):
+                self.pending.put_nowait((path, future))
+            self.counters["accepted"] += len(paths)
+        return futures
+
+    def new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.jobs, initializer=warm_worker,
+                                   initargs=(warm_analyzers, (self.analyzers,)))
+
+    def restart_pool(self, broken):
+        # Zepsutą pulę zastępuje nowa - raz, choć błąd dostaje każda partia, która była w toku
+        with self.lock:
+            if self.executor is not broken:
+                return
+            try:
+                self.executor = self.new_executor()
+            except Exception as error:
+                self.pool_error = str(error)
+                return
+            self.pool_error = None
+            self.counters["pool_restarts"] += 1
+        broken.shutdown(wait=False)
+
+    def submit_batch(self, paths):
+        # Zadanie puli dla partii. Pula zepsuta bez partii w toku (proces padł bezczynnie) jest wymieniana
+        # i zgłoszenie ponawiane raz; inne błędy trafiają do zadania, żeby dyspozytor działał dalej
+        for _ in range(2):
+            executor = self.executor
+            try:
+                return executor, executor.submit(analyze_batch, paths)
+            except BrokenProcessPool as error:
+                failure = error
+                self.restart_pool(executor)
+            except Exception as error:
+                failure = error
+                break
+        job = Future()
+        job.set_exception(failure)
+        return executor, job
+
+    def dispatch(self):
+        while True:
+            self.slots.acquire()
+            batch = [self.pending.get()]
+            if batch[0] is None:
+                self.slots.release()
+                return
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.pending.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.pending.put(None)
+                    break
+                batch.append(item)
+
+            with self.lock:
+                self.counters["in_flight"] += len(batch)
+                self.counters["batches"] += 1
+            executor, job = self.submit_batch([path for path, _ in batch])
+            job.add_done_callback(partial(self.finish, executor, batch))
+
+    def finish(self, executor, batch, job):
+        try:
+            results = job.result()
+        except Exception as error:
+            # Proces roboczy padł (np. brak pamięci) - błąd dostają wszystkie obrazy partii
+            results = [{"path": path, "verdict": "error", "errors": {"service": str(error)}} for path, _ in batch]
+            if isinstance(error, BrokenProcessPool):
+                self.restart_pool(executor)
+        with self.lock:
+            self.counters["in_flight"] -= len(batch)
+            self.counters["processed"] += len(batch)
+        self.slots.release()
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def health(self):
+        with self.lock:
+            healthy = self.pool_error is None and self.dispatcher.is_alive()
+            return {"status": "ok" if healthy else "broken", "pool_error": self.pool_error,
+                    "jobs": self.jobs, "queued": self.pending.qsize(), "queue_size": self.pending.maxsize,
+                    **{name: self.counters[name] for name in ("accepted", "rejected", "in_flight", "processed", "batches", "pool_restarts")}}
+
+    def close(self):
+        self.pending.put(None)
+        self.dispatcher.join()
+        self.executor.shutdown(wait=True)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    service = None
+    spool_dir = None
+
+    def send_json(self, status, payload, headers=()):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            health = self.service.health()
+            self.send_json(200 if health["status"] == "ok" else 503, health)
+        else:
+            self.send_json(404, {"error": f"Nieznany adres {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/analyze":
+            self.send_json(404, {"error": f"Nieznany adres {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self.send_json(413 if length > 0 else 400, {"error": f"Treść żądania: {length} bajtów"})
+            return
+        body = self.rfile.read(length)
+
+        spooled = None
+        futures = None
+        try:
+            if body.lstrip()[:1] == b"{":
+                request = json.loads(body)
+                paths = request["paths"]
+                # Napis też jest iterowalny - bez tej kontroli {"paths": "abc"} kolejkowałby pliki a, b i c
+                if not isinstance(paths, list) or not paths or not all(isinstance(path, str) for path in paths):
+                    raise ValueError('"paths" musi być niepustą listą napisów')
+                paths = [os.path.abspath(path) for path in paths]
+            else:
+                # Bajty obrazu trafiają do pliku tymczasowego - potok i magazyn cech działają na plikach
+                handle, spooled = tempfile.mkstemp(dir=self.spool_dir, suffix=".img")
+                with os.fdopen(handle, "wb") as file:
+                    file.write(body)
+                paths = [spooled]
+
+            futures = self.service.submit(paths)
+            results = [future.result(timeout=REQUEST_TIMEOUT) for future in futures]
+            if spooled:
+                results[0]["path"] = None
+            self.send_json(200, {"results": results})
+        except Overloaded as error:
+            self.send_json(503, {"error": str(error)}, headers=[("Retry-After", "1")])
+        except FutureTimeoutError:
+            self.send_json(504, {"error": f"Brak wyniku po {REQUEST_TIMEOUT} s"})
+        except (ValueError, KeyError, TypeError) as error:
+            self.send_json(400, {"error": f"Niepoprawne żądanie: {error}"})
+        finally:
+            if spooled and futures:
+                # Obraz może jeszcze czekać w kolejce (np. po 504) - plik jest usuwany dopiero po analizie
+                futures[0].add_done_callback(partial(remove_spooled, spooled))
+            elif spooled:
+                remove_spooled(spooled)
+
+    def log_message(self, format, *args):
+        # Bez adresu klienta - przy gnieździe Unix go nie ma
+        sys.stderr.write(f"[{self.log_date_time_string()}] {format % args}\n")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def make_server(service, host="127.0.0.1", port=8765, socket_path=None, spool_dir=None):
+    handler = type("ServiceHandler", (RequestHandler,), {"service": service, "spool_dir": spool_dir})
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = add_jpeg_argument(add_store_arguments(add_jobs_argument(argparse.ArgumentParser())))
+    run_pipeline = load_script(os.path.join("pipeline", "run_pipeline.py"))
+    parser.add_argument("--analyzers", nargs="+", choices=[name for name in run_pipeline.ANALYZER_NAMES if name != "chi_square"],
+                        default=DEFAULT_ANALYZERS, help="analizatory uruchamiane dla każdego obrazu")
+    address = parser.add_mutually_exclusive_group()
+    address.add_argument("--port", type=int, default=8765, help="port HTTP na 127.0.0.1")
+    address.add_argument("--socket", default=None, help="ścieżka gniazda Unix zamiast portu TCP")
+    parser.add_argument("--queue-size", type=int, default=64, help="najwięcej obrazów czekających w kolejce")
+    parser.add_argument("--batch-size", type=int, default=4, help="najwięcej obrazów w jednej partii dla procesu")
+    parser.add_argument("--batch-wait", type=float, default=2.0, help="ile ms czekać na dopełnienie partii")
+    parser.add_argument("--spool-dir", default=None, help="katalog plików tymczasowych dla przesłanych bajtów")
+    args = parser.parse_args(argv)
+    configure_store(args)
+    configure_jpeg(args)
+
+    service = Service(args.analyzers, args.jobs, args.queue_size, args.batch_size, args.batch_wait / 1000)
+    server = make_server(service, port=args.port, socket_path=args.socket, spool_dir=args.spool_dir)
+    where = args.socket or f"http://127.0.0.1:{args.port}"
+    print(f"Usługa steganalizy: {where} ({service.jobs} procesów, analizatory: {', '.join(args.analyzers)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
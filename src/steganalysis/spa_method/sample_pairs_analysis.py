@@ -0,0 +1,92 @@
+import os
+import sys
+import argparse
+from functools import partial
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import load_channels
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.feature_store import cached_features, add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+
+# Analiza par próbek (Sample Pairs Analysis; Dumitrescu, Wu, Wang): pary sąsiednich pikseli (u, v),
+# poziome i pionowe, dzielone są na zbiory
+#     X: v parzyste i u < v  albo  v nieparzyste i u > v
+#     Y: v parzyste i u > v  albo  v nieparzyste i u < v
+#     Z: u == v
+#     W: u i v różnią się tylko na LSB (podzbiór Y)
+# W naturalnym obrazie |X| ~ |Y|; osadzanie w LSB z częstością p zmienia te liczności tak, że p jest
+# mniejszym pierwiastkiem  (|W| + |Z|) / 2 * p^2 + (2|X| - |P|) * p + |Y| - |X| = 0.
+
+STORE_PARAMS = {"pairs": "horizontal+vertical"}  # klucz cech w magazynie
+
+def pair_counts(u, v):
+    # Liczności (X, Y, Z, W, P) dla par (u[i], v[i]) - jedna operacja na całej tablicy par
+    difference = u.astype(np.int16) - v.astype(np.int16)
+    # Dla parzystego v zmieniamy znak różnicy: wtedy X to pary z różnicą dodatnią, a Y - z ujemną
+    negate = (v & 1).astype(np.int16) - 1
+    signed = (difference ^ negate) - negate
+
+    x = np.count_nonzero(signed > 0)
+    y = np.count_nonzero(signed < 0)
+    z = u.size - x - y
+    w = np.count_nonzero((u ^ v) == 1)
+    return np.array([x, y, z, w, u.size], dtype=np.float64)
+
+def spa_rate(channel):
+    # Szacowany ułamek pikseli kanału niosących wiadomość (0 - brak, 1 - pełne osadzenie w LSB)
+    channel = np.ascontiguousarray(channel)
+    x, y, z, w, pairs = pair_counts(channel[:, :-1], channel[:, 1:]) + pair_counts(channel[:-1], channel[1:])
+    a = (w + z) / 2
+    b = 2 * x - pairs
+    c = y - x
+
+    if a == 0:
+        return float(np.clip(-c / b, 0.0, 1.0)) if b else np.nan
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return float(np.clip(-b / (2 * a), 0.0, 1.0))
+    roots = (-b + np.array([-1.0, 1.0]) * np.sqrt(discriminant)) / (2 * a)
+    return float(np.clip(roots.min(), 0.0, 1.0))
+
+def compute_rates(image_path):
+    channels = load_channels(image_path)
+    if channels is None:
+        raise OSError(f"Nie można wczytać obrazu {image_path}")
+    with span("stats"):
+        return {name: spa_rate(channel) for name, channel in channels.items()}
+
+def estimate_rates(image_path):
+    # Szacunki z magazynu cech; None, gdy obrazu nie da się wczytać
+    try:
+        return cached_features([image_path], "spa_rates", STORE_PARAMS, partial(compute_rates, image_path))
+    except (OSError, ValueError):
+        return None
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+images_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "..", "images"))
+original_images_dir = os.path.join(images_dir, "original_images")
+
+methods = ['original', 'lsb', 'rgba', 'dct']
+
+def image_folder(method):
+    return original_images_dir if method == 'original' else os.path.join(images_dir, f"{method}_images")
+
+def process_image(img):
+    img_name = img.split('.')[0]
+    for method in methods:
+        rates = estimate_rates(os.path.join(image_folder(method), img))
+        if rates is None:
+            print(f"Warning: Could not load image {img} for method {method}.")
+            continue
+        row = "".join(f"{name}={rate:<10.4f}" for name, rate in rates.items())
+        print(f"{img_name:<20}{method:<10}{row}")
+
+if __name__ == "__main__":
+    args = add_store_arguments(add_trace_argument(add_jobs_argument(argparse.ArgumentParser()))).parse_args()
+    configure_store(args)
+    configure_trace(args)
+    images = [img for img in os.listdir(original_images_dir) if img.endswith(('.png', '.jpg', '.jpeg'))]
+    run_batch(process_image, images, jobs=args.jobs)
@@ -0,0 +1,706 @@
+import os
+import sys
+import csv
+import argparse
+import hashlib
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from PIL import Image, ExifTags
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from steganalysis.common.image_cache import load_image, default_cache, has_alpha
+from steganalysis.common.batch_runner import run_batch, add_jobs_argument
+from steganalysis.common.histogram_kernel import channel_histograms
+from steganalysis.common.feature_store import cached_features, add_store_arguments, configure_store
+from steganalysis.common.instrumentation import span, add_trace_argument, configure_trace
+from steganalysis.common.lazy_imports import lazy_module
+
+pd = lazy_module("pandas")
+cv2 = lazy_module("cv2")
+
+def analyze_folder_file(file_name, folder_path):
+    file_path = os.path.join(folder_path, file_name)
+
+    if not os.path.isfile(file_path):
+        return None
+    try:
+        data = analyze_image(file_path)
+        width, height = data["Width"], data["Height"]
+        mode, format = data["Mode"], data["Format"]
+        file_size = data["File Size (Bytes)"]
+        histogram_mean, histogram_std = data["Histogram Mean"], data["Histogram Std Dev"]
+
+        row = {
+            "File Name": file_name,
+            "Width": width,
+            "Height": height,
+            "Mode": mode,
+            "Format": format,
+            "File Size (Bytes)": file_size,
+            "Histogram Mean": histogram_mean,
+            "Histogram Std Dev": histogram_std,
+            "EXIF Data": data["EXIF Data"]
+        }
+
+        exif_text = data["EXIF Text"]
+        latex = f"""
+            \section*{{Informacje o obrazie: {file_name}}}
+            \begin{{itemize}}
+                \item Wymiary: {width} x {height}
+                \item Tryb: {mode}
+                \item Format: {format}
+                \item Rozmiar pliku: {file_size} bajtów
+                \item Średnia jasności histogramu: {histogram_mean:.2f}
+                \item Odchylenie standardowe jasności: {histogram_std:.2f}
+                \item Metadane EXIF: {exif_text}
+            \end{{itemize}}
+            """
+        return row, latex
+    except Exception as e:
+        print(f"Error processing file {file_name}: {e}")
+
+    return None
+
+def analyze_images_in_folder(folder_path, output_csv_path, latex_output_path, jobs=1):
+    data = []
+    latex_content = []
+
+    file_names = os.listdir(folder_path)
+    results = run_batch(partial(analyze_folder_file, folder_path=folder_path), file_names, jobs=jobs)
+    for result in results:
+        if result is not None:
+            row, latex = result
+            data.append(row)
+            latex_content.append(latex)
+
+    df = pd.DataFrame(data)
+    df.to_csv(output_csv_path, index=False)
+
+    with open(latex_output_path, 'w', encoding='utf-8') as latex_file:
+        latex_file.write(r"\documentclass{article}\n\usepackage[utf8]{inputenc}\n\begin{document}\n")
+        latex_file.write(r"\section*{Raport analizy obrazów}\n")
+        latex_file.write(r"\n".join(latex_content))
+        latex_file.write(r"\n\end{document}")
+
+# Inwentaryzacja dużych archiwów: tylko nagłówki i EXIF, bez dekodowania pikseli. Średnia histogramu
+# to zawsze liczba pikseli / 256, więc wystarczą wymiary z nagłówka; odchylenie standardowe wymaga
+# dekodowania i jest liczone tylko na życzenie (--inventory-stats), dla JPEG opcjonalnie ze zmniejszonego
+# dekodowania w trybie draft (skalowanie 1/2-1/8 w dziedzinie DCT) - wtedy histogram jest przeskalowany
+# do liczby pikseli pełnego obrazu, a odchylenie jest przybliżeniem. Pliki są czytane w puli wątków
+# (czas idzie na opóźnienia I/O, np. NFS), a wiersze trafiają do CSV na bieżąco, w kolejności katalogów.
+INVENTORY_COLUMNS = ["File Name", "Width", "Height", "Mode", "Format", "File Size (Bytes)",
+                     "Histogram Mean", "Histogram Std Dev", "EXIF Data"]
+INVENTORY_STATS = ("none", "full", "draft")
+INVENTORY_THREADS = 32
+INVENTORY_DRAFT_SCALE = 8
+INVENTORY_PROGRESS = 10000  # co tyle wierszy komunikat na stderr
+
+def scan_images(folder_path):
+    # os.scandir rekurencyjnie: (ścieżka względna, ścieżka, rozmiar) bez osobnego getsize dla pliku
+    stack = [folder_path]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+        subdirectories = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_file():
+                yield os.path.relpath(entry.path, folder_path), entry.path, entry.stat().st_size
+        stack.extend(reversed(subdirectories))  # podkatalogi w kolejności alfabetycznej
+
+def gray_histogram_std(img, stats):
+    # Odchylenie standardowe histogramu skali szarości jak w image_info; draft tylko dla JPEG
+    width, height = img.size
+    if stats == "draft":
+        img.draft("L", (max(width // INVENTORY_DRAFT_SCALE, 1), max(height // INVENTORY_DRAFT_SCALE, 1)))
+    histogram = np.array(img.convert("L").histogram(), dtype=np.float64)
+    return np.std(histogram * (width * height / histogram.sum()))
+
+def inventory_row(item, stats="none"):
+    file_name, file_path, file_size = item
+    try:
+        with Image.open(file_path) as img:
+            width, height = img.size
+            # EXIF tylko z nagłówka (JPEG: segment APP1, PNG: fragment eXIf przed danymi obrazu) - PNG
+            # _getexif bez "exif" w info dekodowałby cały plik w poszukiwaniu eXIf za IDAT
+            exif = img._getexif() if hasattr(img, '_getexif') and "exif" in img.info else None
+            exif_data = {ExifTags.TAGS.get(tag, tag): value for tag, value in (exif or {}).items()}
+            row = {
+                "File Name": file_name,
+                "Width": width,
+                "Height": height,
+                "Mode": img.mode,
+                "Format": img.format,
+                "File Size (Bytes)": file_size,
+                "Histogram Mean": width * height / 256,
+                "Histogram Std Dev": gray_histogram_std(img, stats) if stats != "none" else "",
+                "EXIF Data": str(exif_data),
+            }
+    except Exception as e:
+        print(f"Error processing file {file_name}: {e}")
+        return None
+    return row
+
+def inventory_folder(folder_path, output_csv_path, stats="none", threads=INVENTORY_THREADS):
+    # Najwyżej threads * 4 plików w locie - lista plików i wiersze nie są trzymane w pamięci
+    written = 0
+    with open(output_csv_path, "w", newline="", encoding="utf-8") as csv_file, \
+            ThreadPoolExecutor(max_workers=threads) as executor:
+        writer = csv.DictWriter(csv_file, fieldnames=INVENTORY_COLUMNS)
+        writer.writeheader()
+        pending = deque()
+        for item in scan_images(folder_path):
+            pending.append(executor.submit(inventory_row, item, stats))
+            if len(pending) < threads * 4:
+                continue
+            written += write_inventory_row(writer, pending.popleft().result(), written)
+        while pending:
+            written += write_inventory_row(writer, pending.popleft().result(), written)
+    return written
+
+def write_inventory_row(writer, row, written):
+    if row is None:
+        return 0
+    writer.writerow(row)
+    if (written + 1) % INVENTORY_PROGRESS == 0:
+        print(f"Zinwentaryzowane pliki: {written + 1}", file=sys.stderr)
+    return 1
+
+def add_inventory_arguments(parser):
+    parser.add_argument("--inventory", nargs=2, metavar=("FOLDER", "OUTPUT_CSV"), default=None,
+                        help="szybka inwentaryzacja: tylko nagłówki i EXIF (rekurencyjnie), wiersze CSV na bieżąco")
+    parser.add_argument("--inventory-stats", choices=INVENTORY_STATS, default="none",
+                        help="odchylenie histogramu: none (bez dekodowania), full albo draft (JPEG zmniejszony)")
+    parser.add_argument("--inventory-threads", type=int, default=INVENTORY_THREADS,
+                        help="wątki czytające pliki")
+    return parser
+
+END_MARKER = '1111111111111110'  # Znacznik końca
+END_MARKER_BITS = np.array([int(bit) for bit in END_MARKER], dtype=np.uint8)
+
+# Zapis wiadomości to format(ord(char), '08b') dla kolejnych znaków, bez separatorów. Odczyt jest jednoznaczny
+# tylko dla dwóch rodzin wiadomości:
+#  - same znaki Latin-1 (U+0000..U+00FF): 8 bitów na znak, liczba bitów podzielna przez 8;
+#  - znaki ASCII (U+0000..U+007F) i U+0100..U+01FF (9 bitów, m.in. ą, ć, ę, ł, ń, ś, ź, ż), o ile liczba znaków
+#    9-bitowych nie dzieli się przez 8 - szerokość znaku wynika wtedy z jego pierwszego bitu.
+# W obu przypadkach bity wiadomości nie mogą zawierać znacznika końca (np. 'ÿþ').
+# Pozostałe wiadomości (np. z 'ó' = U+00F3 obok 'ś', albo ze znakami od U+0200) nie dają się odczytać;
+# message_to_bits ostrzega o nich przy osadzaniu, a bits_to_message zwraca wtedy surowe bity zamiast tekstu,
+# jeśli potrafi wykryć błąd.
+
+def message_to_bits(message):
+    # Bity wiadomości + znacznik końca, w tej samej kolejności co ''.join(format(ord(char), '08b') ...)
+    if all(ord(char) < 256 for char in message):
+        message_bits = np.unpackbits(np.frombuffer(message.encode('latin-1'), dtype=np.uint8))
+    else:
+        # Znaki spoza Latin-1 mają w formacie '08b' więcej niż 8 bitów - zachowujemy ten zapis
+        binary_message = ''.join(format(ord(char), '08b') for char in message)
+        message_bits = np.frombuffer(binary_message.encode('ascii'), dtype=np.uint8) - ord('0')
+    bits = np.concatenate([message_bits, END_MARKER_BITS])
+    decoded = bits_to_message(bits)
+    if not isinstance(decoded, str) or decoded != message:
+        warnings.warn(f"wiadomości {message!r} nie da się odczytać z obrazu (dozwolone: Latin-1 albo ASCII "
+                      f"ze znakami U+0100..U+01FF)", stacklevel=2)
+    return bits
+
+def find_end_marker(bits):
+    # Pierwsza pozycja, od której występuje 15 jedynek i zero (bez okna przesuwnego 16 x n)
+    marker_length = len(END_MARKER_BITS)
+    if bits.size < marker_length:
+        return -1
+    ones = np.concatenate([[0], np.cumsum(bits, dtype=np.int64)])
+    run = ones[marker_length-1:bits.size] - ones[:bits.size-marker_length+1]
+    candidates = np.flatnonzero((run == marker_length - 1) & (bits[marker_length-1:] == 0))
+    return int(candidates[0]) if candidates.size else -1
+
+def bits_to_message(bits):
+    bits = np.asarray(bits, dtype=np.uint8)
+    end = find_end_marker(bits)
+    if end < 0:
+        return None
+    message_bits = bits[:end]
+
+    if message_bits.size % 8 == 0:
+        return np.packbits(message_bits).tobytes().decode('latin-1')
+
+    # Wiadomość ze znakami spoza Latin-1 (np. 'ś' zapisane na 9 bitach): ASCII ma 8 bitów, pozostałe 9
+    binary_message = message_bits.tobytes().translate(bytes.maketrans(b'\x00\x01', b'01')).decode('ascii')
+    chars = []
+    index = 0
+    while index + 8 <= len(binary_message):
+        width = 8 if binary_message[index] == '0' else 9
+        chars.append(chr(int(binary_message[index:index+width], 2)))
+        index += width
+    if index != len(binary_message):
+        # Bity nie układają się w znaki 8/9-bitowe - wiadomość spoza odczytywalnych rodzin, oddajemy surowe bity
+        return message_bits
+    return ''.join(chars)
+
+def dct_matrix(block_size):
+    # Ortonormalna macierz DCT-II (ta sama transformata co cv2.dct): dct(B) = D @ B @ D.T
+    n = np.arange(block_size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * block_size)) * np.sqrt(2.0 / block_size)
+    matrix[0, :] = np.sqrt(1.0 / block_size)
+    return matrix
+
+def block_pixel_indices(block_indices, width, block_size):
+    # Współrzędne pikseli wybranych pełnych bloków (kolejność wierszowa) do odczytu/zapisu przez fancy indexing
+    cols = width // block_size
+    offsets = np.arange(block_size)
+    ys = (block_indices // cols)[:, None] * block_size + offsets
+    xs = (block_indices % cols)[:, None] * block_size + offsets
+    return ys[:, :, None], xs[:, None, :]
+
+def dct_capacity(shape, block_size=8):
+    return (shape[0] // block_size) * (shape[1] // block_size) * 3
+
+def hide_data_dct(image_path, output_path, message, block_size=8, max_attempts=8):
+    with span("decode"):
+        image = cv2.imread(image_path)  
+
+    embed_bits_dct(image, message_to_bits(message), block_size, max_attempts)
+
+    with span("save"):
+        cv2.imwrite(output_path, image)  
+
+def embed_bits_dct(image, bits, block_size=8, max_attempts=8):
+    # Osadza bity w tablicy BGR (h, w, 3+) w miejscu; nadmiarowe bity są obcinane do pojemności obrazu
+    (h, w, c) = image.shape
+    bits = bits[:dct_capacity(image.shape, block_size)]
+
+    # Jeden bit na kanał w kolejnych pełnych blokach - przetwarzamy tylko bloki potrzebne wiadomości
+    block_count = -(-bits.size // 3)
+    channel_bits = np.full(block_count * 3, -1, dtype=np.int8)
+    channel_bits[:bits.size] = bits
+    channel_bits = channel_bits.reshape(block_count, 3)
+
+    with span("transform"):
+        ys, xs = block_pixel_indices(np.arange(block_count), w, block_size)
+        blocks = image[ys, xs, :3].transpose(0, 3, 1, 2)  # (n, kanał, y, x)
+
+        matrix = dct_matrix(block_size)
+        dct_blocks = matrix @ blocks.astype(np.float64) @ matrix.T
+
+        target = dct_blocks[:, :, block_size-1, block_size-1]
+        base = target - np.mod(target, 2) + channel_bits
+        used = channel_bits >= 0
+        wrong = used
+
+        dc = dct_blocks[:, :, 0, 0]
+        towards_gray = np.where(dc < 128 * block_size, block_size, -block_size)
+
+        # Zaokrąglenie do uint8 (i obcięcie do 0..255) może zmienić parzystość współczynnika - dla takich
+        # kanałów przesuwamy współczynnik o +-2, +-4, ... (ta sama parzystość), a blok o 1 poziom jasności
+        # w stronę szarości, i sprawdzamy ponownie
+        for attempt in range(max_attempts):
+            offset = 2 * (attempt // 2 + 1) * (-1) ** attempt if attempt else 0
+            target[wrong] = base[wrong] + offset
+            if attempt:
+                dc[wrong] += towards_gray[wrong]
+
+            idct_blocks = matrix.T @ dct_blocks @ matrix
+            stego_blocks = np.clip(np.rint(idct_blocks), 0, 255).astype(np.uint8)
+            check = (matrix @ stego_blocks.astype(np.float64) @ matrix.T)[:, :, block_size-1, block_size-1]
+            wrong = used & (np.round(check).astype(np.int64) % 2 != channel_bits)
+            if not wrong.any():
+                break
+
+    if wrong.any():
+        warnings.warn(f"po {max_attempts} próbach parzystość współczynnika DCT jest błędna w "
+                      f"{int(wrong.any(axis=1).sum())} z {block_count} bloków ({int(wrong.sum())} bitów)",
+                      stacklevel=2)
+
+    # Kanały bez bitu (ostatni blok, gdy długość wiadomości nie dzieli się przez 3) zostają bez zmian
+    stego_blocks[~used] = blocks[~used]
+
+    image[ys, xs, :3] = stego_blocks.transpose(0, 2, 3, 1)
+    return image
+
+def extract_data_dct(image_path, block_size=8, chunk_blocks=1024):
+    with span("decode"):
+        image = cv2.imread(image_path)
+    (h, w, c) = image.shape
+
+    total_blocks = (h // block_size) * (w // block_size)
+    matrix = dct_matrix(block_size)
+    chunks = []
+    tail = np.empty(0, dtype=np.uint8)
+
+    # Czytamy bloki porcjami i kończymy po znalezieniu znacznika końca (szukamy go tylko w nowej porcji)
+    for start in range(0, total_blocks, chunk_blocks):
+        ys, xs = block_pixel_indices(np.arange(start, min(start + chunk_blocks, total_blocks)), w, block_size)
+        blocks = image[ys, xs, :3].transpose(0, 3, 1, 2).astype(np.float64)
+        target = (matrix @ blocks @ matrix.T)[:, :, block_size-1, block_size-1]
+        chunk_bits = (np.round(target).astype(np.int64) % 2).astype(np.uint8).reshape(-1)
+        chunks.append(chunk_bits)
+
+        window = np.concatenate([tail, chunk_bits])
+        if find_end_marker(window) >= 0:
+            break
+        tail = window[-(len(END_MARKER_BITS) - 1):]
+
+    return bits_to_message(np.concatenate(chunks) if chunks else tail)
+
+def hide_data_alpha(image_path, output_path, message):
+    with span("decode"):
+        image = Image.open(image_path).convert("RGBA")
+        image_array = np.array(image)
+
+    embed_bits_alpha(image_array, message_to_bits(message))
+
+    with span("save"):
+        image.frombytes(image_array.tobytes())
+        image.save(output_path)
+
+def embed_bits_alpha(image_array, bits):
+    # Tablica RGBA (h, w, 4), modyfikowana w miejscu
+    alpha = image_array.reshape(-1, 4)[:, 3]  # widok płaszczyzny alfa, piksele w kolejności wierszowej
+    bits = bits[:alpha.size]
+    alpha[:bits.size] = (alpha[:bits.size] & 0xFE) | bits  # Modyfikujemy LSB kanału alfa
+    return image_array
+
+def extract_data_alpha(image_path):
+    with span("decode"):
+        image = Image.open(image_path).convert("RGBA")
+        image_array = np.array(image)
+
+    bits = image_array.reshape(-1, 4)[:, 3] & 1
+    return bits_to_message(bits)
+
+from PIL import Image
+
+def lsb_indices(image_array, count):
+    # Indeksy w spłaszczonej tablicy: piksel po pikselu, w każdym kanały 0..2 (jak w pętli po pixels[x, y])
+    channels = image_array.shape[2]
+    k = np.arange(count, dtype=np.int64)
+    return (k // 3) * channels + k % 3
+
+def hide_data_lsb(image_path, output_path, message):
+    with span("decode"):
+        image = Image.open(image_path)
+        image_array = np.array(image)
+
+    embed_bits_lsb(image_array, message_to_bits(message))
+
+    with span("save"):
+        image.frombytes(image_array.tobytes())
+        image.save(output_path)
+
+def embed_bits_lsb(image_array, bits):
+    # Tablica (h, w, 3+) modyfikowana w miejscu; kanał alfa (jeśli jest) zostaje bez zmian
+    bits = bits[:image_array.shape[0] * image_array.shape[1] * 3]
+    flat = image_array.reshape(-1)
+    indices = lsb_indices(image_array, bits.size)
+    flat[indices] = (flat[indices] & 0xFE) | bits
+    return image_array
+
+def extract_data_lsb(image_path):
+    with span("decode"):
+        image = Image.open(image_path)
+        image_array = np.array(image)
+
+    bits = image_array[:, :, :3].reshape(-1) & 1
+    return bits_to_message(bits)
+
+
+def hide_messages_in_file(file_name, input_folder, output_folder_dct, output_folder_alpha, output_folder_lsb, message):
+    file_path = os.path.join(input_folder, file_name)
+
+    if not os.path.isfile(file_path):
+        return
+    try:
+        base_name = os.path.splitext(file_name)[0]
+        dct_output_path = os.path.join(output_folder_dct, f"{base_name}.png")
+        alpha_output_path = os.path.join(output_folder_alpha, f"{base_name}.png")
+        lsb_output_path = os.path.join(output_folder_lsb, f"{base_name}.png")
+
+        hide_data_dct(file_path, dct_output_path, message)
+
+        hide_data_alpha(file_path, alpha_output_path, message)
+
+        hide_data_lsb(file_path, lsb_output_path, message)
+
+    except Exception as e:
+        print(f"Error processing file {file_name}: {e}")
+
+def hide_messages_in_folder(input_folder, output_folder_dct, output_folder_alpha, output_folder_lsb, message, jobs=1):
+    hide = partial(hide_messages_in_file, input_folder=input_folder, output_folder_dct=output_folder_dct,
+                   output_folder_alpha=output_folder_alpha, output_folder_lsb=output_folder_lsb, message=message)
+    run_batch(hide, os.listdir(input_folder), jobs=jobs)
+
+# Korpus treningowy: każda okładka jest dekodowana raz, a warianty (metoda x gęstość osadzania w bitach na
+# piksel) powstają z kopii tej samej tablicy. Ładunek to losowe bity + znacznik końca, z ziarnem wyznaczonym
+# z (ziarno bazowe, plik, metoda, gęstość) - wynik nie zależy od liczby procesów ani kolejności plików.
+# Warianty, których ładunek nie mieści się w pojemności metody (DCT: 3 bity na blok 8x8, ok. 0.047 bpp), są
+# pomijane; przy pełnym wykorzystaniu pojemności znacznik końca jest obcinany jak w hide_data_*.
+CORPUS_METHODS = ("dct", "alpha", "lsb")
+CORPUS_RATES = (0.01, 0.05, 0.1, 0.2, 0.5, 1.0)
+CORPUS_PNG_COMPRESSION = 1  # szybki zapis, pliki nieco większe
+
+def variant_seed(seed, file_name, method, rate):
+    key = f"{seed}:{file_name}:{method}:{rate!r}".encode("utf-8")
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "little")
+
+def corpus_cover(color, method):
+    # Kopia okładki w układzie, na którym działa metoda (jak cv2.imread / convert("RGBA") / np.array)
+    if method == "dct":
+        return np.ascontiguousarray(color[:, :, 2::-1])
+    if method == "alpha" and color.shape[2] == 3:
+        return np.dstack([color, np.full(color.shape[:2], 255, dtype=np.uint8)])
+    return color.copy()
+
+def corpus_capacity(shape, method):
+    if method == "dct":
+        return dct_capacity(shape)
+    return shape[0] * shape[1] * (1 if method == "alpha" else 3)
+
+def save_corpus_image(output_path, image_array, bgr=False):
+    if not bgr:
+        image_array = cv2.cvtColor(image_array, cv2.COLOR_RGBA2BGRA if image_array.shape[2] == 4 else cv2.COLOR_RGB2BGR)
+    with span("save"):
+        if not cv2.imwrite(output_path, image_array, [cv2.IMWRITE_PNG_COMPRESSION, CORPUS_PNG_COMPRESSION]):
+            raise OSError(f"Nie udało się zapisać {output_path}")
+
+def generate_corpus_file(file_name, input_folder, output_folder, methods, rates, seed):
+    file_path = os.path.join(input_folder, file_name)
+    if not os.path.isfile(file_path):
+        return []
+    try:
+        color = default_cache.decode(file_path, "RGBA" if has_alpha(file_path) else "RGB")
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        print(f"Error processing file {file_name}: {e}")
+        return []
+
+    base_name = os.path.splitext(file_name)[0]
+    pixels = color.shape[0] * color.shape[1]
+    embed = {"dct": embed_bits_dct, "alpha": embed_bits_alpha, "lsb": embed_bits_lsb}
+    rows = []
+    for method in methods:
+        capacity = corpus_capacity(color.shape, method)
+        for rate in rates:
+            payload_bits = int(round(rate * pixels))
+            if payload_bits > capacity:
+                print(f"Pomijam {file_name} {method} {rate:g} bpp: {payload_bits} bitów > pojemność {capacity}")
+                continue
+
+            stego_seed = variant_seed(seed, file_name, method, rate)
+            payload = np.random.default_rng(stego_seed).integers(0, 2, payload_bits, dtype=np.uint8)
+            output_path = os.path.join(output_folder, method, f"{rate:g}", f"{base_name}.png")
+            try:
+                with span("transform"):
+                    stego = embed[method](corpus_cover(color, method), np.concatenate([payload, END_MARKER_BITS]))
+                save_corpus_image(output_path, stego, bgr=method == "dct")
+            except Exception as e:
+                print(f"Error processing file {file_name} ({method}, {rate:g} bpp): {e}")
+                continue
+
+            rows.append({
+                "cover": file_path,
+                "stego": output_path,
+                "method": method,
+                "rate_bpp": rate,
+                "payload_bits": payload_bits,
+                "seed": stego_seed,
+                "payload_sha256": hashlib.sha256(np.packbits(payload).tobytes()).hexdigest(),
+            })
+    return rows
+
+def generate_corpus(input_folder, output_folder, methods=CORPUS_METHODS, rates=CORPUS_RATES, seed=0, jobs=1,
+                    manifest_path=None):
+    for method in methods:
+        for rate in rates:
+            os.makedirs(os.path.join(output_folder, method, f"{rate:g}"), exist_ok=True)
+
+    generate = partial(generate_corpus_file, input_folder=input_folder, output_folder=output_folder,
+                       methods=methods, rates=rates, seed=seed)
+    rows = [row for file_rows in run_batch(generate, sorted(os.listdir(input_folder)), jobs=jobs) for row in file_rows]
+
+    manifest_path = manifest_path or os.path.join(output_folder, "manifest.csv")
+    pd.DataFrame(rows, columns=["cover", "stego", "method", "rate_bpp", "payload_bits", "seed",
+                                "payload_sha256"]).to_csv(manifest_path, index=False)
+    print(f"Zapisano {len(rows)} obrazów stego, manifest: {manifest_path}")
+    return rows
+
+def add_corpus_arguments(parser):
+    parser.add_argument("--corpus", nargs=2, metavar=("INPUT", "OUTPUT"), default=None,
+                        help="tryb korpusu: osadź losowe ładunki w każdej okładce z INPUT i zapisz do OUTPUT")
+    parser.add_argument("--methods", nargs="+", choices=CORPUS_METHODS, default=list(CORPUS_METHODS),
+                        help="metody osadzania w trybie korpusu")
+    parser.add_argument("--rates", nargs="+", type=float, default=list(CORPUS_RATES),
+                        help="gęstości osadzania w bitach na piksel (bpp)")
+    parser.add_argument("--seed", type=int, default=0, help="ziarno bazowe ładunków")
+    parser.add_argument("--manifest", default=None, help="ścieżka manifestu CSV (domyślnie OUTPUT/manifest.csv)")
+    return parser
+
+def image_info(file_path):
+    # Cechy raportu jako liczby i napisy - tak trafiają do magazynu cech
+    with Image.open(file_path) as img:
+        file_size = os.path.getsize(file_path) 
+        width, height = img.size 
+        mode = img.mode 
+        format = img.format
+        grayscale_array = load_image(file_path, "L")  # dekodowanie współdzielone z innymi analizami
+        histogram = channel_histograms(grayscale_array)[0]
+
+        exif_data = {}
+        if hasattr(img, '_getexif') and img._getexif() is not None:
+            for tag, value in img._getexif().items():
+                tag_name = ExifTags.TAGS.get(tag, tag)
+                exif_data[tag_name] = value
+
+        exif_text = ', '.join([f"{key}: {value}" for key, value in exif_data.items()]) if exif_data else "Brak metadanych EXIF"
+        return {
+            "file_size": file_size,
+            "width": width,
+            "height": height,
+            "mode": mode,
+            "format": format or "",
+            "histogram_mean": np.mean(histogram),
+            "histogram_std": np.std(histogram),
+            "exif": str(exif_data),  # w CSV słownik EXIF i tak jest zapisywany jako str(dict)
+            "exif_text": exif_text,
+        }
+
+def analyze_image(file_path):
+    info = cached_features([file_path], "image_info", {}, partial(image_info, file_path))
+    return {
+        "File Size (Bytes)": info["file_size"],
+        "Width": info["width"],
+        "Height": info["height"],
+        "Mode": info["mode"],
+        "Format": info["format"] or None,
+        "Histogram Mean": info["histogram_mean"],
+        "Histogram Std Dev": info["histogram_std"],
+        "EXIF Data": info["exif"],
+        "EXIF Text": info["exif_text"]
+    }
+
+def compare_file(file_name, input_folder, output_folder_dct, output_folder_alpha, output_folder_lsb):
+    file_path = os.path.join(input_folder, file_name)
+
+    if not os.path.isfile(file_path):
+        return None
+    
+    try:
+        base_name = os.path.splitext(file_name)[0]
+    
+        original_data = analyze_image(file_path)
+        dct_image_path = os.path.join(output_folder_dct, f"{base_name}.png")
+        alpha_image_path = os.path.join(output_folder_alpha, f"{base_name}.png")
+        lsb_image_path = os.path.join(output_folder_lsb, f"{base_name}.png")
+        
+        dct_data = analyze_image(dct_image_path)
+        alpha_data = analyze_image(alpha_image_path)
+        lsb_data = analyze_image(lsb_image_path)
+
+        row = {
+            "File Name": file_name,
+            "Original File Size (Bytes)": original_data["File Size (Bytes)"],
+            "DCT File Size (Bytes)": dct_data["File Size (Bytes)"],
+            "Alpha File Size (Bytes)": alpha_data["File Size (Bytes)"],
+            "LSB File Size (Bytes)": lsb_data["File Size (Bytes)"],
+            "Original Histogram Mean": original_data["Histogram Mean"],
+            "DCT Histogram Mean": dct_data["Histogram Mean"],
+            "Alpha Histogram Mean": alpha_data["Histogram Mean"],
+            "LSB Histogram Mean": lsb_data["Histogram Mean"],
+            "Original Histogram Std Dev": original_data["Histogram Std Dev"],
+            "DCT Histogram Std Dev": dct_data["Histogram Std Dev"],
+            "Alpha Histogram Std Dev": alpha_data["Histogram Std Dev"],
+            "LSB Histogram Std Dev": lsb_data["Histogram Std Dev"],
+        }
+
+        latex = f"""
+        \section*{{Porównanie obrazu: {file_name}}}
+        \begin{{tabular}}{{|c|c|c|c|c|}}
+            \hline
+            \textbf{{Parametr}} & \textbf{{Przed}} & \textbf{{DCT}} & \textbf{{Alpha}} & \textbf{{LSB}} \\
+            \hline
+            Rozmiar pliku (B) & {original_data['File Size (Bytes)']} & {dct_data['File Size (Bytes)']} & {alpha_data['File Size (Bytes)']} & {lsb_data['File Size (Bytes)']} \\
+            Średnia histogramu & {original_data['Histogram Mean']:.2f} & {dct_data['Histogram Mean']:.2f} & {alpha_data['Histogram Mean']:.2f} & {lsb_data['Histogram Mean']:.2f} \\
+            Odchylenie std. histogramu & {original_data['Histogram Std Dev']:.2f} & {dct_data['Histogram Std Dev']:.2f} & {alpha_data['Histogram Std Dev']:.2f} & {lsb_data['Histogram Std Dev']:.2f} \\
+            \hline
+        \end{{tabular}}
+        """
+        return row, latex
+    except Exception as e:
+        print(f"Error processing file {file_name}: {e}")
+
+    return None
+
+def analyze_and_compare_images(input_folder, output_folder_dct, output_folder_alpha, output_folder_lsb, output_comparison_csv_path, output_comparison_latex_path, jobs=1):
+    data = []
+    latex_content = []
+
+    compare = partial(compare_file, input_folder=input_folder, output_folder_dct=output_folder_dct,
+                      output_folder_alpha=output_folder_alpha, output_folder_lsb=output_folder_lsb)
+    for result in run_batch(compare, os.listdir(input_folder), jobs=jobs):
+        if result is not None:
+            row, latex = result
+            data.append(row)
+            latex_content.append(latex)
+
+    df = pd.DataFrame(data)
+    df.to_csv(output_comparison_csv_path, index=False)
+
+    with open(output_comparison_latex_path, 'w', encoding='utf-8') as latex_file:
+        latex_file.write(r"\documentclass{article}\n\usepackage[utf8]{inputenc}\n\begin{document}\n")
+        latex_file.write(r"\section*{Raport porównania obrazów przed i po ukryciu wiadomości}\n")
+        latex_file.write(r"\n".join(latex_content))
+        latex_file.write(r"\n\end{document}")
+
+
+DEFAULT_INPUT_FOLDER = r"C:\Users\hgolebio\OneDrive - Eltel Group Corporation\Documents\VSCode\Mouse\KRYS"
+
+def add_folder_arguments(parser):
+    parser.add_argument("--input", default=DEFAULT_INPUT_FOLDER, help="katalog okładek")
+    parser.add_argument("--dct-output", default=os.path.join(DEFAULT_INPUT_FOLDER, "KRYS DCT"), help="katalog obrazów DCT")
+    parser.add_argument("--alpha-output", default=os.path.join(DEFAULT_INPUT_FOLDER, "KRYS RGBA"), help="katalog obrazów alfa")
+    parser.add_argument("--lsb-output", default=os.path.join(DEFAULT_INPUT_FOLDER, "KRYS LSB"), help="katalog obrazów LSB")
+    parser.add_argument("--message", default="To jest tajna wiadomość.", help="ukrywana wiadomość")
+    return parser
+
+
+if __name__ == "__main__":
+    parser = add_corpus_arguments(add_store_arguments(add_trace_argument(add_jobs_argument(argparse.ArgumentParser()))))
+    args = add_inventory_arguments(add_folder_arguments(parser)).parse_args()
+    configure_store(args)
+    configure_trace(args)
+    jobs = args.jobs
+
+    if args.inventory:
+        inventory_folder(*args.inventory, stats=args.inventory_stats, threads=args.inventory_threads)
+        sys.exit(0)
+
+    if args.corpus:
+        generate_corpus(*args.corpus, methods=args.methods, rates=args.rates, seed=args.seed, jobs=jobs,
+                        manifest_path=args.manifest)
+        sys.exit(0)
+
+    input_folder = args.input
+    output_folder_dct = args.dct_output
+    output_folder_alpha = args.alpha_output
+    output_folder_lsb = args.lsb_output
+    message = args.message
+
+    # Analiza obrazów
+
+    output_csv_path = "image_analysis_report.csv"
+    latex_output_path = "image_analysis_report.tex"
+    analyze_images_in_folder(input_folder, output_csv_path, latex_output_path, jobs=jobs)
+
+
+    # Ukrywanie obrazow (pomijane przy --from-store: raporty są odtwarzane z magazynu cech)
+    if not args.from_store:
+        hide_messages_in_folder(input_folder, output_folder_dct, output_folder_alpha, output_folder_lsb, message, jobs=jobs)
+
+    # Analiza ukrytych obrazow i porownanie - tabela latex 
+
+    output_comparison_csv_path = "image_comperation_analysis_report.csv"
+    output_comparison_latex_path = "image_comperation_analysis_report.tex"
+    analyze_and_compare_images(input_folder, output_folder_dct, output_folder_alpha, output_folder_lsb, output_comparison_csv_path, output_comparison_latex_path, jobs=jobs)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testy działają na drzewie źródeł bez instalacji pakietu
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
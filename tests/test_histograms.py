@@ -0,0 +1,33 @@
+"""
+calculate_histogram skryptów histogramów i testu chi-kwadrat: jeden histogram wszystkich kanałów,
+ten sam co np.histogram(image.flatten(), bins=256, range=[0, 256]) dla obrazu o dowolnej liczbie wymiarów.
+"""
+import numpy as np
+import pytest
+
+from steganalysis.common.script_loader import load_script
+
+SCRIPTS = ["histogram_method/1_channel.py", "histogram_method/3_channel.py", "chi_square_method/chi_square_test.py"]
+
+
+def reference_histogram(image):
+    histogram, _ = np.histogram(image.flatten(), bins=256, range=[0, 256])
+    return histogram
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+@pytest.mark.parametrize("shape", [(37, 41), (37, 41, 3), (37, 41, 4)])
+def test_calculate_histogram_counts_every_channel(script, shape):
+    image = np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+    np.testing.assert_array_equal(load_script(script).calculate_histogram(image), reference_histogram(image))
+
+
+def test_chi_square_detects_changes_outside_channel_zero():
+    chi_square_test = load_script("chi_square_method/chi_square_test.py")
+    original = np.random.default_rng(1).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    stego = original.copy()
+    stego[:, :, 1:] //= 2  # kanały G i R (BGR), kanał 0 bez zmian
+
+    chi2, p = chi_square_test.perform_chi_square_test(original, stego)
+    assert chi2 > 0
+    assert p < 0.05
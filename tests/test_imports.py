@@ -0,0 +1,53 @@
+"""
+Import pakietu steganalysis i każdego podsystemu nie może ładować ciężkich zależności.
+
+Każdy cel jest importowany w świeżym interpreterze (sys.modules bieżącego procesu pytest jest już
+zanieczyszczony). Ten sam warunek co w src/benchmarks/import_time.py, bez pomiaru czasu.
+"""
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, SRC_DIR)
+from steganalysis import SCRIPTS
+
+HEAVY_MODULES = ("matplotlib", "pandas", "scipy", "pywt", "cv2")
+
+CHECK = """
+import sys, json
+path = list(sys.path)
+import steganalysis
+{access}
+print(json.dumps({{"heavy": [m for m in {heavy!r} if m in sys.modules],
+                  "top_level": sorted({{m.split(".")[0] for m in sys.modules}}),
+                  "path_changed": sys.path != path}}))
+"""
+
+
+def imported_modules(target):
+    access = f"steganalysis.{target}" if target != "steganalysis" else ""
+    code = CHECK.format(access=access, heavy=HEAVY_MODULES)
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize("target", ["steganalysis", *SCRIPTS])
+def test_import_loads_no_heavy_modules(target):
+    assert imported_modules(target)["heavy"] == []
+
+
+@pytest.mark.parametrize("target", ["steganalysis", *SCRIPTS])
+def test_import_adds_no_generic_top_level_packages(target):
+    # Wspólny kod to steganalysis.common, a nie pakiet najwyższego poziomu "common"
+    assert "common" not in imported_modules(target)["top_level"]
+
+
+@pytest.mark.parametrize("target", ["steganalysis", *SCRIPTS])
+def test_import_leaves_sys_path_unchanged(target):
+    # Skrypty dopisują src/ do sys.path tylko przy uruchomieniu bezpośrednim
+    assert not imported_modules(target)["path_changed"]
@@ -0,0 +1,28 @@
+"""
+Analizatory run_pipeline zapisują cechy pod tym samym kluczem (feature_name, params) co skrypty metod.
+"""
+import pytest
+
+from steganalysis.common.histogram_kernel import STORE_PARAMS as HISTOGRAM_PARAMS
+from steganalysis.common.script_loader import load_script
+
+SCRIPT_PARAMS = {
+    "chi_square": ("chi_square_method/chi_square_test.py", "STORE_PARAMS"),
+    "rs": ("rs_method/rs_analysis.py", "STORE_PARAMS"),
+    "spa": ("spa_method/sample_pairs_analysis.py", "STORE_PARAMS"),
+    "pov": ("chi_square_method/pov_chi_square.py", "store_params"),
+}
+
+
+def script_params(name):
+    if name == "histograms":
+        return HISTOGRAM_PARAMS
+    script, params_name = SCRIPT_PARAMS[name]
+    params = getattr(load_script(script), params_name)
+    return params() if callable(params) else params
+
+
+@pytest.mark.parametrize("name", ["histograms", *SCRIPT_PARAMS])
+def test_pipeline_params_match_script(name):
+    analyzer = next(analyzer for analyzer in load_script("pipeline/run_pipeline.py").ANALYZERS if analyzer.name == name)
+    assert analyzer.store_params([]) == script_params(name)
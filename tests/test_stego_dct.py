@@ -0,0 +1,36 @@
+"""
+Osadzanie w DCT: bity, których parzystości nie udało się ustawić w max_attempts próbach, są zgłaszane ostrzeżeniem.
+"""
+import warnings
+
+import numpy as np
+import pytest
+
+from steganalysis.common.script_loader import load_script
+
+
+@pytest.fixture(scope="module")
+def stego():
+    return load_script("stego/krys_analiza_i_Steganografia.py")
+
+
+@pytest.mark.parametrize("level", [0, 255])
+def test_saturated_image_warns_when_attempts_run_out(stego, level):
+    image = np.full((64, 64, 3), level, dtype=np.uint8)
+    with pytest.warns(UserWarning, match=r"błędna w \d+ z \d+ bloków"):
+        stego.embed_bits_dct(image, stego.message_to_bits("Ala ma kota"), max_attempts=1)
+
+
+@pytest.mark.parametrize("level", [0, 255])
+def test_saturated_image_embeds_with_default_attempts(stego, level):
+    image = np.full((64, 64, 3), level, dtype=np.uint8)
+    bits = stego.message_to_bits("Ala ma kota")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        stego.embed_bits_dct(image, bits)
+
+    matrix = stego.dct_matrix(8)
+    ys, xs = stego.block_pixel_indices(np.arange(-(-bits.size // 3)), image.shape[1], 8)
+    blocks = image[ys, xs, :3].transpose(0, 3, 1, 2).astype(np.float64)
+    extracted = np.round((matrix @ blocks @ matrix.T)[:, :, 7, 7]).astype(np.int64) % 2
+    np.testing.assert_array_equal(extracted.reshape(-1)[:bits.size], bits)
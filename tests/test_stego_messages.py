@@ -0,0 +1,58 @@
+"""
+Zapis wiadomości w krys_analiza_i_Steganografia: które wiadomości wracają z obrazu bez zmian, a które nie.
+Reguły są opisane przy message_to_bits.
+"""
+import warnings
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from steganalysis.common.script_loader import load_script
+
+# Bez 'ó' (U+00F3), z liczbą znaków 9-bitowych niepodzielną przez 8 albo same znaki Latin-1
+RECOVERABLE = ["To jest tajna wiadomość.", "Zażołć gęślą jaź", "café", "ąęłńśźż", "ś" * 9, ""]
+# 'ó' obok znaków 9-bitowych, dokładnie 8 znaków 9-bitowych, znaki od U+0200, znacznik końca w treści
+UNRECOVERABLE = ["żółw", "Zażółć gęślą jaźń", "Zażołć gęślą jaźń", "ś" * 8, "Жук", "ÿþ"]
+
+
+@pytest.fixture(scope="module")
+def stego():
+    return load_script("stego/krys_analiza_i_Steganografia.py")
+
+
+@pytest.fixture
+def cover(tmp_path):
+    path = tmp_path / "cover.png"
+    Image.fromarray(np.random.default_rng(0).integers(0, 256, (32, 32, 4), dtype=np.uint8), "RGBA").save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("message", RECOVERABLE)
+@pytest.mark.parametrize("method", ["lsb", "alpha"])
+def test_round_trip(stego, cover, tmp_path, method, message):
+    output_path = str(tmp_path / "stego.png")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        getattr(stego, f"hide_data_{method}")(cover, output_path, message)
+    assert getattr(stego, f"extract_data_{method}")(output_path) == message
+
+
+def test_latin1_bits_match_legacy_format(stego):
+    message = "Zażółć gęślą jaźń".encode("latin-1", "replace").decode("latin-1")
+    legacy = "".join(format(ord(char), "08b") for char in message) + stego.END_MARKER
+    assert "".join(map(str, stego.message_to_bits(message))) == legacy
+
+
+@pytest.mark.parametrize("message", UNRECOVERABLE)
+def test_unrecoverable_message_warns(stego, message):
+    with pytest.warns(UserWarning, match="nie da się odczytać"):
+        stego.message_to_bits(message)
+
+
+def test_undecodable_bits_are_returned_raw(stego, cover, tmp_path):
+    # 'Ж' (U+0416) ma 11 bitów - nie układa się w znaki 8/9-bitowe, ekstraktor oddaje surowe bity
+    output_path = str(tmp_path / "stego.png")
+    with pytest.warns(UserWarning):
+        stego.hide_data_lsb(cover, output_path, "Ж")
+    np.testing.assert_array_equal(stego.extract_data_lsb(output_path), [int(bit) for bit in format(ord("Ж"), "08b")])
@@ -0,0 +1,63 @@
+"""
+Walidacja żądań JSON w POST /analyze: niepoprawne "paths" kończą się 400, zanim cokolwiek trafi do kolejki.
+"""
+import json
+import threading
+import http.client
+from concurrent.futures import Future
+
+import pytest
+
+from steganalysis.common.script_loader import load_script
+
+
+class RecordingService:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, paths):
+        self.submitted.append(paths)
+        futures = []
+        for path in paths:
+            future = Future()
+            future.set_result({"path": path})
+            futures.append(future)
+        return futures
+
+
+@pytest.fixture
+def server():
+    stego_service = load_script("service/stego_service.py")
+    service = RecordingService()
+    server = stego_service.make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, service
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, payload):
+    connection = http.client.HTTPConnection(*server.server_address)
+    connection.request("POST", "/analyze", body=json.dumps(payload).encode("utf-8"))
+    response = connection.getresponse()
+    status, body = response.status, json.loads(response.read())
+    connection.close()
+    return status, body
+
+
+@pytest.mark.parametrize("paths", ["abc", [], ["a.png", 1], {"a.png": 1}, None])
+def test_invalid_paths_are_rejected_before_submit(server, paths):
+    server, service = server
+    status, body = post(server, {"paths": paths})
+    assert status == 400
+    assert "paths" in body["error"]
+    assert service.submitted == []
+
+
+def test_valid_paths_are_submitted(server):
+    server, service = server
+    status, body = post(server, {"paths": ["a.png", "b.png"]})
+    assert status == 200
+    assert len(body["results"]) == 2
+    assert len(service.submitted) == 1
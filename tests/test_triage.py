@@ -0,0 +1,49 @@
+"""
+Etap header kaskady selekcji: dane dopisane za ostatnim znacznikiem EOI pliku JPEG.
+"""
+import io
+
+import pytest
+
+from steganalysis.common.script_loader import load_script
+
+
+@pytest.fixture(scope="module")
+def triage():
+    return load_script("pipeline/triage_cascade.py")
+
+
+class CountingFile(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def reference_trailing_bytes(data):
+    end = data.rfind(b"\xff\xd9")
+    return None if end < 0 else len(data) - end - 2
+
+
+@pytest.mark.parametrize("data", [
+    b"\xff\xd8body\xff\xd9",
+    b"\xff\xd8body\xff\xd9" + b"x" * 1000,
+    b"\xff\xd8\xff\xd9inner\xff\xd9tail",
+    b"\xff\xd8no end marker",
+    b"",
+])
+@pytest.mark.parametrize("chunk_bytes", [1, 2, 3, 16, 64 * 1024])
+def test_jpeg_trailing_bytes_scans_backwards(triage, data, chunk_bytes):
+    # Małe porcje sprawdzają znacznik rozcięty granicą porcji
+    assert triage.jpeg_trailing_bytes(io.BytesIO(data), chunk_bytes) == reference_trailing_bytes(data)
+
+
+def test_jpeg_trailing_bytes_reads_only_the_tail(triage):
+    data = b"\xff\xd8" + bytes(10 * 2**20) + b"\xff\xd9" + b"appended"
+    file = CountingFile(data)
+    assert triage.jpeg_trailing_bytes(file) == len(b"appended")
+    assert file.bytes_read <= triage.TAIL_CHUNK_BYTES